@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tokens_deck import aio, batch
+from tokens_deck.aio import RenderService, ServiceBusy, ServiceClosed
+
+
+@pytest.fixture
+def slow_render(monkeypatch):
+    """Renders that block until ``release`` is set (or 5 s pass)."""
+    release = threading.Event()
+
+    def render_bytes(spec):
+        release.wait(5)
+        return b"deck:" + spec["name"].encode()
+
+    monkeypatch.setattr(batch, "render_bytes", render_bytes)
+    yield release
+    release.set()
+
+
+def _service(**kwargs):
+    return RenderService(workers=1, executor="thread", **kwargs)
+
+
+def test_render_returns_the_workers_result(slow_render):
+    async def main():
+        slow_render.set()
+        async with _service() as service:
+            data = await service.render({"name": "a"})
+            return data, service.metrics()
+
+    data, metrics = asyncio.run(main())
+    assert data == b"deck:a"
+    assert metrics["completed"] == 1 and metrics["in_flight"] == 0
+
+
+def test_close_fails_running_and_queued_jobs(slow_render):
+    async def main():
+        service = _service(max_queue=4)
+        running = asyncio.create_task(service.render({"name": "running"}))
+        queued = asyncio.create_task(service.render({"name": "queued"}))
+        await asyncio.sleep(0.05)
+        # Callers are released while close() still waits for the worker
+        closing = asyncio.create_task(service.close())
+        results = await asyncio.wait_for(
+            asyncio.gather(running, queued, return_exceptions=True), 1)
+        slow_render.set()
+        await closing
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ServiceClosed) for r in results)
+
+
+def test_close_releases_callers_waiting_for_queue_room(slow_render):
+    async def main():
+        service = _service(max_queue=1)
+        tasks = [asyncio.create_task(service.render({"name": str(i)})) for i in range(4)]
+        await asyncio.sleep(0.05)  # one running, one queued, two waiting to queue
+        closing = asyncio.create_task(service.close())
+        results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 1)
+        slow_render.set()
+        await closing
+        return results
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ServiceClosed) for r in results)
+
+
+def test_timeout_includes_waiting_for_queue_room(slow_render):
+    async def main():
+        async with _service(max_queue=1) as service:
+            running = asyncio.create_task(service.render({"name": "running"}))
+            queued = asyncio.create_task(service.render({"name": "queued"}))
+            await asyncio.sleep(0.05)
+            start = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await service.render({"name": "late"}, timeout=0.1)
+            elapsed = time.monotonic() - start
+            timed_out = service.metrics()["timed_out"]
+            slow_render.set()
+            await asyncio.gather(running, queued)
+            return elapsed, timed_out
+
+    elapsed, timed_out = asyncio.run(main())
+    assert elapsed < 0.5
+    assert timed_out == 1
+
+
+def test_full_queue_without_waiting_raises_busy(slow_render):
+    async def main():
+        async with _service(max_queue=1) as service:
+            running = asyncio.create_task(service.render({"name": "running"}))
+            queued = asyncio.create_task(service.render({"name": "queued"}))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ServiceBusy):
+                await service.render({"name": "rejected"}, wait=False)
+            slow_render.set()
+            await asyncio.gather(running, queued)
+            return service.metrics()["rejected"]
+
+    assert asyncio.run(main()) == 1
+
+
+def test_timed_out_queued_job_is_never_rendered(slow_render, monkeypatch):
+    rendered = []
+    render_bytes = batch.render_bytes
+    monkeypatch.setattr(batch, "render_bytes",
+                        lambda spec: rendered.append(spec["name"]) or render_bytes(spec))
+
+    async def main():
+        async with _service(max_queue=4) as service:
+            running = asyncio.create_task(service.render({"name": "running"}))
+            await asyncio.sleep(0.05)
+            with pytest.raises(asyncio.TimeoutError):
+                await service.render({"name": "dropped"}, timeout=0.05)
+            slow_render.set()
+            await running
+
+    asyncio.run(main())
+    assert rendered == ["running"]
+
+
+def test_default_service_is_shared(monkeypatch, slow_render):
+    slow_render.set()
+    monkeypatch.setattr(aio, "_default_service", _service())
+
+    async def main():
+        data = await aio.render_deck({"name": "shared"})
+        await aio._default_service.close()
+        return data
+
+    assert asyncio.run(main()) == b"deck:shared"
@@ -0,0 +1,61 @@
+import json
+import os
+
+from tokens_deck import batch
+from tokens_deck.batch import output_paths, render_batch
+
+
+def _write_spec(path, title):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"slides": [{"kind": "title", "title": title}]}))
+    return str(path)
+
+
+def test_output_paths_suffix_colliding_names(tmp_path):
+    specs = ["a/deck.json", "b/deck.yaml", "c/deck.json", "deck-2.json", "a/deck.json"]
+    paths = output_paths(specs, "out")
+    assert paths == {
+        "a/deck.json": os.path.join("out", "deck.pptx"),
+        "b/deck.yaml": os.path.join("out", "deck-2.pptx"),
+        "c/deck.json": os.path.join("out", "deck-3.pptx"),
+        "deck-2.json": os.path.join("out", "deck-2-2.pptx"),
+    }
+
+
+def test_render_batch_keeps_decks_with_the_same_name(tmp_path):
+    specs = [_write_spec(tmp_path / "a" / "deck.json", "A"),
+             _write_spec(tmp_path / "b" / "deck.json", "B")]
+    result = render_batch(specs, str(tmp_path / "out"), jobs=1)
+    assert not result.failed
+    outputs = [deck.output_path for deck in result.decks]
+    assert len(set(outputs)) == 2
+    assert all(os.path.getsize(path) for path in outputs)
+
+
+def _crashing_chunk(jobs, _render=batch._render_chunk):
+    if any("crash" in spec_path for spec_path, _ in jobs):
+        os._exit(1)
+    return _render(jobs)
+
+
+def test_render_batch_survives_a_dead_worker(tmp_path, monkeypatch):
+    # Workers are forked, so they see the patched task
+    monkeypatch.setattr(batch, "_render_chunk", _crashing_chunk)
+    specs = [_write_spec(tmp_path / "ok.json", "ok"),
+             _write_spec(tmp_path / "crash.json", "crash")]
+    result = render_batch(specs, str(tmp_path / "out"), jobs=1, chunksize=1, retries=1)
+    decks = {os.path.basename(deck.spec_path): deck for deck in result.decks}
+    assert decks["ok.json"].ok
+    assert not decks["crash.json"].ok
+    assert "worker process died" in decks["crash.json"].error
+    assert decks["crash.json"].attempts == 2
+
+
+def test_failed_deck_leaves_no_file(tmp_path):
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps({"slides": [{"kind": "title", "title": "t"}, {"kind": "nope"}]}))
+    specs = [_write_spec(tmp_path / "ok.json", "ok"), str(bad)]
+    out = tmp_path / "out"
+    result = render_batch(specs, str(out), jobs=1, retries=0)
+    assert [os.path.basename(d.spec_path) for d in result.failed] == ["bad.json"]
+    assert sorted(os.listdir(out)) == ["ok.pptx"]
@@ -0,0 +1,21 @@
+from tokens_deck import bench
+from tokens_deck.cli import build_parser
+
+
+def test_cli_threshold_defaults_match_bench():
+    args = build_parser().parse_args(["bench"])
+    assert {"time": args.max_time, "rss": args.max_rss,
+            "size": args.max_size} == bench.DEFAULT_THRESHOLDS
+
+
+def _results(**metrics):
+    case = dict({"total_s": 1.0, "peak_rss_mb": 100.0, "size_bytes": 1000}, **metrics)
+    return {"cases": {"deck": case}}
+
+
+def test_compare_flags_only_regressions_past_the_threshold():
+    baseline = _results()
+    assert bench.compare(_results(total_s=1.2), baseline) == []
+    assert len(bench.compare(_results(total_s=1.3), baseline)) == 1
+    assert len(bench.compare(_results(size_bytes=1100), baseline)) == 1
+    assert bench.compare(_results(total_s=1.3), baseline, {"time": 0.5}) == []
@@ -0,0 +1,63 @@
+import os
+
+from tokens_deck.cache import SlideCache
+from tokens_deck.renderer import DeckRenderer
+
+SPEC = {"slides": [
+    {"kind": "title", "title": "Tokens", "subtitle": "cache test"},
+    {"kind": "bullets", "title": "Points", "items": ["one", "two"]},
+]}
+
+
+def test_rebuild_hits_every_slide(tmp_path):
+    cache = SlideCache(str(tmp_path))
+    renderer = DeckRenderer(slide_cache=cache)
+    first = renderer.render(SPEC)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert renderer.render(SPEC) == first
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_edit_misses_only_the_changed_slide(tmp_path):
+    cache = SlideCache(str(tmp_path))
+    renderer = DeckRenderer(slide_cache=cache)
+    renderer.render(SPEC)
+    edited = {"slides": [SPEC["slides"][0], dict(SPEC["slides"][1], items=["one", "three"])]}
+    renderer.render(edited)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def _slide(renderer):
+    return renderer.build(SPEC).slides[1]
+
+
+def test_rewriting_a_key_does_not_count_it_twice(tmp_path):
+    cache = SlideCache(str(tmp_path))
+    slide = _slide(DeckRenderer())
+    assert cache.put("k", slide)
+    size = cache._size
+    assert cache.put("k", slide)
+    assert cache._size == size == os.path.getsize(cache._path("k"))
+
+
+def test_eviction_keeps_the_cache_under_its_limit(tmp_path):
+    slide = _slide(DeckRenderer())
+    cache = SlideCache(str(tmp_path), max_bytes=1)
+    cache.put("a", slide)
+    cache.put("b", slide)
+    assert cache._size <= 1
+    assert cache.get("a") is None and cache.get("b") is None
+
+
+def test_get_counts_a_hit_when_the_entry_is_evicted_after_reading(tmp_path, monkeypatch):
+    cache = SlideCache(str(tmp_path))
+    cache.put("k", _slide(DeckRenderer()))
+
+    def evicted(path, *args):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("k") is not None
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.get("missing") is None
+    assert cache.misses == 1
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from tokens_deck.charts import chart_data, downsample, lttb
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.spec import SpecError
+
+
+def _noise(n, seed=0):
+    return np.random.default_rng(seed).normal(size=n).cumsum()
+
+
+def test_lttb_keeps_endpoints_and_length():
+    x = np.arange(10_000, dtype=float)
+    keep = lttb(x, _noise(10_000), 100)
+    assert len(keep) == 100
+    assert keep[0] == 0 and keep[-1] == 9_999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_preserves_a_spike():
+    y = np.zeros(5_000)
+    y[3_210] = 50.0
+    assert 3_210 in lttb(np.arange(5_000, dtype=float), y, 50)
+
+
+def test_short_series_are_left_alone():
+    assert lttb([0, 1, 2], [1, 2, 3], 10).tolist() == [0, 1, 2]
+    assert downsample(np.arange(5.0), [np.ones(5)], 10).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("series", [1, 3, 40])
+def test_downsample_bounds_the_union(series):
+    columns = [_noise(20_000, seed) for seed in range(series)]
+    keep = downsample(np.arange(20_000, dtype=float), columns, 100)
+    assert len(keep) <= 100
+    assert keep[0] == 0 and keep[-1] == 19_999
+
+
+def test_downsample_keeps_a_spike_in_any_series():
+    quiet, spiky = np.zeros(8_000), np.zeros(8_000)
+    spiky[4_321] = -9.0
+    assert 4_321 in downsample(np.arange(8_000, dtype=float), [quiet, spiky], 60)
+
+
+def test_line_chart_without_categories_is_xy():
+    categories, series = chart_data({"chart": "line", "max_points": 50,
+                                     "series": [{"name": "y", "values": _noise(1_000)}]})
+    assert categories is None
+    name, xs, ys = series[0]
+    assert name == "y" and len(xs) == len(ys) <= 50
+
+
+def test_column_charts_keep_every_category():
+    spec = {"categories": [f"c{i}" for i in range(30)],
+            "series": [{"name": "v", "values": list(range(30))}], "max_points": 30}
+    categories, series = chart_data(spec)
+    assert categories == spec["categories"] and series[0][1] == list(range(30))
+    with pytest.raises(ValueError, match="31 categories are more than max_points"):
+        chart_data(dict(spec, categories=spec["categories"] + ["c30"],
+                        series=[{"name": "v", "values": list(range(31))}]))
+
+
+def test_too_many_bars_is_a_spec_error():
+    spec = {"slides": [{"kind": "chart", "chart": "bar", "title": "Bars", "max_points": 5,
+                        "series": [{"name": "v", "values": list(range(6))}]}]}
+    with pytest.raises(SpecError, match="chart 'Bars': 6 categories"):
+        DeckRenderer().build(spec)
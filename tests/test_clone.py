@@ -0,0 +1,58 @@
+import io
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from tokens_deck.renderer import DeckRenderer, clone_presentation
+from tokens_deck.themes import MINIMAL
+
+
+def _prototype():
+    prs = Presentation()
+    prs.slide_width = Inches(16)
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_textbox(0, 0, Inches(2), Inches(1)).text_frame.text = "prototype"
+    return prs
+
+
+def test_clone_has_the_same_parts_as_new_objects():
+    prs = _prototype()
+    clone = clone_presentation(prs)
+    source = list(prs.part.package.iter_parts())
+    cloned = list(clone.part.package.iter_parts())
+    assert [p.partname for p in cloned] == [p.partname for p in source]
+    assert [p.blob for p in cloned] == [p.blob for p in source]
+    assert not {id(p) for p in cloned} & {id(p) for p in source}
+    assert clone.slide_width == prs.slide_width
+    assert clone.slides[0].shapes[0].text_frame.text == "prototype"
+
+
+def test_clone_edits_do_not_reach_the_prototype():
+    prs = _prototype()
+    before = [p.blob for p in prs.part.package.iter_parts()]
+    clone = clone_presentation(prs)
+    clone.slides[0].shapes[0].text_frame.text = "edited"
+    clone.slides.add_slide(clone.slide_layouts[6])
+    clone.slide_masters[0].name = "changed"
+    assert len(prs.slides) == 1 and len(clone.slides) == 2
+    assert prs.slides[0].shapes[0].text_frame.text == "prototype"
+    assert [p.blob for p in prs.part.package.iter_parts()] == before
+
+
+def test_clone_saves_and_reopens():
+    clone = clone_presentation(_prototype())
+    out = io.BytesIO()
+    clone.save(out)
+    reopened = Presentation(io.BytesIO(out.getvalue()))
+    assert reopened.slides[0].shapes[0].text_frame.text == "prototype"
+
+
+def test_renderer_decks_do_not_share_parts():
+    renderer = DeckRenderer()
+    first, second = renderer.new_presentation(MINIMAL), renderer.new_presentation(MINIMAL)
+    first.slides.add_slide(first.slide_layouts[6])
+    assert len(second.slides) == 0
+    prototype = renderer.prototypes[(MINIMAL.name, id(MINIMAL))][1]
+    assert len(prototype.slides) == 0
+    parts = set(map(id, first.part.package.iter_parts()))
+    assert not parts & set(map(id, second.part.package.iter_parts()))
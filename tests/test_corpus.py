@@ -0,0 +1,115 @@
+import io
+import random
+import tracemalloc
+
+import pytest
+
+from tokens_deck.corpus import CountMinSketch, range_start, read_range
+
+
+class CountingFile(io.BytesIO):
+    """BytesIO that counts the bytes read from it."""
+
+    bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def _ranges(data, chunk, block):
+    f = CountingFile(data)
+    ranges = [list(read_range(f, start, min(start + chunk, len(data)), block))
+              for start in range(0, max(len(data), 1), chunk)]
+    return f, ranges
+
+
+def _text(rng, lines):
+    words = ["token", "ization", "model", "ü", "🙂", "12345", "a"]
+    return b"".join((" ".join(rng.choice(words) for _ in range(rng.randint(0, 40)))
+                     + "\n").encode() for _ in range(lines))
+
+
+@pytest.mark.parametrize("chunk, block", [(1, 4), (7, 16), (64, 16), (500, 64), (10**6, 64)])
+def test_ranges_cover_every_byte_once(chunk, block):
+    data = _text(random.Random(chunk), 200)
+    _, ranges = _ranges(data, chunk, block)
+    assert b"".join(b for blocks in ranges for b in blocks) == data
+
+
+def test_short_lines_are_never_split():
+    data = _text(random.Random(1), 300)
+    _, ranges = _ranges(data, 333, 1024)
+    for blocks in ranges:
+        for block in blocks:
+            assert block.endswith(b"\n")
+
+
+@pytest.mark.parametrize("data", [b"", b"\n", b"x", b"no newline at the end", b"\n\n\n"])
+def test_edge_cases(data):
+    for chunk in (1, 2, 5):
+        _, ranges = _ranges(data, chunk, 4)
+        assert b"".join(b for blocks in ranges for b in blocks) == data
+
+
+def test_a_file_without_line_breaks_is_read_in_bounded_blocks():
+    block = 1024
+    data = b" ".join(b"word%d" % i for i in range(50_000))  # ~390 KB, one line
+    f, ranges = _ranges(data, 16 * 1024, block)
+    blocks = [b for blocks in ranges for b in blocks]
+    assert b"".join(blocks) == data
+    assert max(map(len, blocks)) <= 2 * block
+    # Each range reads its own bytes plus a bounded look-ahead, not the line
+    assert f.bytes_read <= len(data) + len(ranges) * 3 * block
+    # Splits fall before spaces, so words keep their leading space
+    assert all(b.startswith(b" ") for b in blocks[1:])
+
+
+def test_no_spaces_at_all_still_splits():
+    data = b"x" * 10_000
+    _, ranges = _ranges(data, 3000, 256)
+    blocks = [b for blocks in ranges for b in blocks]
+    assert b"".join(blocks) == data
+    assert max(map(len, blocks)) <= 512
+
+
+@pytest.mark.parametrize("chunk, block", [(1000, 64), (999, 63), (4001, 130)])
+def test_long_lines_are_not_split_inside_a_character(chunk, block):
+    data = "語ü🙂x".encode() * 1000  # multibyte text, no spaces or line breaks
+    _, ranges = _ranges(data, chunk, block)
+    blocks = [b for blocks in ranges for b in blocks]
+    assert b"".join(blocks) == data
+    assert len(blocks) > len(ranges)
+    for b in blocks:
+        b.decode("utf-8")  # strict: a cut character would raise
+
+
+def test_memory_is_flat_for_a_long_line(tmp_path):
+    path = tmp_path / "one-line.txt"
+    path.write_bytes(b"abc " * 2_000_000)  # 8 MB, no newline
+    tracemalloc.start()
+    try:
+        with open(path, "rb") as f:
+            for start in range(0, 8_000_000, 2_000_000):
+                for _ in read_range(f, start, start + 2_000_000, 64 * 1024):
+                    pass
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 1_000_000
+
+
+def test_range_start_is_after_the_line_break():
+    f = io.BytesIO(b"abc\ndef\nghi")
+    assert [range_start(f, offset) for offset in range(12)] == [0, 4, 4, 4, 4, 8, 8, 8, 8,
+                                                               11, 11, 11]
+
+
+def test_count_min_sketch_tracks_the_top_words():
+    sketch = CountMinSketch(width=256, depth=4, k=2)
+    sketch.update({"the": 50, "token": 20, "rare": 1})
+    other = CountMinSketch(width=256, depth=4, k=2)
+    other.update({"token": 40})
+    sketch.merge(other)
+    assert [word for word, _ in sketch.most_common()] == ["token", "the"]
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from tokens_deck.diagrams import graph_from_spec
+
+
+def _edges(spec):
+    return graph_from_spec(spec).edges.tolist()
+
+
+def test_edges_refer_to_labels_or_ids():
+    spec = {"nodes": ["text", {"label": "Tokenizer", "id": "tok"}, "ids"],
+            "edges": [["text", "tok"], ["tok", "ids"]]}
+    assert _edges(spec) == [[0, 1], [1, 2]]
+
+
+def test_integer_ids_win_over_positions():
+    spec = {"nodes": [{"id": 2, "label": "a"}, {"id": 1, "label": "b"},
+                      {"id": 0, "label": "c"}],
+            "edges": [[2, 1], [1, 0]]}
+    assert _edges(spec) == [[0, 1], [1, 2]]
+
+
+def test_integers_without_a_matching_id_are_positions():
+    spec = {"nodes": [{"id": "a"}, {"id": "b"}, {"id": 7}], "edges": [[0, 1], [7, 0]]}
+    assert _edges(spec) == [[0, 1], [2, 0]]
+
+
+def test_unknown_nodes_are_reported():
+    with pytest.raises(ValueError, match="unknown node 'missing'"):
+        graph_from_spec({"nodes": ["a"], "edges": [["a", "missing"]]})
+    with pytest.raises(ValueError, match="outside 0..0"):
+        graph_from_spec({"nodes": ["a"], "edges": [[0, 3]]})
+
+
+def test_layers_spec_joins_consecutive_layers():
+    graph = graph_from_spec({"layers": [2, 1]})
+    assert graph.edges.tolist() == [[0, 2], [1, 2]]
+    assert np.array_equal(graph.layer, [0, 0, 1])
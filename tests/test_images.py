@@ -0,0 +1,68 @@
+import shutil
+
+import pytest
+
+from tokens_deck.images import ImagePipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def picture(tmp_path):
+    path = tmp_path / "chart.png"
+    image = Image.new("RGB", (1600, 900), "white")
+    for x in range(0, 1600, 40):
+        image.paste((x % 256, 80, 160), (x, 0, x + 20, 900))
+    image.save(path)
+    return path
+
+
+def test_image_is_scaled_to_its_box(picture):
+    pipeline = ImagePipeline(dpi=100)
+    image = pipeline.get(str(picture), 4, 3)
+    assert image.width <= 400 and image.height <= 300
+    assert pipeline.processed == 1
+
+
+def test_same_file_is_processed_once(picture):
+    pipeline = ImagePipeline()
+    first = pipeline.get(str(picture), 4, 3)
+    assert pipeline.get(str(picture), 4, 3) is first
+    assert pipeline.processed == 1
+
+
+def test_same_content_under_two_names_is_processed_once(picture, tmp_path):
+    copy = tmp_path / "copy-of-chart.png"
+    shutil.copy(picture, copy)
+    pipeline = ImagePipeline()
+    first = pipeline.get(str(picture), 4, 3)
+    second = pipeline.get(str(copy), 4, 3)
+    assert second.digest == first.digest
+    assert (pipeline.processed, pipeline.reused) == (1, 1)
+
+
+def test_other_box_is_processed_again(picture):
+    pipeline = ImagePipeline()
+    pipeline.get(str(picture), 4, 3)
+    pipeline.get(str(picture), 8, 6)
+    assert pipeline.processed == 2
+
+
+def test_disk_cache_is_shared_between_pipelines(picture, tmp_path):
+    cache = str(tmp_path / "cache")
+    first = ImagePipeline(cache).get(str(picture), 4, 3)
+    other = ImagePipeline(cache)
+    assert other.get(str(picture), 4, 3).data == first.data
+    assert (other.processed, other.reused) == (0, 1)
+
+
+def test_unreadable_image_fails_and_can_be_retried(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+    pipeline = ImagePipeline()
+    with pytest.raises(Exception):
+        pipeline.get(str(path), 4, 3)
+    copy = tmp_path / "broken-copy.png"
+    copy.write_bytes(b"not an image")
+    with pytest.raises(Exception):
+        pipeline.get(str(copy), 4, 3)
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from tokens_deck.cli import main
+from tokens_deck.merge import fill, merge_decks, placeholders, read_records
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.spec import SpecError
+
+TEMPLATE = {"slides": [
+    {"kind": "title", "title": "Tokens for {{team}}", "subtitle": "Q3"},
+    {"kind": "bullets", "title": "Why tokens matter", "items": ["Cost", "Context"]},
+]}
+RECORDS = [{"team": "Search"}, {"team": "Ads"}, {"team": "Search"}]
+
+
+def test_placeholders_and_fill():
+    assert placeholders(TEMPLATE) == {"team"}
+    assert fill(TEMPLATE["slides"][0], {"team": "Ads"})["title"] == "Tokens for Ads"
+    with pytest.raises(SpecError, match="no field 'team'"):
+        fill(TEMPLATE, {})
+
+
+def test_static_slides_are_reused(tmp_path):
+    result = merge_decks(TEMPLATE, RECORDS, str(tmp_path))
+    assert (result.decks, result.slides, result.reused) == (3, 6, 2)
+
+
+def test_colliding_filenames_get_a_suffix(tmp_path):
+    merge_decks(TEMPLATE, RECORDS, str(tmp_path), filename="{{team}}.pptx")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["Ads.pptx", "Search-2.pptx",
+                                                         "Search.pptx"]
+
+
+def test_reproducible_merge_is_byte_stable(tmp_path):
+    for run in ("a", "b"):
+        merge_decks(TEMPLATE, RECORDS[:1], str(tmp_path / run),
+                    renderer=DeckRenderer(reproducible=True))
+    assert (tmp_path / "a" / "1.pptx").read_bytes() == (tmp_path / "b" / "1.pptx").read_bytes()
+
+
+def test_read_records_formats(tmp_path):
+    csv_path = tmp_path / "r.csv"
+    csv_path.write_text("team,size\nSearch,3\n")
+    jsonl = tmp_path / "r.jsonl"
+    jsonl.write_text('{"team": "Ads"}\n\n{"team": "Maps"}\n')
+    assert list(read_records(str(csv_path))) == [{"team": "Search", "size": "3"}]
+    assert [r["team"] for r in read_records(str(jsonl))] == ["Ads", "Maps"]
+
+
+@pytest.mark.parametrize("body, message", [("{oops\n", "r.jsonl:1: invalid JSON"),
+                                           ('{"a": 1}\n[1]\n', "r.jsonl:2: each record")])
+def test_bad_jsonl_records_raise_spec_errors(tmp_path, body, message):
+    path = tmp_path / "r.jsonl"
+    path.write_text(body)
+    with pytest.raises(SpecError, match=message):
+        list(read_records(str(path)))
+
+
+def test_cli_reports_bad_records_without_a_traceback(tmp_path, capsys):
+    template = tmp_path / "deck.json"
+    template.write_text(json.dumps(TEMPLATE))
+    data = tmp_path / "r.jsonl"
+    data.write_text('{"name": "no team field"}\n')
+    assert main(["merge", str(template), str(data), "--out", str(tmp_path / "out")]) == 1
+    assert "merge failed: record has no field 'team'" in capsys.readouterr().err
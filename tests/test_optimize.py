@@ -0,0 +1,54 @@
+import io
+import zipfile
+
+from pptx import Presentation
+
+from tokens_deck.optimize import compression_policy
+from tokens_deck.renderer import DeckRenderer
+
+CHART = {"kind": "chart", "title": "Prices", "categories": ["a", "b", "c"],
+         "series": [{"name": "price", "values": [1, 4, 2]}]}
+SPEC = {"slides": [{"kind": "title", "title": "Tokens"}, CHART, dict(CHART),
+                   {"kind": "bullets", "title": "Why", "items": ["Cost", "Context"]}]}
+
+
+def _render(spec=SPEC, **kwargs):
+    data = DeckRenderer(reproducible=True, **kwargs).render(spec)
+    return data, zipfile.ZipFile(io.BytesIO(data))
+
+
+def test_pruned_deck_opens_with_one_layout_and_master():
+    data, archive = _render()
+    names = archive.namelist()
+    assert [n for n in names if n.startswith("ppt/slideLayouts/slideLayout")] == [
+        "ppt/slideLayouts/slideLayout7.xml"]
+    assert len([n for n in names if n.startswith("ppt/slideMasters/slideMaster")]) == 1
+    assert not any("printerSettings" in n or "thumbnail" in n for n in names)
+    prs = Presentation(io.BytesIO(data))
+    assert len(prs.slides) == 4
+    assert len(prs.slide_masters) == 1 and len(prs.slide_layouts) == 1
+
+
+def test_identical_charts_share_one_workbook():
+    data, archive = _render()
+    charts = [n for n in archive.namelist() if n.startswith("ppt/charts/chart")]
+    workbooks = [n for n in archive.namelist() if n.startswith("ppt/embeddings/")]
+    assert (len(charts), len(workbooks)) == (2, 1)
+    prs = Presentation(io.BytesIO(data))
+    for slide in list(prs.slides)[1:3]:
+        chart = next(s for s in slide.shapes if s.has_chart).chart
+        assert list(chart.plots[0].categories) == ["a", "b", "c"]
+        assert chart.part.chart_workbook.xlsx_part is not None
+
+
+def test_media_is_stored_and_xml_deflated():
+    _, archive = _render()
+    for info in archive.infolist():
+        expected = (zipfile.ZIP_STORED if info.filename.endswith(".xlsx")
+                    else zipfile.ZIP_DEFLATED)
+        assert info.compress_type == expected, info.filename
+
+
+def test_compression_policy_levels():
+    assert compression_policy("small")("ppt/slides/slide1.xml") == (zipfile.ZIP_DEFLATED, 9)
+    assert compression_policy(3)("ppt/media/image1.PNG") == (zipfile.ZIP_STORED, None)
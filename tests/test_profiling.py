@@ -0,0 +1,48 @@
+import json
+import re
+
+from tokens_deck.cli import main
+from tokens_deck.profiling import DeckProfiler
+from tokens_deck.renderer import DeckRenderer
+
+SPEC = {"slides": [{"kind": "title", "title": "Tokens"},
+                   {"kind": "bullets", "title": "Why", "items": ["Cost", "Context"]}]}
+FOLDED = re.compile(r"^deck(;[^;\n]+)* \d+$")
+
+
+def test_slides_are_recorded():
+    profiler = DeckProfiler()
+    prs = DeckRenderer().build(SPEC, profiler)
+    assert len(prs.slides) == 2
+    assert [(r["index"], r["kind"], r["builder"]) for r in profiler.slides] == [
+        (1, "title", "title_slide"), (2, "bullets", "add_standard_slide")]
+    for record in profiler.slides:
+        assert record["shapes"] > 0 and record["part_bytes"] > 0
+        assert "alloc_peak_bytes" in record
+    report = profiler.report()
+    assert set(report["phases"]) >= {"template", "slides"}
+    assert report["kinds"]["bullets"]["slides"] == 1
+    assert report["helpers"]["stamp"]["calls"] >= 1
+
+
+def test_folded_stacks(tmp_path):
+    profiler = DeckProfiler(trace_memory=False)
+    DeckRenderer().build(SPEC, profiler)
+    path = tmp_path / "deck.folded"
+    profiler.write_folded(str(path))
+    lines = path.read_text().splitlines()
+    assert lines and all(FOLDED.match(line) for line in lines)
+    stacks = [line.rsplit(" ", 1)[0] for line in lines]
+    assert "deck;slides;slide 2 add_standard_slide" in stacks
+    assert any(stack.startswith("deck;slides;slide 2 add_standard_slide;") for stack in stacks)
+
+
+def test_cli_writes_profile_and_flamegraph(tmp_path, capsys):
+    spec = tmp_path / "deck.json"
+    spec.write_text(json.dumps(SPEC))
+    profile, folded = tmp_path / "profile.json", tmp_path / "deck.folded"
+    assert main(["render", str(spec), "-o", str(tmp_path / "deck.pptx"),
+                 "--profile", str(profile), "--flamegraph", str(folded)]) == 0
+    assert len(json.loads(profile.read_text())["slides"]) == 2
+    assert folded.read_text().startswith("deck")
+    assert "profile: template" in capsys.readouterr().out
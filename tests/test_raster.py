@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+from tokens_deck.raster import check_previews, image_diff, preview_name, rasterize
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.spec import builtin_spec
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(scope="module")
+def previews():
+    prs = DeckRenderer().build(builtin_spec("tokens_in_llms"))
+    return prs, rasterize(prs, width=640, jobs=1)
+
+
+def test_previews_have_the_slide_aspect(previews):
+    prs, pngs = previews
+    assert len(pngs) == len(prs.slides)
+    for data in pngs:
+        image = Image.open(io.BytesIO(data))
+        assert image.format == "PNG"
+        assert image.size == (640, 360)  # 16:9
+        assert len(image.convert("RGB").getcolors(1 << 16) or ()) != 1  # not blank
+
+
+def test_previews_match_themselves_and_flag_changes(previews, tmp_path):
+    _, pngs = previews
+    for index, data in enumerate(pngs[:2], 1):
+        (tmp_path / preview_name(index)).write_bytes(data)
+    assert check_previews(pngs[:2], str(tmp_path)) == []
+    swapped = [pngs[1], pngs[0], pngs[2]]
+    failures = check_previews(swapped, str(tmp_path), out_dir=str(tmp_path))
+    assert [name for name, _ in failures] == ["slide-001.png", "slide-002.png",
+                                              "slide-003.png"]
+    assert failures[2][1] == 1.0  # no reference
+    assert (tmp_path / "slide-001.diff.png").exists()
+
+
+def test_image_diff_counts_changed_pixels():
+    white = Image.new("RGB", (10, 10), "white")
+    marked = white.copy()
+    marked.paste((0, 0, 0), (0, 0, 5, 2))
+    assert image_diff(white, white)[0] == 0
+    assert image_diff(white, marked)[0] == pytest.approx(0.1)
+    assert image_diff(white, Image.new("RGB", (5, 5)))[0] == 1.0
@@ -0,0 +1,82 @@
+import os
+
+import pytest
+from pptx import Presentation
+
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.search import SearchIndex, extract_slides
+
+
+def _deck(path, *slides):
+    path.write_bytes(DeckRenderer().render({"slides": list(slides)}))
+    return str(path)
+
+
+def _bullets(title, *items):
+    return {"kind": "bullets", "title": title, "items": list(items)}
+
+
+@pytest.fixture
+def decks(tmp_path):
+    root = tmp_path / "decks"
+    root.mkdir()
+    _deck(root / "a.pptx", {"kind": "title", "title": "Tokens 101"},
+          _bullets("Budgets", "Watch the token budget", "Context windows fill up"))
+    _deck(root / "b.pptx", _bullets("Pricing", "Budget per token varies", "Cache prompts"))
+    return root
+
+
+def test_extract_slides_follows_presentation_order(tmp_path):
+    path = _deck(tmp_path / "deck.pptx", {"kind": "title", "title": "First"},
+                 _bullets("Second", "two"), _bullets("Third", "three"))
+    assert [(s.index, s.title) for s in extract_slides(path)] == [
+        (1, "First"), (2, "Second"), (3, "Third")]
+    # Move the last slide to the front: part names stay, the order changes
+    prs = Presentation(path)
+    id_list = prs.slides._sldIdLst
+    id_list.insert(0, id_list[-1])
+    prs.save(path)
+    slides = extract_slides(path)
+    assert [s.title for s in slides] == ["Third", "First", "Second"]
+    assert slides[0].paragraphs == ["Third", "three"]
+
+
+def test_phrase_search(decks, tmp_path):
+    with SearchIndex(str(tmp_path / "index.db")) as index:
+        index.update([str(decks)])
+        hits = index.search("token budget")
+        assert [(os.path.basename(h.path), h.slide, h.title, h.text) for h in hits] == [
+            ("a.pptx", 2, "Budgets", "Watch the token budget")]
+        # Both words, in the other order, on b.pptx's slide only
+        assert [os.path.basename(h.path) for h in index.search("budget per token")] == [
+            "b.pptx"]
+        assert len(index.search("TOKEN")) == 2
+        assert index.search("budget tokens") == []
+        assert index.search("...") == []
+
+
+def test_update_is_incremental(decks, tmp_path):
+    with SearchIndex(str(tmp_path / "index.db")) as index:
+        first = index.update([str(decks)])
+        assert (first.indexed, first.unchanged, first.removed) == (2, 0, 0)
+        again = index.update([str(decks)])
+        assert (again.indexed, again.unchanged, again.removed) == (0, 2, 0)
+
+        changed = _deck(decks / "b.pptx", _bullets("Pricing", "Prices drop every year"))
+        st = os.stat(changed)
+        os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        os.remove(decks / "a.pptx")
+        _deck(decks / "c.pptx", _bullets("New", "Fresh token budget"))
+        result = index.update([str(decks)])
+        assert (result.indexed, result.unchanged, result.removed) == (2, 0, 1)
+        assert index.stats()[:2] == (2, 2)
+        assert [os.path.basename(h.path) for h in index.search("token budget")] == ["c.pptx"]
+        assert index.search("cache prompts") == []
+        assert len(index.search("prices drop")) == 1
+
+
+def test_broken_decks_are_counted_not_fatal(decks, tmp_path):
+    (decks / "broken.pptx").write_bytes(b"not a zip")
+    with SearchIndex(str(tmp_path / "index.db")) as index:
+        result = index.update([str(decks)])
+    assert (result.indexed, result.failed) == (2, 1)
@@ -0,0 +1,158 @@
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pptx import Presentation
+
+from tokens_deck.client import connect
+from tokens_deck.server import make_server
+from tokens_deck.store import DeckStore
+
+SPEC = {"slides": [{"kind": "title", "title": "Tokens"},
+                   {"kind": "bullets", "title": "Why", "items": ["Cost", "Context"]}]}
+
+
+def _serve(store=None):
+    server = make_server(port=0, quiet=True, store=store)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = _serve(DeckStore(str(tmp_path / "store")))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def plain_server():
+    server = _serve()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, spec):
+    conn = connect(port=server.server_address[1])
+    try:
+        conn.request("POST", "/render", json.dumps(spec),
+                     {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return response.status, response.getheader("X-Cache"), response.read()
+    finally:
+        conn.close()
+
+
+def _send(server, body, length=None):
+    """POST raw bytes, with a Content-Length header of our choosing."""
+    conn = connect(port=server.server_address[1])
+    try:
+        conn.putrequest("POST", "/render")
+        conn.putheader("Content-Length", str(len(body)) if length is None else length)
+        conn.endheaders(body)
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+def _stats(server, name, value):
+    """Wait for a counter: handlers count after the response is sent."""
+    deadline = time.monotonic() + 5
+    while server.stats[name] != value and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return server.stats
+
+
+def test_store_counts_renders_slides_and_hits(server):
+    status, cache, deck = _post(server, SPEC)
+    assert (status, cache) == (200, "miss")
+    assert _post(server, SPEC) == (200, "hit", deck)
+    stats = _stats(server, "store_hits", 1)
+    assert (stats["renders"], stats["slides"], stats["store_hits"]) == (1, 2, 1)
+
+
+def test_concurrent_requests_for_a_new_deck_render_it_once(server):
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda _: _post(server, SPEC), range(8)))
+    assert {status for status, _, _ in results} == {200}
+    assert len({deck for _, _, deck in results}) == 1
+    assert _stats(server, "renders", 1)["renders"] == 1
+    assert server._render_locks == {}
+
+
+def test_a_hit_does_not_wait_for_another_render(server, monkeypatch):
+    _post(server, SPEC)
+    started, release = threading.Event(), threading.Event()
+    put = server.store.put
+
+    def slow_put(*args):
+        started.set()
+        release.wait(10)
+        return put(*args)
+
+    monkeypatch.setattr(server.store, "put", slow_put)
+    other = dict(SPEC, name="other")
+    with ThreadPoolExecutor(1) as pool:
+        pending = pool.submit(_post, server, other)
+        assert started.wait(10)
+        assert _post(server, SPEC)[1] == "hit"
+        release.set()
+        assert pending.result()[1] == "miss"
+
+
+def test_render_without_store_sends_a_whole_deck(plain_server):
+    conn = connect(port=plain_server.server_address[1])
+    try:
+        conn.request("POST", "/render", json.dumps(SPEC), {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        deck = response.read()
+        assert response.status == 200
+        assert response.getheader("X-Slide-Count") == "2"
+        assert int(response.getheader("Content-Length")) == len(deck)
+    finally:
+        conn.close()
+    prs = Presentation(io.BytesIO(deck))
+    texts = [[shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+             for slide in prs.slides]
+    assert [slide[0] for slide in texts] == ["Tokens", "Why"]
+    assert _stats(plain_server, "renders", 1)["slides"] == 2
+
+
+@pytest.mark.parametrize("length", ["lots", "-1"])
+def test_invalid_content_length_is_a_bad_request(plain_server, length):
+    status, body = _send(plain_server, b"{}", length)
+    assert status == 400
+    assert json.loads(body) == {"error": "invalid Content-Length"}
+    assert _stats(plain_server, "errors", 1)["errors"] == 1
+
+
+def test_body_that_is_not_utf8_is_a_bad_request(plain_server):
+    status, body = _send(plain_server, '{"slides": []}'.encode("utf-16"))
+    assert status == 400
+    assert "not UTF-8" in json.loads(body)["error"]
+
+
+def test_bad_spec_without_store_is_a_bad_request(plain_server):
+    status, body = _send(plain_server, json.dumps({"slides": [{"kind": "bullets"}]}).encode())
+    assert status == 400
+    assert "slide 1 (bullets)" in json.loads(body)["error"]
+    assert _stats(plain_server, "errors", 1)["renders"] == 0
+
+
+def test_failed_render_gets_an_error_status(plain_server, monkeypatch):
+    def fail(prs, stream):
+        stream.write(b"PK")
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr("tokens_deck.server.write_pptx", fail)
+    status, body = _send(plain_server, json.dumps(SPEC).encode())
+    assert status == 500
+    assert json.loads(body) == {"error": "RuntimeError: disk on fire"}
@@ -0,0 +1,104 @@
+from pptx import Presentation
+from pptx.oxml.ns import qn
+from pptx.util import Inches, Pt
+
+from tokens_deck.raster import _fill_color, raster_context
+from tokens_deck.renderer import DeckBuilder, DeckRenderer
+from tokens_deck.skeletons import BULLETS_HEIGHT, BULLETS_TOP
+from tokens_deck.slides import build_slide
+from tokens_deck.themes import THEMES
+
+ITEMS = ["Tokens are counted", "Context is finite", "Prices are per token"]
+
+
+class DirectBuilder(DeckBuilder):
+    """Draws every shape through python-pptx instead of stamping skeletons."""
+
+    def stamp(self, slide, archetype, **text):
+        start = len(slide.shapes)
+        self.draw_header(slide, text["title"])
+        if archetype == "bullets":
+            box = slide.shapes.add_textbox(Inches(self.theme.body_left), Inches(BULLETS_TOP),
+                                           Inches(self.theme.body_width),
+                                           Inches(BULLETS_HEIGHT))
+            box.text_frame.word_wrap = True
+            self.bullets(box.text_frame, text["items"])
+        return [shape._element for shape in list(slide.shapes)[start:]]
+
+
+def _shapes(slide):
+    """Slide shapes as XML with ids and the names derived from them removed."""
+    xml = []
+    for el in slide._element.cSld.spTree.iter_shape_elms():
+        for cNvPr in el.xpath("./*[1]/p:cNvPr"):
+            cNvPr.attrib.pop("id")
+            cNvPr.attrib.pop("name")
+        xml.append(el.xml)
+    return xml
+
+
+def _background(slide):
+    bg = slide._element.cSld.bg
+    return None if bg is None else bg.xml
+
+
+def test_stamped_slides_match_python_pptx_drawing():
+    renderer = DeckRenderer()
+    for theme in THEMES.values():
+        for spec in ({"kind": "bullets", "title": "Why", "items": ITEMS},
+                     {"kind": "takeaways", "title": "Takeaways", "items": ITEMS}):
+            stamped = renderer.start_deck({"slides": [spec], "theme": theme.name})
+            direct = DirectBuilder(renderer.new_presentation(theme), theme)
+            a, b = build_slide(stamped, spec, 1), build_slide(direct, spec, 1)
+            shapes = _shapes(a)
+            assert shapes == _shapes(b), (theme.name, spec["kind"])
+            assert any(ITEMS[-1] in xml for xml in shapes)
+            assert _background(a) == _background(b)
+
+
+class ExplicitBuilder(DirectBuilder):
+    """Writes every paragraph's size, color and weight as RGB literals, on
+    python-pptx's stock template, instead of relying on compiled defaults."""
+
+    def style_paragraph(self, p, text, size=None, color="text", bold=False, align=None,
+                        font=None, inherited="text"):
+        super().style_paragraph(p, text, size, color, bold, align, font, inherited)
+        p.font.size = Pt(size or self.theme.body_size)
+        p.font.color.rgb = self.theme.color(color)
+
+
+def _text_formatting(prs):
+    """``(text, size, rgb, bold)`` as displayed, for every textbox paragraph."""
+    context = raster_context(prs)
+    out = []
+    for slide in prs.slides:
+        for sp in slide._element.cSld.spTree.iter(qn("p:sp")):
+            if sp.xpath("./p:nvSpPr/p:cNvSpPr/@txBox") != ["1"]:
+                continue
+            for p in sp.xpath(".//a:p"):
+                text = "".join(p.xpath(".//a:t/text()"))
+                if not text:
+                    continue
+                size, color, bold = context.font_size, context.font_color, False
+                for props in p.xpath("./a:pPr/a:defRPr") + p.xpath("./a:r/a:rPr"):
+                    size = int(props.get("sz", size * 100)) / 100
+                    color = _fill_color(props, context.colors) or color
+                    bold = props.get("b", "1" if bold else "0") == "1"
+                out.append((text, size, color, bold))
+    return out
+
+
+def test_compiled_defaults_display_like_explicit_formatting():
+    slides = [{"kind": "title", "title": "Tokens", "subtitle": "in LLMs"},
+              {"kind": "bullets", "title": "Why", "items": ITEMS},
+              {"kind": "takeaways", "title": "Takeaways", "items": ITEMS}]
+    for theme in THEMES.values():
+        compiled = DeckRenderer().build({"slides": slides, "theme": theme.name})
+        plain = Presentation()
+        plain.slide_width, plain.slide_height = Inches(16), Inches(9)
+        explicit = ExplicitBuilder(plain, theme)
+        for index, spec in enumerate(slides, 1):
+            build_slide(explicit, spec, index)
+        expected = _text_formatting(plain)
+        assert len(expected) > len(ITEMS) * 2
+        assert _text_formatting(compiled) == expected, theme.name
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from tokens_deck.cli import main
+from tokens_deck.spec import SpecError, builtin_spec, load_spec, parse_spec
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", '"deck"', "3", "null"])
+def test_parse_spec_rejects_non_mappings(text):
+    with pytest.raises(SpecError, match="must be a mapping"):
+        parse_spec(text)
+
+
+def test_parse_spec_rejects_yaml_lists():
+    pytest.importorskip("yaml")
+    with pytest.raises(SpecError, match="must be a mapping"):
+        parse_spec("- a\n- b\n", "yaml")
+
+
+def test_parse_spec_reports_syntax_errors():
+    with pytest.raises(SpecError, match="invalid JSON"):
+        parse_spec("{")
+    with pytest.raises(SpecError, match="unknown spec format"):
+        parse_spec("{}", "toml")
+
+
+def test_load_spec_from_file_with_list_body(tmp_path):
+    path = tmp_path / "deck.json"
+    path.write_text("[1, 2]")
+    with pytest.raises(SpecError):
+        load_spec(path)
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({}, "non-empty 'slides'"),
+    ({"slides": []}, "non-empty 'slides'"),
+    ({"slides": [{"title": "x"}]}, "slide 1: each slide needs a 'kind'"),
+    ({"slides": [{"kind": "title"}, "text"]}, "slide 2"),
+])
+def test_load_spec_validates_slides(spec, message):
+    with pytest.raises(SpecError, match=message):
+        load_spec(spec)
+
+
+def test_load_spec_from_file_sets_name_and_base_dir(tmp_path):
+    path = tmp_path / "talk.json"
+    path.write_text(json.dumps({"slides": [{"kind": "title", "title": "t"}]}))
+    spec = load_spec(path)
+    assert spec["name"] == "talk"
+    assert spec["base_dir"] == str(tmp_path)
+
+
+def test_builtin_spec_loads():
+    assert builtin_spec("tokens_in_llms")["slides"]
+
+
+def test_cli_reports_spec_errors_without_a_traceback(tmp_path, capsys):
+    path = tmp_path / "deck.json"
+    path.write_text('{"slides": [{"kind": "nope"}]}')
+    out = tmp_path / "deck.pptx"
+    assert main(["render", str(path), "-o", str(out)]) == 1
+    assert "render failed: slide 1: unknown kind 'nope'" in capsys.readouterr().err
+
+
+def test_failed_render_keeps_the_existing_deck(tmp_path):
+    out = tmp_path / "deck.pptx"
+    out.write_bytes(b"earlier deck")
+    path = tmp_path / "deck.json"
+    path.write_text('{"slides": [{"kind": "title", "title": "ok"}, {"kind": "nope"}]}')
+    assert main(["render", str(path), "-o", str(out)]) == 1
+    assert out.read_bytes() == b"earlier deck"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["deck.json", "deck.pptx"]
+
+
+@pytest.mark.parametrize("spec, output", [("missing.json", "deck.pptx"),
+                                          ("deck.json", "no-such-dir/deck.pptx")])
+def test_cli_reports_os_errors_without_a_traceback(tmp_path, capsys, spec, output):
+    (tmp_path / "deck.json").write_text('{"slides": [{"kind": "title", "title": "t"}]}')
+    assert main(["render", str(tmp_path / spec), "-o", str(tmp_path / output)]) == 1
+    assert "render failed: " in capsys.readouterr().err
@@ -0,0 +1,45 @@
+import pytest
+
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.spec import SpecError, load_spec
+from tokens_deck.store import DeckStore
+from tokens_deck.themes import MINIMAL
+from tokens_deck.tokenizer import BPETokenizer
+
+SPEC = {"slides": [{"kind": "title", "title": "Tokens"}]}
+
+
+def _tokenizer(merges):
+    symbols = {c for pair in merges for c in pair} | {"".join(pair) for pair in merges}
+    return BPETokenizer({s: i for i, s in enumerate(sorted(symbols))}, merges)
+
+
+def _key(store, renderer, spec=SPEC):
+    return store.key(renderer, load_spec(spec))
+
+
+def test_key_follows_the_tokenizer_vocabulary(tmp_path):
+    store = DeckStore(str(tmp_path))
+    merges = [("t", "o"), ("to", "k")]
+    first = _key(store, DeckRenderer(tokenizer=_tokenizer(merges), reproducible=True))
+    again = _key(store, DeckRenderer(tokenizer=_tokenizer(merges), reproducible=True))
+    other = _key(store, DeckRenderer(tokenizer=_tokenizer(merges[:1]), reproducible=True))
+    assert first == again != other
+
+
+def test_tokenizer_without_fingerprint_is_rejected(tmp_path):
+    renderer = DeckRenderer(tokenizer=object(), reproducible=True)
+    with pytest.raises(TypeError, match="no fingerprint"):
+        _key(DeckStore(str(tmp_path)), renderer)
+
+
+def test_spec_values_must_be_json_data(tmp_path):
+    spec = {"slides": [{"kind": "title", "title": "Tokens", "subtitle": object()}]}
+    with pytest.raises(SpecError, match="holds a object"):
+        _key(DeckStore(str(tmp_path)), DeckRenderer(reproducible=True), spec)
+
+
+def test_theme_object_keys_like_its_name(tmp_path):
+    store, renderer = DeckStore(str(tmp_path)), DeckRenderer(reproducible=True)
+    by_name = _key(store, renderer, dict(SPEC, theme=MINIMAL.name))
+    assert _key(store, renderer, dict(SPEC, theme=MINIMAL)) == by_name
@@ -0,0 +1,77 @@
+import pytest
+
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.spec import SpecError
+from tokens_deck.tables import (TABLE_BOX, line_widths, paginate_table, row_height,
+                                row_lines, rows_per_page, table_size)
+from tokens_deck.themes import MINIMAL
+
+LONG = " ".join(["tokenization"] * 60)
+
+
+@pytest.fixture
+def theme():
+    return MINIMAL
+
+
+def _pages(spec, theme):
+    return list(paginate_table(dict({"kind": "table", "title": "T"}, **spec), theme))
+
+
+def test_short_rows_fill_a_page(theme):
+    spec = {"columns": ["a", "b"], "rows": [[i, i] for i in range(100)]}
+    per_page = rows_per_page(spec, theme)
+    pages = _pages(spec, theme)
+    assert [len(p["rows"]) for p in pages[:-1]] == [per_page] * (len(pages) - 1)
+    assert sum(len(p["rows"]) for p in pages) == 100
+    assert [p["title"] for p in pages[:2]] == ["T", "T (cont.)"]
+
+
+def test_wrapped_rows_take_more_room(theme):
+    spec = {"columns": ["word", "note"], "widths": [1, 3],
+            "rows": [["w", LONG] for _ in range(20)]}
+    size = table_size(theme)
+    chars = line_widths([1, 3], 2, size)
+    lines = row_lines(["w", LONG], chars)
+    assert lines > 1
+    pages = _pages(spec, theme)
+    assert len(pages) > 1
+    room = TABLE_BOX[3] * 72 - row_height(1, size)
+    for page in pages:
+        assert sum(row_height(lines, size) for _ in page["rows"]) <= room
+    assert sum(len(p["rows"]) for p in pages) == 20
+
+
+def test_row_taller_than_a_page_gets_its_own_page(theme):
+    spec = {"columns": ["a"], "rows": [["x"], [LONG * 20], ["y"]]}
+    assert [p["rows"] for p in _pages(spec, theme)] == [[["x"]], [[LONG * 20]], [["y"]]]
+
+
+def test_rows_per_slide_overrides_the_estimate(theme):
+    spec = {"columns": ["a"], "rows": [[LONG]] * 5, "rows_per_slide": 2}
+    assert [len(p["rows"]) for p in _pages(spec, theme)] == [2, 2, 1]
+
+
+def test_empty_table_has_one_page(theme):
+    assert [p["rows"] for p in _pages({"columns": ["a"], "rows": []}, theme)] == [[]]
+
+
+def test_rendered_rows_grow_with_their_text(theme):
+    spec = {"slides": [{"kind": "table", "title": "T", "columns": ["a", "b"],
+                        "rows": [["short", "short"], ["short", LONG]]}]}
+    prs = DeckRenderer().build(spec)
+    table = next(s for s in prs.slides[0].shapes if s.has_table).table
+    heights = [row.height for row in table.rows]
+    assert heights[0] == heights[1] < heights[2]
+
+
+@pytest.mark.parametrize("slide, message", [
+    ({"kind": "table", "title": "T"}, "slide 2 \\(table\\): table 'T' needs 'rows' or 'csv'"),
+    ({"kind": "table", "rows": []}, "slide 2 \\(table\\): missing field 'title'"),
+    ({"kind": "table", "title": "T", "csv": "missing.csv"},
+     "slide 2 \\(table\\): cannot read table"),
+])
+def test_pagination_errors_name_the_slide(slide, message):
+    spec = {"slides": [{"kind": "title", "title": "x"}, slide]}
+    with pytest.raises(SpecError, match=message):
+        DeckRenderer().build(spec)
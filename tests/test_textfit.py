@@ -0,0 +1,119 @@
+import pytest
+
+from tokens_deck.cli import main
+from tokens_deck.renderer import MIN_FONT_SIZE, DeckRenderer
+from tokens_deck.skeletons import BULLETS_HEIGHT
+from tokens_deck.spec import SpecError
+from tokens_deck.textfit import TextMeasurer, TextOverflowWarning, paginate_bullets
+from tokens_deck.themes import MINIMAL
+
+ITEM = "Tokens are the units a language model reads and pays for"
+
+
+@pytest.fixture(scope="module")
+def measurer():
+    return TextMeasurer()
+
+
+def _pages(measurer, items, **spec):
+    spec = dict({"kind": "bullets", "title": "Glossary", "paginate": True, "items": items},
+                **spec)
+    return list(paginate_bullets(spec, MINIMAL, measurer, BULLETS_HEIGHT))
+
+
+def test_short_list_is_one_page(measurer):
+    pages = _pages(measurer, ["a", "b"])
+    assert pages == [{"kind": "bullets", "title": "Glossary", "items": ["a", "b"]}]
+
+
+def test_long_list_is_split_into_pages_that_fit(measurer):
+    items = [f"{ITEM} ({i})" for i in range(60)]
+    pages = _pages(measurer, items)
+    assert len(pages) > 1
+    assert [item for page in pages for item in page["items"]] == items
+    spacing = MINIMAL.space_before + MINIMAL.space_after
+    for page in pages:
+        height = measurer.text_height([""] + page["items"], MINIMAL.body_width,
+                                      MINIMAL.body_size, spacing)
+        assert height <= BULLETS_HEIGHT
+        assert "paginate" not in page
+
+
+def test_continuation_titles(measurer):
+    items = (f"{ITEM} ({i})" for i in range(60))  # a generator works too
+    pages = _pages(measurer, items, continued="{title}, continued")
+    assert pages[0]["title"] == "Glossary"
+    assert {page["title"] for page in pages[1:]} == {"Glossary, continued"}
+    assert all("continued" not in page for page in pages)
+
+
+def test_an_item_taller_than_a_page_gets_its_own_page(measurer):
+    huge = " ".join([ITEM] * 80)
+    pages = _pages(measurer, ["a", huge, "b"])
+    assert [page["items"] for page in pages] == [["a"], [huge], ["b"]]
+
+
+@pytest.mark.parametrize("slide, message", [
+    ({"kind": "bullets", "paginate": True, "items": ["a"]}, "slide 2 \\(bullets\\): missing "
+                                                            "field 'title'"),
+    ({"kind": "bullets", "paginate": True, "title": "T"}, "slide 2 \\(bullets\\): missing "
+                                                          "field 'items'"),
+    ({"kind": "bullets", "paginate": True, "title": "T", "items": 3}, "slide 2 \\(bullets\\)"),
+])
+def test_pagination_errors_name_the_slide(slide, message):
+    spec = {"slides": [{"kind": "title", "title": "x"}, slide]}
+    with pytest.raises(SpecError, match=message):
+        DeckRenderer().build(spec)
+
+
+def test_cli_reports_pagination_errors(tmp_path, capsys):
+    path = tmp_path / "deck.json"
+    path.write_text('{"slides": [{"kind": "bullets", "paginate": true, "items": ["a"]}]}')
+    assert main(["render", str(path), "-o", str(tmp_path / "deck.pptx")]) == 1
+    assert "slide 1 (bullets): missing field 'title'" in capsys.readouterr().err
+
+
+def test_measured_height_grows_with_text_and_shrinks_with_size(measurer):
+    short = measurer.text_height([ITEM], 6, 24)
+    long = measurer.text_height([" ".join([ITEM] * 4)], 6, 24)
+    assert long > short
+    assert measurer.text_height([" ".join([ITEM] * 4)], 6, 12) < long
+    assert measurer.metrics().count_lines("x" * 500, 20, 100) > 1  # breaks mid-word
+
+
+def test_fit_picks_the_largest_size_that_fits(measurer):
+    items = [f"{ITEM} ({i})" for i in range(12)]
+    size, fits = measurer.fit(items, 13, 5.5, 28, 12)
+    assert fits and 12 <= size < 28
+    assert measurer.text_height(items, 13, size) <= 5.5
+    assert measurer.text_height(items, 13, size + 1) > 5.5
+    assert measurer.fit(items[:1], 13, 5.5, 28, 12) == (28, True)
+    assert measurer.fit(items * 10, 13, 5.5, 28, 12) == (12, False)
+
+
+def _bullets(n, **slide):
+    items = [f"{ITEM} ({i})" for i in range(n)]
+    spec = {"slides": [dict({"kind": "bullets", "title": "Long", "items": items}, **slide)]}
+    prs = DeckRenderer().build(spec)
+    runs = [run for run in prs.slides[0].shapes._spTree.xpath(".//a:r")
+            if run.text.startswith(ITEM)]
+    assert len(runs) == n
+    return {(run.xpath("./a:rPr/@sz") or [None])[0] for run in runs}
+
+
+def test_long_bullet_lists_are_shrunk_without_warning(recwarn):
+    assert _bullets(3) == {None}  # the theme's body size
+    sizes = _bullets(12)
+    assert len(sizes) == 1 and int(sizes.pop()) < MINIMAL.body_size * 100
+    assert not [w for w in recwarn if issubclass(w.category, TextOverflowWarning)]
+
+
+def test_overflow_is_warned_at_the_smallest_size():
+    with pytest.warns(TextOverflowWarning, match="text on slide 'Long' needs"):
+        sizes = _bullets(80)
+    assert sizes == {str(MIN_FONT_SIZE * 100)}
+
+
+def test_flag_warns_without_shrinking():
+    with pytest.warns(TextOverflowWarning):
+        assert _bullets(12, fit="flag") == {None}
@@ -0,0 +1,126 @@
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from tokens_deck.tokenizer import BPETokenizer, bytes_to_unicode, load_tokenizer
+
+CORPUS = """Tokenization splits text into tokens. Tokens are the units a language
+model reads; the tokenizer learns merges from frequent pairs of bytes. Unbelievable
+tokenizers tokenize tokenized tokens, and 2024 numbers like 12345 split too!
+Ünïcödé wörds, emoji 🙂 and punctuation... all map to bytes first."""
+
+
+def _word_symbols(tokenizer, word):
+    return [tokenizer.byte_encoder[b] for b in word.encode("utf-8")]
+
+
+def _train(corpus, merges=150):
+    """Learn merges the textbook way: merge the most frequent pair, repeat."""
+    byte_encoder = bytes_to_unicode()
+    probe = BPETokenizer({}, [])
+    words = Counter(tuple(byte_encoder[b] for b in w.encode("utf-8"))
+                    for w in probe.pretokenize(corpus))
+    vocab = {c: i for i, c in enumerate(byte_encoder.values())}
+    ranked = []
+    for _ in range(merges):
+        pairs = Counter()
+        for word, count in words.items():
+            for pair in zip(word, word[1:]):
+                pairs[pair] += count
+        if not pairs:
+            break
+        best = max(pairs, key=lambda pair: (pairs[pair], pair))
+        ranked.append(best)
+        vocab.setdefault(best[0] + best[1], len(vocab))
+        words = Counter({_apply(word, best): count for word, count in words.items()})
+    return vocab, ranked
+
+
+def _apply(word, pair):
+    out, i = [], 0
+    while i < len(word):
+        if i + 1 < len(word) and (word[i], word[i + 1]) == pair:
+            out.append(word[i] + word[i + 1])
+            i += 2
+        else:
+            out.append(word[i])
+            i += 1
+    return tuple(out)
+
+
+def _naive_bpe(ranks, symbols):
+    """GPT-2's reference loop: merge every occurrence of the best pair."""
+    word = tuple(symbols)
+    while len(word) > 1:
+        pairs = set(zip(word, word[1:]))
+        best = min(pairs, key=lambda pair: ranks.get(pair, float("inf")))
+        if best not in ranks:
+            break
+        word = _apply(word, best)
+    return list(word)
+
+
+@pytest.fixture(scope="module")
+def trained():
+    vocab, merges = _train(CORPUS)
+    return BPETokenizer(vocab, merges), merges
+
+
+def test_heap_merge_matches_naive_bpe(trained):
+    tokenizer, _ = trained
+    rng = random.Random(0)
+    words = tokenizer.pretokenize(CORPUS)
+    # Known words plus random recombinations of their pieces
+    samples = words + ["".join(rng.sample(words, 3)) for _ in range(300)]
+    for word in samples:
+        symbols = _word_symbols(tokenizer, word)
+        assert tokenizer._merge(list(symbols)) == _naive_bpe(tokenizer.ranks, symbols), word
+
+
+def test_encode_decode_round_trip(trained):
+    tokenizer, _ = trained
+    text = "Tokenizers 🙂 split 12345 Ünïcödé words...\n  and  spaces"
+    ids = tokenizer.encode(text)
+    assert tokenizer.decode(ids) == text
+    assert "".join(tokenizer.pieces(text)) == text
+    assert tokenizer.encode_batch([text, text]) == [ids, ids]
+    assert len(ids) < len(text.encode("utf-8"))  # merges were applied
+
+
+def test_repeated_words_hit_the_cache(trained):
+    tokenizer, _ = trained
+    tokenizer.encode_word.cache_clear()
+    tokenizer.encode("token token token")
+    info = tokenizer.cache_info()
+    assert info.misses == 2 and info.hits == 1  # "token" and " token"
+
+
+def test_file_formats_load_the_same_model(trained, tmp_path):
+    tokenizer, merges = trained
+    (tmp_path / "pair").mkdir()
+    (tmp_path / "pair" / "vocab.json").write_text(json.dumps(tokenizer.encoder))
+    (tmp_path / "pair" / "merges.txt").write_text(
+        "#version: 0.2\n" + "".join(f"{a} {b}\n" for a, b in merges), encoding="utf-8")
+    hf = tmp_path / "tokenizer.json"
+    hf.write_text(json.dumps({"model": {"type": "BPE", "vocab": tokenizer.encoder,
+                                        "merges": [f"{a} {b}" for a, b in merges]}}))
+    text = "tokenized language models"
+    expected = tokenizer.encode(text)
+    assert load_tokenizer(str(tmp_path / "pair")).encode(text) == expected
+    assert load_tokenizer(str(hf)).encode(text) == expected
+    assert load_tokenizer(str(hf)).fingerprint == tokenizer.fingerprint
+
+
+def test_fingerprint_follows_the_merges(trained):
+    tokenizer, merges = trained
+    assert BPETokenizer(tokenizer.encoder, merges).fingerprint == tokenizer.fingerprint
+    assert BPETokenizer(tokenizer.encoder, merges[:-1]).fingerprint != tokenizer.fingerprint
+
+
+def test_non_bpe_tokenizer_json_is_rejected(tmp_path):
+    path = tmp_path / "tokenizer.json"
+    path.write_text(json.dumps({"model": {"type": "WordPiece"}}))
+    with pytest.raises(ValueError, match="not a BPE tokenizer"):
+        load_tokenizer(str(path))
@@ -0,0 +1,142 @@
+import hashlib
+import io
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from tokens_deck.renderer import DeckRenderer
+from tokens_deck.writer import SlideStream, open_output, source_date
+
+Image = pytest.importorskip("PIL.Image")
+
+
+class PipeStream:
+    """Write-only stream: no seek or tell, like a socket or pipe."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture
+def spec(tmp_path):
+    Image.new("RGB", (320, 200), (30, 90, 160)).save(tmp_path / "logo.png")
+    chart = {"kind": "chart", "title": "Prices", "categories": ["a", "b"],
+             "series": [{"name": "usd", "values": [1.5, 3]}]}
+    return {"base_dir": str(tmp_path), "slides": [
+        {"kind": "title", "title": "Tokens", "subtitle": "streamed"},
+        {"kind": "image", "title": "Logo", "image": "logo.png"},
+        chart,
+        {"kind": "bullets", "title": "Why", "items": ["Cost", "Context"]},
+        {"kind": "image", "title": "Logo again", "images": ["logo.png", "logo.png"]},
+        dict(chart, title="Prices again"),
+        {"kind": "table", "title": "Vocab", "columns": ["token", "id"],
+         "rows": [[f"t{i}", i] for i in range(40)], "rows_per_slide": 15},
+    ]}
+
+
+def _summary(data):
+    """Slide texts, chart categories and the digests of media in a deck."""
+    prs = Presentation(io.BytesIO(data))
+    slides = []
+    for slide in prs.slides:
+        texts, charts, pictures = [], [], []
+        for shape in slide.shapes:
+            if shape.has_text_frame:
+                texts.append(shape.text_frame.text)
+            elif shape.has_table:
+                texts.extend(c.text for row in shape.table.rows for c in row.cells)
+            elif shape.has_chart:
+                charts.append(list(shape.chart.plots[0].categories))
+            elif shape.shape_type == 13:  # picture
+                pictures.append(shape.image.sha1)
+        slides.append((texts, charts, pictures))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        media = sorted(hashlib.sha1(archive.read(n)).hexdigest() for n in archive.namelist()
+                       if n.startswith("ppt/media/"))
+        assert archive.testzip() is None
+    return slides, media
+
+
+def test_stream_matches_render(spec):
+    renderer = DeckRenderer(reproducible=True)
+    expected = renderer.render(spec)
+    out = PipeStream()
+    assert renderer.stream_to(spec, out) == 9
+    slides, media = _summary(out.buffer.getvalue())
+    assert (slides, media) == _summary(expected)
+    assert len(media) == 1  # the picture is stored once for three uses
+    assert len(slides) == 9
+
+
+def test_render_to_a_pipe_matches_render(spec):
+    renderer = DeckRenderer(reproducible=True)
+    out = PipeStream()
+    renderer.render_to(spec, out)
+    with zipfile.ZipFile(io.BytesIO(renderer.render(spec))) as a, \
+            zipfile.ZipFile(io.BytesIO(out.buffer.getvalue())) as b:
+        assert a.namelist() == b.namelist()
+        assert all(a.read(n) == b.read(n) for n in a.namelist())
+
+
+def test_reproducible_output_is_byte_stable(spec, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    assert source_date().year == 2023
+    renderer = DeckRenderer(reproducible=True)
+    assert renderer.render(spec) == renderer.render(spec)
+    first, second = PipeStream(), PipeStream()
+    renderer.stream_to(spec, first)
+    renderer.stream_to(spec, second)
+    assert first.buffer.getvalue() == second.buffer.getvalue()
+
+
+def test_slide_stream_needs_an_empty_presentation():
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[6])
+    with pytest.raises(ValueError, match="without slides"):
+        SlideStream(prs, io.BytesIO())
+
+
+def test_open_output_writes_stdout(capsysbinary):
+    with open_output("-") as out:
+        out.write(b"deck")
+    assert capsysbinary.readouterr().out == b"deck"
+
+
+def test_open_output_replaces_only_on_success(tmp_path):
+    path = tmp_path / "deck.pptx"
+    with open_output(str(path)) as out:
+        out.write(b"first")
+    with pytest.raises(RuntimeError):
+        with open_output(str(path)) as out:
+            out.write(b"partial")
+            raise RuntimeError("render failed")
+    assert path.read_bytes() == b"first"
+    assert [p.name for p in tmp_path.iterdir()] == ["deck.pptx"]
+
+
+def test_reproducible_workbooks_built_seconds_apart_are_shared(spec, monkeypatch):
+    core = pytest.importorskip("xlsxwriter.core")
+    real = core.datetime
+
+    class Clock(real):
+        ticks = 0
+
+        @classmethod
+        def now(cls, tz=None):
+            cls.ticks += 1
+            return real(2024, 1, 1, 0, 0, cls.ticks % 60, tzinfo=tz)
+
+    monkeypatch.setattr(core, "datetime", Clock)
+    renderer = DeckRenderer(reproducible=True)
+    out = PipeStream()
+    renderer.stream_to(spec, out)
+    for data in (out.buffer.getvalue(), renderer.render(spec)):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert len([n for n in archive.namelist() if n.startswith("ppt/embeddings/")]) == 1
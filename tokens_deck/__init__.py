@@ -0,0 +1,33 @@
+"""Declarative rendering of the tokens/LLM presentation decks.
+
+Public names are imported lazily so that light entry points (the render
+server client in particular) don't pay for importing python-pptx.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "DeckBuilder": "renderer",
+    "DeckRenderer": "renderer",
+    "render_deck": "renderer",
+    "SLIDE_KINDS": "slides",
+    "slide_kind": "slides",
+    "SpecError": "spec",
+    "builtin_spec": "spec",
+    "load_spec": "spec",
+    "MINIMAL": "themes",
+    "SLATE": "themes",
+    "THEMES": "themes",
+    "Theme": "themes",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,188 @@
+"""Asyncio render service: bounded queue, backpressure and worker offload.
+
+Slide building is synchronous and CPU-bound, so ``RenderService`` never runs
+it on the event loop.  Requests go into a bounded ``asyncio.Queue``; a fixed
+number of dispatcher tasks (the concurrency limit) take jobs off the queue
+and run them in an executor of warm render workers (processes by default,
+see ``batch``).  When the queue is full, ``render`` either waits for room or,
+with ``wait=False``, fails fast with ``ServiceBusy``.
+
+    async with RenderService(max_queue=32) as service:
+        data = await service.render(spec, timeout=10)
+
+Cancelling the awaiting task, or hitting its timeout, drops a job that has
+not started yet.  A job already running in a worker process cannot be
+interrupted; its result is discarded.  The timeout covers the whole call,
+including time spent waiting for room in a full queue.  ``close`` fails
+every job that has not finished with ``ServiceClosed``.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from . import batch
+
+
+class ServiceBusy(RuntimeError):
+    """The render queue is full and the caller asked not to wait."""
+
+
+class ServiceClosed(RuntimeError):
+    """The service was closed before the render finished."""
+
+
+class _Job:
+    __slots__ = ("spec", "future", "queued_at")
+
+    def __init__(self, spec, future):
+        self.spec = spec
+        self.future = future
+        self.queued_at = time.monotonic()
+
+
+class RenderService:
+    """Render decks from asyncio code without blocking the event loop.
+
+    ``workers`` is the executor size (default: CPU count), ``concurrency``
+    how many jobs may be in flight at once (default: ``workers``) and
+    ``max_queue`` how many may wait beyond that.  ``executor="thread"`` uses
+    threads instead of processes (handy for tests; renders then share the
+    GIL).  ``timeout`` is the default per-request timeout in seconds.
+    """
+
+    def __init__(self, workers=None, concurrency=None, max_queue=64, executor="process",
+                 timeout=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.concurrency = concurrency or self.workers
+        self.max_queue = max_queue
+        self.executor_kind = executor
+        self.timeout = timeout
+        self._queue = None
+        self._closing = False
+        self._executor = None
+        self._dispatchers = []
+        self._stats = dict(submitted=0, completed=0, failed=0, cancelled=0, timed_out=0,
+                           rejected=0, in_flight=0)
+        self._wait_seconds = 0.0
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(self.max_queue)
+        self._closing = False
+        if self.executor_kind == "process":
+            self._executor = ProcessPoolExecutor(self.workers, initializer=batch._init_worker)
+        else:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="render")
+        self._dispatchers = [asyncio.create_task(self._dispatch())
+                             for _ in range(self.concurrency)]
+
+    async def close(self):
+        """Stop accepting work, fail unfinished jobs and shut the workers down."""
+        if self._queue is None or self._closing:
+            return
+        self._closing = True
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        # Each job taken off a full queue lets one waiting ``render`` in, which
+        # then sees ``_closing``; yield so it runs before the next check
+        while not self._queue.empty():
+            _fail(self._queue.get_nowait())
+            await asyncio.sleep(0)
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._queue = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def render(self, spec, timeout=None, wait=True):
+        """Render ``spec`` (dict or spec file path) and return .pptx bytes."""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = None if timeout is None else loop.time() + timeout
+        job = _Job(spec, loop.create_future())
+        try:
+            if wait:
+                await asyncio.wait_for(self._queue.put(job), timeout)
+            else:
+                try:
+                    self._queue.put_nowait(job)
+                except asyncio.QueueFull:
+                    self._stats["rejected"] += 1
+                    raise ServiceBusy(f"render queue full ({self.max_queue} waiting)") from None
+            if self._closing:  # queued after close() drained the queue
+                _fail(job)
+            self._stats["submitted"] += 1
+            remaining = None if deadline is None else max(0.0, deadline - loop.time())
+            return await asyncio.wait_for(asyncio.shield(job.future), remaining)
+        except asyncio.TimeoutError:
+            self._stats["timed_out"] += 1
+            job.future.cancel()
+            raise
+        except asyncio.CancelledError:
+            self._stats["cancelled"] += 1
+            job.future.cancel()
+            raise
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.future.done():  # cancelled or timed out while queued
+                    continue
+                self._wait_seconds += time.monotonic() - job.queued_at
+                self._stats["in_flight"] += 1
+                try:
+                    data = await loop.run_in_executor(self._executor, batch.render_bytes,
+                                                      job.spec)
+                except asyncio.CancelledError:
+                    _fail(job)  # close() while the job was running
+                    raise
+                except Exception as exc:
+                    self._stats["failed"] += 1
+                    if not job.future.done():
+                        job.future.set_exception(exc)
+                else:
+                    self._stats["completed"] += 1
+                    if not job.future.done():
+                        job.future.set_result(data)
+                finally:
+                    self._stats["in_flight"] -= 1
+            finally:
+                self._queue.task_done()
+
+    def metrics(self):
+        """Counters plus current queue depth and mean queue wait."""
+        started = self._stats["completed"] + self._stats["failed"] + self._stats["in_flight"]
+        return dict(
+            self._stats,
+            queue_depth=self._queue.qsize() if self._queue is not None else 0,
+            max_queue=self.max_queue,
+            concurrency=self.concurrency,
+            mean_wait_s=self._wait_seconds / started if started else 0.0,
+        )
+
+
+def _fail(job):
+    if not job.future.done():
+        job.future.set_exception(ServiceClosed("render service closed"))
+
+
+_default_service = None
+
+
+async def render_deck(spec, timeout=None):
+    """Render ``spec`` on a shared default ``RenderService``."""
+    global _default_service
+    if _default_service is None:
+        _default_service = RenderService()
+    return await _default_service.render(spec, timeout=timeout)
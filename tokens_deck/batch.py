@@ -0,0 +1,199 @@
+"""Render many deck specs across a pool of long-lived worker processes.
+
+Each worker imports python-pptx and builds its ``DeckRenderer`` once (in the
+pool initializer) and then renders deck after deck.  Specs are handed out in
+chunks to keep inter-process overhead low; a deck that fails is retried on
+its own in a later round, up to ``retries`` times.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from .cache import DEFAULT_MAX_BYTES, SlideCache
+from .images import DEFAULT_DPI, ImagePipeline
+from .renderer import DeckRenderer
+from .spec import load_spec
+from .writer import open_output
+
+SPEC_SUFFIXES = (".json", ".yaml", ".yml")
+
+_renderer = None
+
+
+@dataclass
+class DeckResult:
+    """Outcome of rendering one spec file."""
+
+    spec_path: str
+    output_path: Optional[str] = None
+    slides: int = 0
+    seconds: float = 0.0
+    attempts: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+@dataclass
+class BatchResult:
+    """All deck results of a batch plus overall wall time."""
+
+    decks: List[DeckResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failed(self):
+        return [d for d in self.decks if not d.ok]
+
+    @property
+    def slides(self):
+        return sum(d.slides for d in self.decks if d.ok)
+
+    def summary(self):
+        done = len(self.decks) - len(self.failed)
+        elapsed = self.seconds or float("nan")
+        return (
+            f"{done}/{len(self.decks)} decks, {self.slides} slides in {self.seconds:.2f}s "
+            f"({done / elapsed:.1f} decks/s, {self.slides / elapsed:.1f} slides/s)"
+        )
+
+
+def find_specs(paths):
+    """Expand files and directories into a sorted list of spec files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(SPEC_SUFFIXES):
+                    found.append(os.path.join(path, name))
+        else:
+            found.append(path)
+    return found
+
+
+def output_paths(spec_paths, out_dir):
+    """Map each spec path to its .pptx path in ``out_dir``.
+
+    Decks are named after their spec file.  When two specs share a name
+    (``a/deck.json`` and ``b/deck.yaml``), later ones get ``-2``, ``-3``...
+    so no deck overwrites another.
+    """
+    taken = set()
+    paths = {}
+    for spec_path in spec_paths:
+        if spec_path in paths:
+            continue
+        stem = os.path.splitext(os.path.basename(spec_path))[0]
+        name, n = stem, 1
+        while name in taken:
+            n += 1
+            name = f"{stem}-{n}"
+        taken.add(name)
+        paths[spec_path] = os.path.join(out_dir, f"{name}.pptx")
+    return paths
+
+
+def _init_worker(cache_dir=None, cache_size=DEFAULT_MAX_BYTES, image_cache_dir=None,
+                 dpi=DEFAULT_DPI):
+    global _renderer
+    cache = SlideCache(cache_dir, cache_size) if cache_dir else None
+    _renderer = DeckRenderer(slide_cache=cache, images=ImagePipeline(image_cache_dir, dpi))
+
+
+def render_bytes(spec):
+    """Worker task: render one spec (dict or path) to .pptx bytes."""
+    if _renderer is None:
+        _init_worker()
+    return _renderer.render(spec)
+
+
+def _render_chunk(jobs):
+    """Worker task: render ``(spec path, output path)`` pairs, never raising
+    per-deck errors."""
+    results = []
+    for spec_path, output_path in jobs:
+        result = DeckResult(spec_path)
+        start = time.perf_counter()
+        try:
+            spec = load_spec(spec_path)
+            result.output_path = output_path
+            # Renamed into place only once complete, so a failed render never
+            # leaves a partial deck in the output directory
+            with open_output(output_path) as out:
+                prs = _renderer.render_to(spec, out)
+            result.slides = len(prs.slides)
+        except Exception as exc:  # reported back to the parent, retried there
+            result.error = f"{type(exc).__name__}: {exc}"
+        result.seconds = time.perf_counter() - start
+        results.append(result)
+    return results
+
+
+def render_batch(spec_paths, out_dir, jobs=None, chunksize=4, retries=1, progress=None,
+                 cache_dir=None, cache_size=DEFAULT_MAX_BYTES, image_cache_dir=None,
+                 dpi=DEFAULT_DPI):
+    """Render every spec into ``out_dir`` and return a ``BatchResult``.
+
+    ``jobs`` defaults to the CPU count.  ``progress``, if given, is called
+    with each finished ``DeckResult`` (including failed attempts that will
+    be retried).  ``cache_dir`` enables a slide cache shared by all workers,
+    and ``image_cache_dir`` an image cache, so a picture used by many decks is
+    processed once.
+
+    A worker process that dies (a crash, or the OOM killer) fails the decks
+    it and the other workers had in hand; they are retried like any failed
+    deck, in a fresh pool.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = output_paths(spec_paths, out_dir)
+    spec_paths = list(outputs)
+    jobs = jobs or os.cpu_count() or 1
+    attempts = {path: 0 for path in spec_paths}
+    final = {}
+
+    def new_pool():
+        return ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                   initargs=(cache_dir, cache_size, image_cache_dir, dpi))
+
+    start = time.perf_counter()
+    pool = new_pool()
+    try:
+        pending = spec_paths
+        size = chunksize
+        while pending:
+            futures = {}
+            for i in range(0, len(pending), size):
+                chunk = pending[i:i + size]
+                futures[pool.submit(_render_chunk, [(p, outputs[p]) for p in chunk])] = chunk
+            pending = []
+            broken = False
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except BrokenProcessPool as exc:
+                    broken = True
+                    results = [DeckResult(path, error=f"worker process died: {exc}")
+                               for path in futures[future]]
+                for result in results:
+                    attempts[result.spec_path] += 1
+                    result.attempts = attempts[result.spec_path]
+                    final[result.spec_path] = result
+                    if progress:
+                        progress(result)
+                    if not result.ok and result.attempts <= retries:
+                        pending.append(result.spec_path)
+            # Retries go out one deck per task so a bad spec can't hold up others
+            size = 1
+            if broken:
+                pool.shutdown(wait=False)
+                pool = new_pool()
+    finally:
+        pool.shutdown()
+
+    return BatchResult([final[path] for path in spec_paths], time.perf_counter() - start)
@@ -0,0 +1,217 @@
+"""Benchmarks for deck generation, with baseline comparison.
+
+Every case runs in a fresh spawned process so peak RSS is per case and
+import cost is not shared.  Each case records wall time for three phases
+(template load, slide build, serialize), peak RSS and output size; results
+are written as JSON and can be compared against a stored baseline::
+
+    python -m tokens_deck bench --out results.json --baseline benchmarks/baseline.json
+    python -m tokens_deck bench --save-baseline benchmarks/baseline.json
+
+A metric regresses when it exceeds the baseline by more than its threshold
+(a fraction: 0.2 means 20% slower/larger).
+"""
+
+import itertools
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pptx
+
+from .renderer import DeckRenderer
+from .spec import builtin_spec, load_spec
+from .writer import write_pptx
+
+DEFAULT_THRESHOLDS = {"time": 0.25, "rss": 0.15, "size": 0.05}
+TIME_METRICS = ("template_s", "build_s", "serialize_s", "total_s")
+
+
+def _pattern_slides():
+    """The non-title slides of both bundled decks, with their theme."""
+    for name in ("tokens_in_llms", "language_models_prompt_engineering"):
+        spec = builtin_spec(name)
+        for slide in spec["slides"]:
+            if slide["kind"] != "title":
+                yield spec["theme"], slide
+
+
+def scale_deck(count):
+    """A ``count``-slide deck cycling through the bundled slide patterns."""
+    patterns = [slide for theme, slide in _pattern_slides() if theme == "minimal"]
+    slides = [builtin_spec("tokens_in_llms")["slides"][0]]
+    for i, slide in zip(range(count - 1), itertools.cycle(patterns)):
+        slides.append(dict(slide, title=f"{slide['title']} ({i + 2})"))
+    return {"name": f"scale_{count}", "theme": "minimal", "slides": slides}
+
+
+def long_bullets_deck(slides=50, bullets=40):
+    items = [f"Bullet {i}: tokens are the units a language model reads" for i in range(bullets)]
+    return {
+        "name": "long_bullets",
+        "slides": [{"kind": "bullets", "title": f"Long list {n}", "items": items}
+                   for n in range(slides)],
+    }
+
+
+def network_deck(nodes=500):
+    """One slide with a layered network diagram of ``nodes`` ovals."""
+    layers = [nodes // 5, 2 * nodes // 5, nodes - 3 * nodes // 5]
+    return {
+        "name": f"network_{nodes}",
+        "theme": "slate",
+        "slides": [{"kind": "network", "title": "Network", "items": ["• nodes"],
+                    "layers": layers}],
+    }
+
+
+def diagram_deck(nodes=500, edges=3000, layers=10):
+    """One slide with an auto-laid-out flow of ``nodes`` boxes and ``edges``
+    connectors between later layers (fixed seed)."""
+    rng = np.random.default_rng(0)
+    layer = np.sort(rng.integers(0, layers, nodes))
+    pairs = rng.integers(0, nodes, (edges * 4, 2))
+    pairs = pairs[layer[pairs[:, 0]] < layer[pairs[:, 1]]][:edges]
+    return {
+        "name": f"diagram_{nodes}",
+        "theme": "minimal",
+        "slides": [{"kind": "diagram", "title": "Diagram", "labels": False,
+                    "nodes": [{"id": i, "layer": int(n)} for i, n in enumerate(layer)],
+                    "edges": pairs.tolist()}],
+    }
+
+
+def table_deck(rows=10000):
+    """One table of ``rows`` rows, paginated into continuation slides."""
+    return {
+        "name": f"table_{rows}",
+        "theme": "minimal",
+        "slides": [{"kind": "table", "title": "Vocabulary", "columns": ["token", "id", "count"],
+                    "rows": [[f"tok{i}", i, i * 7] for i in range(rows)]}],
+    }
+
+
+CASES = {
+    "tokens_in_llms": lambda: builtin_spec("tokens_in_llms"),
+    "language_models": lambda: builtin_spec("language_models_prompt_engineering"),
+    "scale_100": lambda: scale_deck(100),
+    "scale_1000": lambda: scale_deck(1000),
+    "scale_5000": lambda: scale_deck(5000),
+    "long_bullets": long_bullets_deck,
+    "network_500": network_deck,
+    "diagram_500": diagram_deck,
+    "table_10k": table_deck,
+}
+QUICK_CASES = ("tokens_in_llms", "language_models", "scale_100", "long_bullets", "network_500")
+
+
+class _CountingSink:
+    """Write-only stream that only counts bytes (serialize without buffering)."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def run_case(name, repeat=1):
+    """Run one case ``repeat`` times in this process; best time per phase."""
+    spec = load_spec(CASES[name]())
+    renderer = DeckRenderer()
+    best = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        deck = renderer.start_deck(spec)
+        loaded = time.perf_counter()
+        for index, slide_spec in enumerate(renderer.iter_slides(deck, spec), 1):
+            renderer.add_slide(deck, slide_spec, index)
+        built = time.perf_counter()
+        sink = _CountingSink()
+        write_pptx(deck.prs, sink)
+        done = time.perf_counter()
+        times = {
+            "template_s": loaded - start,
+            "build_s": built - loaded,
+            "serialize_s": done - built,
+            "total_s": done - start,
+        }
+        for metric, value in times.items():
+            best[metric] = min(value, best.get(metric, value))
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    return dict(best, peak_rss_mb=round(rss_mb, 1), size_bytes=sink.size,
+                slides=len(deck.prs.slides))
+
+
+def run_benchmarks(names, repeat=1, progress=None):
+    """Run cases, each in its own spawned process, and return the results doc."""
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            results[name] = pool.submit(run_case, name, repeat).result()
+        if progress:
+            progress(name, results[name])
+    return {
+        "python": platform.python_version(),
+        "python_pptx": pptx.__version__,
+        "machine": platform.machine(),
+        "cases": results,
+    }
+
+
+def compare(results, baseline, thresholds=None):
+    """Return a list of human-readable regressions against ``baseline``."""
+    thresholds = dict(DEFAULT_THRESHOLDS, **{k: v for k, v in (thresholds or {}).items()
+                                             if v is not None})
+    regressions = []
+    for name, current in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        checks = [(m, thresholds["time"]) for m in TIME_METRICS]
+        checks += [("peak_rss_mb", thresholds["rss"]), ("size_bytes", thresholds["size"])]
+        for metric, limit in checks:
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > limit:
+                regressions.append(
+                    f"{name}.{metric}: {old:.4g} -> {new:.4g} (+{change:.0%}, limit {limit:.0%})"
+                )
+    return regressions
+
+
+def format_results(results):
+    lines = [f"{'case':<18}{'slides':>7}{'template':>10}{'build':>9}{'serialize':>11}"
+             f"{'total':>9}{'rss MB':>9}{'size KB':>10}"]
+    for name, r in results["cases"].items():
+        lines.append(
+            f"{name:<18}{r['slides']:>7}{r['template_s']:>10.3f}{r['build_s']:>9.3f}"
+            f"{r['serialize_s']:>11.3f}{r['total_s']:>9.3f}{r['peak_rss_mb']:>9.1f}"
+            f"{r['size_bytes'] / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def save_json(doc, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,147 @@
+"""On-disk cache of rendered slide XML for incremental rebuilds.
+
+Each slide spec is hashed together with the deck theme and a fingerprint of
+the rendering code.  When a deck is rebuilt, slides whose hash is already in
+the cache are restored from their stored ``p:sld`` XML instead of being
+drawn again, so rebuild time scales with the size of the edit rather than the
+size of the deck.
+
+Only slides whose sole relationship is their slide layout are cached; slides
+that reference other parts (pictures, charts) are always re-rendered.  The
+cache is bounded by ``max_bytes`` and evicts least recently used entries;
+hits refresh an entry's mtime, which is what eviction orders by.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_code_fingerprint = None
+
+
+def code_fingerprint():
+    """Hash of the package sources, so code changes invalidate cached slides."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package_dir)):
+            if name.endswith(".py"):
+                with open(os.path.join(package_dir, name), "rb") as f:
+                    digest.update(f.read())
+        _code_fingerprint = digest.hexdigest()
+    return _code_fingerprint
+
+
+def theme_fingerprint(theme):
+    # RGBColor is a tuple, so palette colors serialize as [r, g, b]
+    return json.dumps(vars(theme), sort_keys=True, default=str)
+
+
+def slide_blob(slide):
+    """A slide's XML for ``DeckBuilder.restore_slide``, or None when it
+    relates to parts other than its layout (images, charts) and so cannot
+    be restored from XML alone."""
+    if any(rel.reltype != RT.SLIDE_LAYOUT for rel in slide.part.rels.values()):
+        return None
+    return serialize_part_xml(slide._element)
+
+
+def _json_default(value):
+    # Arrays (chart data) hash by content; str() would elide long ones
+    if hasattr(value, "tobytes"):
+        return [str(getattr(value, "dtype", "")), list(getattr(value, "shape", ())),
+                hashlib.sha256(value.tobytes()).hexdigest()]
+    return str(value)
+
+
+class SlideCache:
+    """Content-addressed store of slide XML with size-bounded LRU eviction."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def key(self, theme, slide_spec):
+        """Return the content hash for one slide spec under ``theme``."""
+        payload = json.dumps(
+            [code_fingerprint(), theme_fingerprint(theme), slide_spec],
+            sort_keys=True, default=_json_default,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached slide XML for ``key``, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # evicted since it was read; the blob is still good
+        self.hits += 1
+        return blob
+
+    def put(self, key, slide):
+        """Store a rendered slide if it can be restored from XML alone."""
+        blob = slide_blob(slide)
+        if blob is None:
+            return False
+        path = self._path(key)
+        try:
+            old_size = os.path.getsize(path)  # a rewritten entry is not counted twice
+        except FileNotFoundError:
+            old_size = 0
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+        self._size += len(blob) - old_size
+        if self._size > self.max_bytes:
+            self.evict()
+        return True
+
+    def evict(self):
+        """Drop least recently used entries until under ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            os.remove(path)
+        self._size = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.xml")
+
+    def _entries(self):
+        """Yield ``(path, size, mtime)`` for every cached slide."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".xml"):
+                    st = entry.stat()
+                    yield entry.path, st.st_size, st.st_mtime
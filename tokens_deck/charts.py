@@ -0,0 +1,93 @@
+"""Preparing chart data: array conversion and LTTB downsampling.
+
+Chart slides accept NumPy arrays (or anything ``np.asarray`` takes) for their
+values.  Line series longer than the slide's ``max_points`` are reduced with
+Largest-Triangle-Three-Buckets, which keeps the peaks and troughs a line
+chart needs, before the points reach the chart XML and embedded workbook.
+Column and bar charts label every category, so they are never thinned; one
+with more than ``max_points`` categories is an error.
+"""
+
+import numpy as np
+
+DEFAULT_MAX_POINTS = 1000
+
+
+def lttb(x, y, n):
+    """Indices of ``n`` points of ``(x, y)`` chosen by LTTB.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    chosen point and the mean of the next bucket.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.intp)
+    chosen = np.empty(n, np.intp)
+    chosen[0], chosen[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < n - 1 else size
+        mean_x = x[hi:next_hi].mean()
+        mean_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - mean_x) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (mean_y - y[a]))
+        a = lo + int(np.nanargmax(area)) if np.isfinite(area).any() else lo
+        chosen[i + 1] = a
+    return chosen
+
+
+def downsample(x, columns, max_points=DEFAULT_MAX_POINTS):
+    """Indices of at most ``max_points`` points of columns sharing the axis ``x``.
+
+    Each column picks its share of the points with LTTB and the union is
+    kept, so a spike in any series survives.  When there are too many
+    columns for a share of three points each, the union is thinned evenly.
+    """
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    share = max(3, max_points // max(1, len(columns)))
+    keep = np.unique(np.concatenate([lttb(x, column, share) for column in columns]))
+    if len(keep) > max_points:
+        keep = keep[np.linspace(0, len(keep) - 1, max_points).round().astype(np.intp)]
+    return keep
+
+
+def chart_data(spec, max_points=DEFAULT_MAX_POINTS):
+    """Turn a chart slide spec into ``(categories, series)`` for ``DeckBuilder.chart``.
+
+    Line charts without ``categories`` become XY charts over ``x`` (default:
+    the point index) and get ``(name, x, y)`` series; all other charts get
+    ``(name, values)`` series over their categories (default: 1..n).  Only
+    line charts are downsampled.
+    """
+    names = [s["name"] for s in spec["series"]]
+    columns = [np.asarray(s["values"], dtype=float) for s in spec["series"]]
+    length = len(columns[0])
+    if any(len(column) != length for column in columns):
+        raise ValueError("chart series must all have the same length")
+    max_points = spec.get("max_points", max_points)
+
+    categories = spec.get("categories")
+    line = spec.get("chart", "column") == "line"
+    if categories is None and line:
+        x = np.asarray(spec["x"], dtype=float) if "x" in spec else np.arange(length, dtype=float)
+        keep = downsample(x, columns, max_points)
+        xs = x[keep].tolist()
+        return None, [(name, xs, column[keep].tolist()) for name, column in zip(names, columns)]
+
+    if categories is None:
+        categories = np.arange(1, length + 1)
+    if line:
+        keep = downsample(np.arange(length, dtype=float), columns, max_points)
+    elif length > max_points:
+        raise ValueError(f"{length} categories are more than max_points ({max_points}); "
+                         "aggregate them or use a line chart")
+    else:
+        keep = np.arange(length)
+    categories = np.asarray(categories)[keep].tolist()
+    return categories, [(name, column[keep].tolist()) for name, column in zip(names, columns)]
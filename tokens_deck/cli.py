@@ -0,0 +1,401 @@
+"""Command line interface: ``python -m tokens_deck <command> ...``.
+
+Commands import what they need when they run, so ``client`` starts without
+loading python-pptx.
+"""
+
+import argparse
+import sys
+
+
+def cmd_render(args):
+    from .cache import SlideCache
+    from .images import ImagePipeline
+    from .profiling import DeckProfiler
+    from .renderer import DeckRenderer
+    from .spec import SpecError, load_spec
+    from .writer import open_output
+
+    cache = SlideCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+    images = ImagePipeline(args.image_cache, dpi=args.dpi)
+    renderer = DeckRenderer(slide_cache=cache, tokenizer=args.tokenizer, images=images,
+                            reproducible=args.reproducible)
+    profiler = DeckProfiler() if args.profile or args.flamegraph else None
+    if profiler and args.stream:
+        print("--stream cannot be combined with profiling", file=sys.stderr)
+        return 2
+    try:
+        spec = load_spec(args.spec)
+        with open_output(args.output) as out:
+            if args.stream:
+                renderer.stream_to(spec, out)
+            else:
+                renderer.render_to(spec, out, profiler)
+    except (SpecError, OSError) as exc:
+        print(f"render failed: {exc}", file=sys.stderr)
+        return 1
+    # Keep stdout clean when the deck itself is written there
+    log = sys.stderr if args.output == "-" else sys.stdout
+    print(f"Presentation saved to {args.output}", file=log)
+    if cache:
+        print(f"slide cache: {cache.hits} reused, {cache.misses} rendered", file=log)
+    if images.processed or images.reused:
+        print(f"images: {images.processed} processed, {images.reused} from cache", file=log)
+    if profiler:
+        print_profile(profiler, log)
+        if args.profile:
+            profiler.write_json(args.profile)
+        if args.flamegraph:
+            profiler.write_folded(args.flamegraph)
+    return 0
+
+
+def print_profile(profiler, file):
+    phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in profiler.phases.items())
+    print(f"profile: {phases}", file=file)
+    print(f"{'slide':>6} {'builder':<24}{'ms':>9}{'shapes':>8}{'elements':>10}{'bytes':>9}",
+          file=file)
+    for r in profiler.slowest():
+        print(f"{r['index']:>6} {r['builder']:<24}{r['seconds'] * 1000:>9.2f}{r['shapes']:>8}"
+              f"{r['elements']:>10}{r['part_bytes']:>9}", file=file)
+
+
+def cmd_render_batch(args):
+    from .batch import find_specs, render_batch
+
+    def progress(result):
+        if not result.ok:
+            print(f"FAILED {result.spec_path} (attempt {result.attempts}): {result.error}",
+                  file=sys.stderr)
+        elif args.verbose:
+            print(f"{result.output_path}: {result.slides} slides in {result.seconds:.3f}s")
+
+    specs = find_specs(args.specs)
+    if not specs:
+        print("no deck specs found", file=sys.stderr)
+        return 2
+    result = render_batch(
+        specs, args.out, jobs=args.jobs, chunksize=args.chunksize,
+        retries=args.retries, progress=progress, cache_dir=args.cache_dir,
+        cache_size=args.cache_size * 1024 * 1024, image_cache_dir=args.image_cache,
+        dpi=args.dpi,
+    )
+    print(result.summary())
+    return 1 if result.failed else 0
+
+
+def cmd_merge(args):
+    from .merge import merge_decks, read_records
+    from .renderer import DeckRenderer
+    from .spec import SpecError
+
+    def progress(path):
+        if args.verbose:
+            print(path)
+
+    try:
+        result = merge_decks(args.template, read_records(args.data), args.out,
+                             filename=args.filename,
+                             renderer=DeckRenderer(reproducible=args.reproducible),
+                             progress=progress)
+    except (SpecError, OSError) as exc:
+        print(f"merge failed: {exc}", file=sys.stderr)
+        return 1
+    print(result.summary())
+    return 0
+
+
+def cmd_preview(args):
+    import os
+    import time
+
+    from .raster import check_previews, preview_name, rasterize
+
+    start = time.perf_counter()
+    if args.deck.endswith(".pptx"):
+        from pptx import Presentation
+
+        prs = Presentation(args.deck)
+    else:
+        from .renderer import DeckRenderer
+
+        prs = DeckRenderer().build(args.deck)
+    previews = rasterize(prs, width=args.width, jobs=args.jobs)
+    os.makedirs(args.out, exist_ok=True)
+    for index, data in enumerate(previews, 1):
+        with open(os.path.join(args.out, preview_name(index)), "wb") as f:
+            f.write(data)
+    print(f"{len(previews)} previews in {time.perf_counter() - start:.2f}s")
+    if args.compare:
+        failures = check_previews(previews, args.compare, args.out, args.tolerance)
+        for name, fraction in failures:
+            print(f"CHANGED {name}: {fraction:.1%} of pixels differ")
+        if failures:
+            return 1
+        print(f"all slides match {args.compare}")
+    return 0
+
+
+def cmd_index(args):
+    from .search import SearchIndex
+
+    def progress(path, error):
+        if error:
+            print(f"FAILED {path}: {error}", file=sys.stderr)
+        elif args.verbose:
+            print(path)
+
+    with SearchIndex(args.db) as index:
+        result = index.update(args.paths, jobs=args.jobs, progress=progress)
+        decks, slides, terms = index.stats()
+    print(f"{result.summary()}; index holds {decks} decks, {slides} slides, {terms} terms")
+    return 1 if result.failed else 0
+
+
+def cmd_search(args):
+    from .search import SearchIndex
+
+    with SearchIndex(args.db) as index:
+        hits = index.search(args.query, limit=args.limit)
+    for hit in hits:
+        print(f"{hit.path}:{hit.slide}: [{hit.title}] {hit.text}")
+    return 0 if hits else 1
+
+
+def cmd_bench(args):
+    from . import bench
+
+    names = args.cases or (bench.QUICK_CASES if args.quick else list(bench.CASES))
+    unknown = [n for n in names if n not in bench.CASES]
+    if unknown:
+        print(f"unknown cases: {', '.join(unknown)}; choose from {', '.join(bench.CASES)}",
+              file=sys.stderr)
+        return 2
+
+    results = bench.run_benchmarks(
+        names, repeat=args.repeat,
+        progress=lambda name, r: print(f"{name}: {r['total_s']:.3f}s", file=sys.stderr),
+    )
+    print(bench.format_results(results))
+    if args.out:
+        bench.save_json(results, args.out)
+    if args.save_baseline:
+        bench.save_json(results, args.save_baseline)
+        print(f"baseline saved to {args.save_baseline}")
+    if args.baseline:
+        thresholds = {"time": args.max_time, "rss": args.max_rss, "size": args.max_size}
+        regressions = bench.compare(results, bench.load_json(args.baseline), thresholds)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+
+def cmd_corpus_stats(args):
+    from .bench import save_json
+    from .corpus import corpus_stats
+
+    prices = {}
+    for price in args.price:
+        name, _, usd = price.partition("=")
+        prices[name] = float(usd)
+    stats = corpus_stats(args.paths, args.tokenizer, jobs=args.jobs,
+                         chunk_bytes=args.chunk_mb * 1024 * 1024, language=args.language,
+                         top_k=args.top)
+    print(f"{'group':<24}{'files':>7}{'MB':>10}{'tokens':>14}{'tokens/char':>13}")
+    for kind, table in (("language", stats.languages), ("type", stats.filetypes)):
+        for label, group in sorted(table.items()):
+            print(f"{kind + ' ' + label:<24}{group.files:>7}{group.bytes / 1e6:>10.1f}"
+                  f"{group.tokens:>14,}{group.tokens_per_char:>13.3f}")
+    for name, usd in stats.cost(prices).items():
+        print(f"cost {name}: ${usd:,.2f}")
+    if args.json:
+        save_json(stats.to_dict(prices), args.json)
+    if args.slides:
+        save_json({"name": "corpus_stats", "theme": args.theme,
+                   "slides": stats.chart_slides(prices)}, args.slides)
+        print(f"chart slides written to {args.slides}")
+    return 0
+
+
+def cmd_serve(args):
+    from .server import serve
+    from .store import DeckStore
+
+    store = None
+    if args.store:
+        max_age = args.store_max_age * 3600 if args.store_max_age else None
+        store = DeckStore(args.store, args.store_size * 1024 * 1024, max_age)
+    serve(args.socket, args.host, args.port, quiet=args.quiet, store=store)
+    return 0
+
+
+def cmd_client(args):
+    from .client import RenderError, render_remote
+
+    with open(args.spec, "rb") as f:
+        body = f.read()
+    fmt = "yaml" if args.spec.endswith((".yaml", ".yml")) else "json"
+    try:
+        data = render_remote(body, args.socket, args.host, args.port, fmt=fmt)
+    except (RenderError, OSError) as exc:
+        print(f"render failed: {exc}", file=sys.stderr)
+        return 1
+    if args.output == "-":
+        sys.stdout.buffer.write(data)
+    else:
+        with open(args.output, "wb") as f:
+            f.write(data)
+    return 0
+
+
+def _add_address_args(parser):
+    parser.add_argument("--socket", help="Unix socket path (default: per-user socket)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="use TCP on --host:--port instead of a socket")
+
+
+def _add_cache_args(parser):
+    parser.add_argument("--cache-dir", help="reuse unchanged slides from this directory")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="slide cache size limit in MB (default: 256)")
+    parser.add_argument("--image-cache", metavar="DIR",
+                        help="keep processed images here and reuse them across builds")
+    parser.add_argument("--dpi", type=int, default=150,
+                        help="resolution images are scaled to on the slide (default: 150)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="tokens-deck", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="render one deck spec")
+    render.add_argument("spec", help="JSON or YAML deck spec")
+    render.add_argument("-o", "--output", required=True,
+                        help="output .pptx path, or - for standard output")
+    _add_cache_args(render)
+    render.add_argument("--tokenizer", metavar="PATH",
+                        help="compute token examples with this BPE tokenizer "
+                             "(tokenizer.json, or a directory with vocab.json + merges.txt)")
+    render.add_argument("--profile", metavar="REPORT.json",
+                        help="profile every slide and write a JSON report")
+    render.add_argument("--flamegraph", metavar="STACKS.folded",
+                        help="write folded stacks for flamegraph tools")
+    render.add_argument("--stream", action="store_true",
+                        help="write each slide as soon as it is built, so memory stays "
+                             "flat for very long decks (not with --profile)")
+    render.add_argument("--reproducible", action="store_true",
+                        help="fix every timestamp ($SOURCE_DATE_EPOCH or 1980-01-01), so "
+                             "the same spec always gives the same bytes")
+    render.set_defaults(func=cmd_render)
+
+    batch = commands.add_parser("render-batch", help="render many specs in parallel")
+    batch.add_argument("specs", nargs="+", help="spec files or directories of specs")
+    batch.add_argument("--out", required=True, help="output directory")
+    batch.add_argument("-j", "--jobs", type=int, default=None,
+                       help="worker processes (default: CPU count)")
+    batch.add_argument("--chunksize", type=int, default=4,
+                       help="specs handed to a worker per task")
+    batch.add_argument("--retries", type=int, default=1,
+                       help="extra attempts for a deck that fails")
+    batch.add_argument("-v", "--verbose", action="store_true")
+    _add_cache_args(batch)
+    batch.set_defaults(func=cmd_render_batch)
+
+    merge = commands.add_parser("merge", help="render a template deck once per data record")
+    merge.add_argument("template", help="deck spec with {{field}} placeholders")
+    merge.add_argument("data", help="records as .csv, .jsonl or .parquet (needs pyarrow)")
+    merge.add_argument("--out", required=True, help="output directory")
+    merge.add_argument("--filename", default="{{_index}}.pptx",
+                       help="output name template (default: {{_index}}.pptx)")
+    merge.add_argument("--reproducible", action="store_true",
+                       help="fix every timestamp, so the same record always gives the "
+                            "same bytes")
+    merge.add_argument("-v", "--verbose", action="store_true")
+    merge.set_defaults(func=cmd_merge)
+
+    preview = commands.add_parser("preview", help="draw PNG previews of a deck's slides")
+    preview.add_argument("deck", help="deck spec, or a .pptx file")
+    preview.add_argument("--out", required=True, help="directory for slide-NNN.png")
+    preview.add_argument("--width", type=int, default=1280, help="preview width in pixels")
+    preview.add_argument("-j", "--jobs", type=int, default=None,
+                         help="worker processes (default: CPU count)")
+    preview.add_argument("--compare", metavar="DIR",
+                         help="fail if slides differ from the previews in DIR")
+    preview.add_argument("--tolerance", type=float, default=0.01,
+                         help="fraction of pixels a slide may change (default: 0.01)")
+    preview.set_defaults(func=cmd_preview)
+
+    index = commands.add_parser("index", help="add new or changed .pptx files to a search index")
+    index.add_argument("db", help="SQLite index file (created if missing)")
+    index.add_argument("paths", nargs="+", help=".pptx files or directories")
+    index.add_argument("-j", "--jobs", type=int, default=None,
+                       help="worker processes (default: CPU count)")
+    index.add_argument("-v", "--verbose", action="store_true")
+    index.set_defaults(func=cmd_index)
+
+    search = commands.add_parser("search", help="find slides containing a phrase")
+    search.add_argument("db", help="index built with the index command")
+    search.add_argument("query", help="phrase to look for (case-insensitive)")
+    search.add_argument("--limit", type=int, default=100)
+    search.set_defaults(func=cmd_search)
+
+    perf = commands.add_parser("bench", help="benchmark deck generation")
+    perf.add_argument("cases", nargs="*", help="cases to run (default: all)")
+    perf.add_argument("--quick", action="store_true", help="skip the 1,000+ slide cases")
+    perf.add_argument("--repeat", type=int, default=3, help="runs per case, best kept")
+    perf.add_argument("--out", help="write results JSON here")
+    perf.add_argument("--baseline", help="compare against this results JSON")
+    perf.add_argument("--save-baseline", help="write results as the new baseline")
+    # Same values as bench.DEFAULT_THRESHOLDS, which is not imported here
+    perf.add_argument("--max-time", type=float, default=0.25,
+                      help="allowed time regression as a fraction (default: %(default)s)")
+    perf.add_argument("--max-rss", type=float, default=0.15,
+                      help="allowed peak RSS regression (default: %(default)s)")
+    perf.add_argument("--max-size", type=float, default=0.05,
+                      help="allowed output size regression (default: %(default)s)")
+    perf.set_defaults(func=cmd_bench)
+
+    stats = commands.add_parser("corpus-stats", help="token statistics for a text corpus")
+    stats.add_argument("paths", nargs="+", help="text files or directories")
+    stats.add_argument("--tokenizer", required=True, metavar="PATH",
+                       help="BPE tokenizer (tokenizer.json, or vocab.json + merges.txt dir)")
+    stats.add_argument("-j", "--jobs", type=int, default=None,
+                       help="worker processes (default: CPU count)")
+    stats.add_argument("--chunk-mb", type=int, default=32, help="bytes per task, in MB")
+    stats.add_argument("--language", choices=("script", "dir"), default="script",
+                       help="label files by detected script or by parent directory")
+    stats.add_argument("--top", type=int, default=20, help="frequent words to track")
+    stats.add_argument("--price", action="append", default=[], metavar="MODEL=USD",
+                       help="input price per million tokens, for cost estimates")
+    stats.add_argument("--json", help="write the statistics as JSON")
+    stats.add_argument("--slides", help="write a deck spec with chart slides")
+    stats.add_argument("--theme", default="minimal", help="theme of the --slides deck")
+    stats.set_defaults(func=cmd_corpus_stats)
+
+    server = commands.add_parser("serve", help="run a warm render server")
+    _add_address_args(server)
+    server.add_argument("-q", "--quiet", action="store_true", help="no request log")
+    server.add_argument("--store", metavar="DIR",
+                        help="keep rendered decks here and answer repeat requests from them")
+    server.add_argument("--store-size", type=int, default=1024,
+                        help="deck store size limit in MB (default: 1024)")
+    server.add_argument("--store-max-age", type=float, metavar="HOURS",
+                        help="drop stored decks not requested for this long")
+    server.set_defaults(func=cmd_serve)
+
+    client = commands.add_parser("client", help="render a spec on a running server")
+    client.add_argument("spec", help="JSON or YAML deck spec")
+    client.add_argument("-o", "--output", required=True,
+                        help="output .pptx path, or - for standard output")
+    _add_address_args(client)
+    client.set_defaults(func=cmd_client)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
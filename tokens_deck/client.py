@@ -0,0 +1,61 @@
+"""Thin client for the render server (standard library only).
+
+This module deliberately avoids importing python-pptx so a client call costs
+little more than interpreter start-up.
+"""
+
+import http.client
+import json
+import os
+import socket
+
+PPTX_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def default_socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(runtime_dir, f"tokens-deck-{os.getuid()}.sock")
+
+
+class RenderError(RuntimeError):
+    """The server rejected or failed to render a spec."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=60):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+def connect(socket_path=None, host="127.0.0.1", port=None, timeout=60):
+    if port is not None:
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+    return _UnixHTTPConnection(socket_path or default_socket_path(), timeout=timeout)
+
+
+def render_remote(spec, socket_path=None, host="127.0.0.1", port=None, fmt="json",
+                  timeout=60):
+    """Send a spec (dict or JSON/YAML text) to the server; return .pptx bytes."""
+    body = spec if isinstance(spec, (str, bytes)) else json.dumps(spec)
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    conn = connect(socket_path, host, port, timeout)
+    try:
+        conn.request("POST", "/render", body=body,
+                     headers={"Content-Type": f"application/{fmt}"})
+        response = conn.getresponse()
+        data = response.read()
+    finally:
+        conn.close()
+    if response.status != 200:
+        try:
+            message = json.loads(data)["error"]
+        except (ValueError, KeyError):
+            message = data.decode("utf-8", "replace")
+        raise RenderError(f"{response.status}: {message}")
+    return data
@@ -0,0 +1,85 @@
+"""Compile a ``Theme`` into the theme, master and presentation parts.
+
+Once the palette lives in the theme's color scheme and the type scale in the
+master/presentation text styles, slides only need to carry what differs from
+those defaults: body text paragraphs carry no run properties at all, and
+everything else refers to scheme colors (``a:schemeClr``) instead of
+repeating RGB literals.
+"""
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+# Scheme color references used in text styles
+TITLE_COLOR = "tx1"
+BODY_COLOR = "tx2"
+
+
+def compile_theme(prs, theme):
+    """Write ``theme`` into ``prs`` so slides can rely on inherited styles."""
+    master = prs.slide_master
+    _compile_color_scheme(master.part.part_related_by(RT.THEME), theme)
+
+    txStyles = master._element.find(qn("p:txStyles"))
+    _set_levels(txStyles.find(qn("p:titleStyle")), theme.title_size, TITLE_COLOR, bold=True)
+    _set_levels(txStyles.find(qn("p:bodyStyle")), theme.body_size, BODY_COLOR,
+                sublevel_size=theme.small_size)
+    _set_levels(txStyles.find(qn("p:otherStyle")), theme.body_size, BODY_COLOR)
+
+    # Textboxes and autoshapes take their defaults from the presentation
+    _set_levels(prs.part._element.find(qn("p:defaultTextStyle")), theme.body_size, BODY_COLOR)
+
+    for layout in master.slide_layouts:
+        _strip_layout_overrides(layout._element)
+
+
+def _compile_color_scheme(theme_part, theme):
+    root = etree.fromstring(theme_part.blob)
+    clrScheme = root.find(f"{qn('a:themeElements')}/{qn('a:clrScheme')}")
+    clrScheme.set("name", theme.name)
+    for slot, rgb in theme.scheme_colors().items():
+        el = clrScheme.find(qn(f"a:{slot}"))
+        for child in list(el):
+            el.remove(child)
+        etree.SubElement(el, qn("a:srgbClr"), val=str(rgb))
+    theme_part._blob = etree.tostring(root, xml_declaration=True, encoding="UTF-8",
+                                      standalone=True)
+
+
+def _set_levels(style, size, color, bold=False, sublevel_size=None):
+    """Set size/color (and boldness) on every ``a:lvlNpPr/a:defRPr``."""
+    if style is None:
+        return
+    for level in range(1, 10):
+        pPr = style.find(qn(f"a:lvl{level}pPr"))
+        if pPr is None:
+            continue
+        defRPr = pPr.find(qn("a:defRPr"))
+        if defRPr is None:
+            defRPr = etree.SubElement(pPr, qn("a:defRPr"))
+        if level == 1 or sublevel_size is None:
+            defRPr.set("sz", str(size * 100))
+        else:
+            defRPr.set("sz", str(sublevel_size * 100))
+        if bold:
+            defRPr.set("b", "1")
+        _set_scheme_fill(defRPr, color)
+
+
+def _set_scheme_fill(defRPr, color):
+    for fill in defRPr.findall(qn("a:solidFill")):
+        defRPr.remove(fill)
+    solidFill = etree.Element(qn("a:solidFill"))
+    etree.SubElement(solidFill, qn("a:schemeClr"), val=color)
+    # a:solidFill must precede the font elements (a:latin, a:ea, ...)
+    ln = defRPr.find(qn("a:ln"))
+    defRPr.insert(0 if ln is None else defRPr.index(ln) + 1, solidFill)
+
+
+def _strip_layout_overrides(layout):
+    """Drop hard-coded sizes/colors in layout placeholders so the master wins."""
+    for defRPr in layout.iter(qn("a:defRPr")):
+        defRPr.attrib.pop("sz", None)
+        for fill in defRPr.findall(qn("a:solidFill")):
+            defRPr.remove(fill)
@@ -0,0 +1,386 @@
+"""Streaming token statistics for text corpora, emitted as chart slides.
+
+Files are split into byte ranges of about ``chunk_bytes`` (aligned to line
+breaks, or to spaces within very long lines, and never inside a UTF-8
+character) and tokenized across a process pool; each worker loads the
+tokenizer once.  A range is read in small blocks, so memory depends on the
+block size, the vocabulary and the sketch size, never on the corpus:
+
+* tokens and characters are totalled per language and per file type;
+* the token-id histogram is exact (its size is bounded by the vocabulary);
+* word frequencies, which are unbounded, go into a Count-Min sketch that
+  tracks the ``top_k`` most frequent words.
+
+``CorpusStats.chart_slides()`` turns the result into ``chart`` slide specs.
+"""
+
+import hashlib
+import heapq
+import os
+import unicodedata
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+
+from .tokenizer import load_tokenizer
+
+DEFAULT_CHUNK_BYTES = 32 * 1024 * 1024
+BLOCK_BYTES = 1024 * 1024
+SCRIPT_SAMPLE_BYTES = 64 * 1024
+
+_tokenizer = None
+
+
+class CountMinSketch:
+    """Count-Min sketch over strings that also tracks the top ``k`` keys.
+
+    Hashes are stable across processes, so sketches built in different
+    workers can be merged.
+    """
+
+    def __init__(self, width=1 << 15, depth=4, k=20):
+        self.width = width
+        self.depth = depth
+        self.k = k
+        self.table = np.zeros((depth, width), np.int64)
+        self.top = {}
+
+    def _columns(self, keys):
+        size = 4 * self.depth
+        digests = b"".join(hashlib.blake2b(key.encode("utf-8"), digest_size=size).digest()
+                           for key in keys)
+        return (np.frombuffer(digests, "<u4").reshape(len(keys), self.depth)
+                % self.width).T
+
+    def estimate(self, keys):
+        keys = list(keys)
+        if not keys:
+            return np.zeros(0, np.int64)
+        cols = self._columns(keys)
+        return self.table[np.arange(self.depth)[:, None], cols].min(axis=0)
+
+    def update(self, counts):
+        """Add a ``{key: count}`` mapping."""
+        keys = list(counts)
+        if not keys:
+            return
+        cols = self._columns(keys)
+        values = np.fromiter(counts.values(), np.int64, len(keys))
+        for row in range(self.depth):
+            np.add.at(self.table[row], cols[row], values)
+        self._refresh_top(keys)
+
+    def merge(self, other):
+        self.table += other.table
+        self._refresh_top(list(other.top))
+
+    def _refresh_top(self, keys):
+        candidates = list(set(self.top).union(keys))
+        estimates = self.estimate(candidates)
+        self.top = dict(heapq.nlargest(self.k, zip(candidates, estimates.tolist()),
+                                       key=lambda item: item[1]))
+
+    def most_common(self):
+        return sorted(self.top.items(), key=lambda item: -item[1])
+
+
+@dataclass
+class GroupStats:
+    """Totals for one language or file type."""
+
+    files: int = 0
+    bytes: int = 0
+    chars: int = 0
+    tokens: int = 0
+
+    @property
+    def tokens_per_char(self):
+        return self.tokens / self.chars if self.chars else 0.0
+
+    def add(self, other):
+        self.bytes += other.bytes
+        self.chars += other.chars
+        self.tokens += other.tokens
+
+
+@dataclass
+class CorpusStats:
+    """Merged statistics for a corpus."""
+
+    tokenizer: str
+    languages: Dict[str, GroupStats] = field(default_factory=dict)
+    filetypes: Dict[str, GroupStats] = field(default_factory=dict)
+    token_counts: np.ndarray = None
+    words: CountMinSketch = None
+
+    @property
+    def total(self):
+        total = GroupStats()
+        for group in self.languages.values():
+            total.files += group.files
+            total.add(group)
+        return total
+
+    def cost(self, prices):
+        """``{model: USD}`` for ``prices`` given in USD per million tokens."""
+        return {name: self.total.tokens / 1e6 * price for name, price in prices.items()}
+
+    def top_tokens(self, n=15):
+        """The ``n`` most frequent tokens as ``(text, count)`` pairs."""
+        tokenizer = load_tokenizer(self.tokenizer)
+        ids = np.argsort(self.token_counts)[::-1][:n]
+        return [(_token_text(tokenizer, int(i)), int(self.token_counts[i]))
+                for i in ids if self.token_counts[i]]
+
+    def to_dict(self, prices=None):
+        def groups(table):
+            return {label: dict(vars(g), tokens_per_char=round(g.tokens_per_char, 4))
+                    for label, g in sorted(table.items())}
+
+        total = self.total
+        return {
+            "tokenizer": self.tokenizer,
+            "total": dict(vars(total), tokens_per_char=round(total.tokens_per_char, 4)),
+            "languages": groups(self.languages),
+            "filetypes": groups(self.filetypes),
+            "top_tokens": self.top_tokens(),
+            "top_words": self.words.most_common(),
+            "cost_usd": self.cost(prices or {}),
+        }
+
+    def chart_slides(self, prices=None, top=15):
+        """Slide specs charting the statistics (see the ``chart`` slide kind)."""
+        def ratio_chart(title, table):
+            labels = sorted(table, key=lambda label: table[label].tokens_per_char)
+            return {
+                "kind": "chart", "chart": "bar", "title": title,
+                "categories": labels,
+                "series": [{"name": "Tokens per character",
+                            "values": [round(table[label].tokens_per_char, 3)
+                                       for label in labels]}],
+                "number_format": "0.00", "labels": True,
+            }
+
+        total = self.total
+        slides = [
+            dict(ratio_chart("Tokens per Character by Language", self.languages),
+                 caption=f"{total.tokens:,} tokens over {total.chars:,} characters"),
+            ratio_chart("Tokens per Character by File Type", self.filetypes),
+        ]
+        tokens = self.top_tokens(top)
+        slides.append({
+            "kind": "chart", "chart": "bar", "title": "Most Frequent Tokens",
+            "categories": [repr(text) for text, _ in tokens],
+            "series": [{"name": "Occurrences", "values": [count for _, count in tokens]}],
+            "number_format": "#,##0",
+        })
+        if prices:
+            costs = self.cost(prices)
+            slides.append({
+                "kind": "chart", "chart": "column", "title": "Cost to Process the Corpus",
+                "categories": list(costs),
+                "series": [{"name": "USD", "values": [round(c, 2) for c in costs.values()]}],
+                "number_format": "$#,##0.00", "labels": True,
+                "caption": "Input tokens at the given price per million tokens",
+            })
+        return slides
+
+
+def _token_text(tokenizer, token_id):
+    """A token's text, or its bytes when it holds part of a UTF-8 character."""
+    data = bytes(tokenizer.byte_decoder[c] for c in tokenizer.decoder[token_id])
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return "<" + " ".join(f"0x{b:02X}" for b in data) + ">"
+
+
+def find_files(paths):
+    """Expand files and directories (recursively, skipping hidden entries)."""
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            found.extend(os.path.join(root, name) for name in sorted(files)
+                         if not name.startswith("."))
+    return found
+
+
+def detect_script(text):
+    """Dominant Unicode script of the letters in ``text`` (a language proxy)."""
+    counts = Counter()
+    for ch in text:
+        if ch.isalpha():
+            counts["Latin" if ch < "\x80" else
+                   unicodedata.name(ch, "Other").split(" ", 1)[0].title()] += 1
+    return counts.most_common(1)[0][0] if counts else "None"
+
+
+def file_labels(path, language="script"):
+    """``(language, file type)`` for a file.
+
+    ``language="script"`` detects the dominant script of the file's start;
+    ``"dir"`` uses the parent directory name (``corpus/<language>/...``).
+    """
+    filetype = os.path.splitext(path)[1].lower() or "(none)"
+    if language == "dir":
+        return os.path.basename(os.path.dirname(os.path.abspath(path))), filetype
+    with open(path, "rb") as f:
+        sample = f.read(SCRIPT_SAMPLE_BYTES).decode("utf-8", "replace")
+    return detect_script(sample), filetype
+
+
+def _last_break(data):
+    """Where to cut ``data``: after its last line break, else before its last
+    space or tab, which starts a word (0 when it has neither)."""
+    end = data.rfind(b"\n")
+    if end >= 0:
+        return end + 1
+    return max(data.rfind(b" "), data.rfind(b"\t"), 0)
+
+
+def _char_boundary(data, i):
+    """``i``, or the start of the next UTF-8 character when ``i`` falls
+    inside one (continuation bytes are ``0b10xxxxxx``)."""
+    end = min(i + 3, len(data))
+    while i < end and data[i] & 0xC0 == 0x80:
+        i += 1
+    return i
+
+
+def range_start(f, offset, limit=BLOCK_BYTES):
+    """Where the range starting at byte ``offset`` of ``f`` really begins.
+
+    That is just after the first line break at or after ``offset - 1``, or
+    the end of the file.  When neither comes within ``limit`` bytes (a very
+    long line), it is just before the first space or tab there, or
+    ``offset`` itself (moved on to the next UTF-8 character if it falls
+    inside one).  The range before ends at the same point, so every
+    byte belongs to exactly one range.
+    """
+    if offset == 0:
+        return 0
+    f.seek(offset - 1)
+    data = f.read(limit)
+    end = data.find(b"\n")
+    if end < 0 and len(data) < limit:  # the last line: it runs to the end
+        return max(offset, offset - 1 + len(data))
+    if end >= 0:
+        return offset + end
+    spaces = [i for i in (data.find(b" "), data.find(b"\t")) if i >= 0]
+    return offset - 1 + (min(spaces) if spaces else _char_boundary(data, 1))
+
+
+def read_range(f, start, end, block_bytes=BLOCK_BYTES):
+    """Yield blocks of the lines that start in ``[start, end)`` of a binary file.
+
+    Blocks end at a line break where there is one within the block, else
+    before a space or tab, so a file with no line breaks is still read in
+    blocks of at most about ``2 * block_bytes``.
+    """
+    pos = range_start(f, start, block_bytes)
+    stop = range_start(f, end, block_bytes)
+    f.seek(pos)
+    carry = b""
+    while pos < stop:
+        data = f.read(min(block_bytes, stop - pos))
+        if not data:
+            break
+        pos += len(data)
+        block = carry + data
+        cut = _last_break(block) if pos < stop else len(block)
+        if len(block) - cut > block_bytes:
+            # No break in sight: split mid-word, but not mid-character
+            cut = _char_boundary(block, max(len(block) - 3, 0))
+        carry = block[cut:]
+        if cut:
+            yield block[:cut]
+    if carry:
+        yield carry
+
+
+def _init_worker(tokenizer_path):
+    global _tokenizer
+    _tokenizer = load_tokenizer(tokenizer_path)
+
+
+def _scan_range(path, start, end, vocab_size, sketch_args):
+    """Worker task: tokenize one byte range; returns partial statistics."""
+    tokenizer = _tokenizer
+    split, encode_word = tokenizer.pretokenize, tokenizer.encode_word
+    stats = GroupStats()
+    token_counts = np.zeros(vocab_size, np.int64)
+    words = CountMinSketch(**sketch_args)
+    with open(path, "rb") as f:
+        for block in read_range(f, start, end):
+            text = block.decode("utf-8", "replace")
+            stats.bytes += len(block)
+            stats.chars += len(text)
+            word_counts = Counter(split(text))
+            ids, weights = [], []
+            for word, count in word_counts.items():
+                word_ids = encode_word(word)
+                ids.extend(word_ids)
+                weights.extend([count] * len(word_ids))
+            stats.tokens += sum(weights)
+            if ids:
+                token_counts += np.bincount(ids, weights, vocab_size).astype(np.int64)
+            words.update(word_counts)
+    return stats, token_counts, words
+
+
+def _plan(files, chunk_bytes, language):
+    for path in files:
+        size = os.path.getsize(path)
+        labels = file_labels(path, language)
+        for start in range(0, max(size, 1), chunk_bytes):
+            yield path, start, min(start + chunk_bytes, size), labels, start == 0
+
+
+def corpus_stats(paths, tokenizer, jobs=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                 language="script", top_k=20, sketch_width=1 << 15, sketch_depth=4,
+                 progress=None):
+    """Tokenize every file under ``paths`` and return ``CorpusStats``.
+
+    ``tokenizer`` is a path for ``tokenizer.load_tokenizer``.  At most two
+    ranges per worker are in flight, so results never pile up in memory.
+    ``progress``, if given, is called with ``(path, bytes)`` per range.
+    """
+    tokenizer = os.fspath(tokenizer)
+    vocab_size = max(load_tokenizer(tokenizer).decoder) + 1
+    sketch_args = dict(width=sketch_width, depth=sketch_depth, k=top_k)
+    result = CorpusStats(tokenizer, token_counts=np.zeros(vocab_size, np.int64),
+                         words=CountMinSketch(**sketch_args))
+    jobs = jobs or os.cpu_count() or 1
+
+    def merge(task, partial):
+        path, _, _, (lang, filetype), first = task
+        stats, token_counts, words = partial
+        for table, label in ((result.languages, lang), (result.filetypes, filetype)):
+            group = table.setdefault(label, GroupStats())
+            group.files += first
+            group.add(stats)
+        result.token_counts += token_counts
+        result.words.merge(words)
+        if progress:
+            progress(path, stats.bytes)
+
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(tokenizer,)) as pool:
+        running = {}
+        for task in _plan(find_files(paths), chunk_bytes, language):
+            if len(running) >= 2 * jobs:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge(running.pop(future), future.result())
+            future = pool.submit(_scan_range, task[0], task[1], task[2], vocab_size,
+                                 sketch_args)
+            running[future] = task
+        for future in list(running):
+            merge(running.pop(future), future.result())
+    return result
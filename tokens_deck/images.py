@@ -0,0 +1,203 @@
+"""Image assets: resize to the display box, recompress, dedupe and cache.
+
+Pictures are rarely shown at their native resolution, so embedding a raw
+multi-megabyte screenshot mostly adds bytes.  ``ImagePipeline`` decodes each
+image, scales it down to its box on the slide at ``dpi`` and re-encodes it:
+diagrams and screenshots (at most 256 colors) as palette PNG, photos as
+optimized PNG or JPEG, whichever is smaller (PNG when there is
+transparency).  The original is kept when that is smaller still.
+
+Work runs in a thread pool (Pillow releases the GIL while decoding, scaling
+and encoding), so ``submit`` can queue every image of a deck up front while
+slides are built.  Results are keyed by a hash of the source bytes and the
+processing parameters: the same picture used on several slides, or under
+another file name, is processed once, and python-pptx then stores a single
+part for it.  With ``cache_dir`` the processed files persist on disk and are
+shared by every deck, and every batch worker, that points at the directory.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+DEFAULT_DPI = 150
+DEFAULT_QUALITY = 85
+PIPELINE_VERSION = 1
+MEMORY_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class ProcessedImage:
+    """An embeddable image and its pixel size."""
+
+    data: bytes
+    ext: str
+    width: int
+    height: int
+    digest: str
+
+
+class ImagePipeline:
+    """Thread-pooled image processing with in-memory and on-disk caches."""
+
+    def __init__(self, cache_dir=None, dpi=DEFAULT_DPI, quality=DEFAULT_QUALITY, workers=None):
+        self.cache_dir = cache_dir
+        self.dpi = dpi
+        self.quality = quality
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.processed = 0
+        self.reused = 0
+        self._pool = None
+        self._futures = OrderedDict()  # (path, mtime, size, box) -> future
+        self._by_digest = OrderedDict()  # content + parameters digest -> future
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def submit(self, path, width, height):
+        """Start processing ``path`` for a ``width`` x ``height`` inch box."""
+        box = (round(width * self.dpi), round(height * self.dpi))
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, box)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                self._futures.move_to_end(key)
+                return future
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="images")
+            future = self._pool.submit(self._load, path, box)
+            self._futures[key] = future
+            while len(self._futures) > MEMORY_ENTRIES:
+                self._futures.popitem(last=False)
+            return future
+
+    def get(self, path, width, height):
+        """Return the ``ProcessedImage`` for ``path`` in a box, waiting if needed."""
+        return self.submit(path, width, height).result()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _load(self, path, box):
+        with open(path, "rb") as f:
+            source = f.read()
+        params = f"{PIPELINE_VERSION}:{box[0]}x{box[1]}:q{self.quality}"
+        digest = hashlib.sha256(hashlib.sha256(source).digest() + params.encode()).hexdigest()
+        # The same content under another file name is processed once
+        with self._lock:
+            done = self._by_digest.get(digest)
+            if done is None:
+                pending = self._by_digest[digest] = Future()
+                while len(self._by_digest) > MEMORY_ENTRIES:
+                    self._by_digest.popitem(last=False)
+            else:
+                self._by_digest.move_to_end(digest)
+        if done is not None:
+            image = done.result()
+            with self._lock:
+                self.reused += 1
+            return image
+        try:
+            image = self._read_cache(digest)
+            if image is None:
+                image = _process(source, box, self.quality, digest)
+                self._write_cache(image)
+                counter = "processed"
+            else:
+                counter = "reused"
+        except BaseException as exc:
+            pending.set_exception(exc)
+            with self._lock:
+                self._by_digest.pop(digest, None)
+            raise
+        pending.set_result(image)
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        return image
+
+    def _cache_path(self, digest, ext):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.{ext}")
+
+    def _read_cache(self, digest):
+        if not self.cache_dir:
+            return None
+        for ext in ("png", "jpg"):
+            try:
+                with open(self._cache_path(digest, ext), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            from PIL import Image
+
+            with Image.open(io.BytesIO(data)) as image:
+                return ProcessedImage(data, ext, image.width, image.height, digest)
+        return None
+
+    def _write_cache(self, image):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(image.digest, image.ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(image.data)
+        os.replace(tmp, path)
+
+
+def _process(source, box, quality, digest):
+    """Decode, downscale to fit ``box`` (pixels) and re-encode one image."""
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(source)) as opened:
+        # The source bytes are only reusable when EXIF did not rotate them
+        original_format = opened.format if opened.getexif().get(0x0112, 1) == 1 else None
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+    if image.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+        image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+    # Few colors means a diagram or screenshot: palette PNG, never JPEG
+    graphic = image.getcolors(256) is not None
+    scale = min(1.0, box[0] / image.width, box[1] / image.height)
+    resized = scale < 1.0
+    if resized:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.convert("RGBA" if _has_alpha(image) else "RGB")
+        image = image.resize(size, Image.LANCZOS)
+
+    candidates = [("png", _encode(image, "PNG", optimize=True))]
+    if graphic and image.mode == "RGB":
+        candidates.append(("png", _encode(image.quantize(256), "PNG", optimize=True)))
+    elif not graphic and not _has_alpha(image):
+        candidates.append(("jpg", _encode(image.convert("RGB"), "JPEG", quality=quality,
+                                          optimize=True, progressive=True)))
+    if not resized and original_format in ("PNG", "JPEG"):
+        candidates.append(("png" if original_format == "PNG" else "jpg", source))
+    ext, data = min(candidates, key=lambda item: len(item[1]))
+    return ProcessedImage(data, ext, image.width, image.height, digest)
+
+
+def _has_alpha(image):
+    return image.mode in ("RGBA", "LA", "PA") or (
+        image.mode == "P" and "transparency" in image.info)
+
+
+def _encode(image, fmt, **options):
+    buffer = io.BytesIO()
+    image.save(buffer, fmt, **options)
+    return buffer.getvalue()
+
+
+def fit_box(width_px, height_px, left, top, width, height):
+    """Largest ``(left, top, width, height)`` with the image's aspect ratio
+    that fits the box, centered in it."""
+    scale = min(width / width_px, height / height_px)
+    w, h = width_px * scale, height_px * scale
+    return left + (width - w) / 2, top + (height - h) / 2, w, h
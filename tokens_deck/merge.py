@@ -0,0 +1,172 @@
+"""Mail merge: one template deck rendered once per record of a dataset.
+
+The template is an ordinary deck spec whose strings may contain ``{{field}}``
+placeholders, filled from each record.  Records are streamed from CSV, JSON
+Lines or Parquet (Parquet needs pyarrow, imported only when used), and every
+deck is written out and released before the next record is read, so memory
+does not grow with the dataset.
+
+Slides without placeholders are the same in every deck.  They are built for
+the first record and their XML is kept, so later decks restore them instead
+of drawing them again; per-record work is only the slides that change.
+(Static slides with pictures or charts cannot be restored from XML and are
+drawn every time.)
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+
+from .cache import slide_blob
+from .renderer import DeckRenderer
+from .spec import SpecError, load_spec
+from .writer import write_pptx
+
+PLACEHOLDER = re.compile(r"\{\{\s*([\w.-]+)\s*\}\}")
+DEFAULT_FILENAME = "{{_index}}.pptx"
+
+
+@dataclass
+class MergeResult:
+    decks: int = 0
+    slides: int = 0
+    reused: int = 0
+    seconds: float = 0.0
+
+    def summary(self):
+        elapsed = self.seconds or float("nan")
+        return (f"{self.decks} decks, {self.slides} slides ({self.reused} reused) in "
+                f"{self.seconds:.2f}s ({self.decks / elapsed:.1f} decks/s)")
+
+
+def placeholders(value):
+    """Set of placeholder names used anywhere in a spec value."""
+    if isinstance(value, str):
+        return set(PLACEHOLDER.findall(value))
+    if isinstance(value, dict):
+        return set().union(*map(placeholders, value.values()))
+    if isinstance(value, (list, tuple)):
+        return set().union(*map(placeholders, value))
+    return set()
+
+
+def fill(value, record):
+    """Copy of a spec value with every ``{{field}}`` replaced from ``record``."""
+    if isinstance(value, str):
+        def replace(match):
+            try:
+                field = record[match.group(1)]
+            except KeyError:
+                raise SpecError(f"record has no field {match.group(1)!r}") from None
+            return "" if field is None else str(field)
+        return PLACEHOLDER.sub(replace, value)
+    if isinstance(value, dict):
+        return {k: fill(v, record) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [fill(v, record) for v in value]
+    return value
+
+
+def read_records(path, batch_size=1024):
+    """Stream records (dicts) from a .csv, .jsonl or .parquet file."""
+    if path.endswith(".parquet"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise SpecError("Parquet input requires pyarrow (pip install pyarrow)") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+            yield from batch.to_pylist()
+    elif path.endswith((".jsonl", ".ndjson")):
+        with open(path, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise SpecError(f"{path}:{number}: invalid JSON: {exc}") from None
+                if not isinstance(record, dict):
+                    raise SpecError(f"{path}:{number}: each record must be an object")
+                yield record
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def _safe_filename(name):
+    return re.sub(r"[^\w.-]+", "_", name).strip("._") or "deck"
+
+
+def _unique_filename(name, taken):
+    """``name``, or ``name`` with ``-2``, ``-3``... before the extension when
+    an earlier record already wrote it."""
+    stem, ext = os.path.splitext(name)
+    n = 1
+    while name in taken:
+        n += 1
+        name = f"{stem}-{n}{ext}"
+    taken.add(name)
+    return name
+
+
+def merge_decks(template, records, out_dir, filename=DEFAULT_FILENAME, renderer=None,
+                progress=None):
+    """Render ``template`` once per record into ``out_dir``; returns ``MergeResult``.
+
+    ``filename`` is itself a template (``{{_index}}`` is the 1-based record
+    number), e.g. ``"tokens_{{account_id}}.pptx"``.  Records that give the
+    same name get ``-2``, ``-3``... appended, so no deck overwrites another.
+    ``progress``, if given, is called with each output path.  Decks are
+    reproducible when ``renderer`` is.
+    """
+    template = load_spec(template)
+    renderer = renderer or DeckRenderer()
+    os.makedirs(out_dir, exist_ok=True)
+    static = [not placeholders(slide) for slide in template["slides"]]
+    deck_fields = {k: v for k, v in template.items() if k != "slides"}
+    # (theme name, template slide index) -> restorable page blobs, or None
+    blobs = {}
+    filenames = set()
+    result = MergeResult()
+
+    start = time.perf_counter()
+    for number, record in enumerate(records, 1):
+        record = dict(record, _index=number)
+        spec = dict(fill(deck_fields, record), slides=template["slides"])
+        deck = renderer.start_deck(spec)
+        theme = deck.theme.name
+        index = 0
+        for position, slide_spec in enumerate(template["slides"]):
+            saved = blobs.get((theme, position)) if static[position] else None
+            if saved:
+                for blob in saved:
+                    deck.restore_slide(blob)
+                index += len(saved)
+                result.reused += len(saved)
+                continue
+            if not static[position]:
+                slide_spec = fill(slide_spec, record)
+            keep = static[position] and (theme, position) not in blobs
+            pages = []
+            for page in renderer.iter_slides(deck, {"slides": [slide_spec]}):
+                index += 1
+                slide = renderer.add_slide(deck, page, index)
+                if keep:
+                    pages.append(slide_blob(slide))
+            if keep:
+                blobs[theme, position] = pages if None not in pages else None
+
+        name = _unique_filename(_safe_filename(fill(filename, record)), filenames)
+        path = os.path.join(out_dir, name)
+        with open(path, "wb") as out:
+            write_pptx(deck.prs, out, reproducible=renderer.reproducible)
+        result.decks += 1
+        result.slides += index
+        del deck
+        if progress:
+            progress(path)
+    result.seconds = time.perf_counter() - start
+    return result
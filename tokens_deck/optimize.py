@@ -0,0 +1,121 @@
+"""Make written decks smaller: drop unused parts, compress per part type.
+
+Every deck starts from python-pptx's stock template, which carries eleven
+slide layouts (with their placeholder definitions), printer settings and a
+thumbnail of an empty slide.  Slides here only use the blank layout, so
+``prune`` removes every layout no slide refers to, any master left without
+layouts, and the two leftover parts; parts nothing relates to any more are
+not written.  ``dedupe`` then points every relationship to a binary part
+(an embedded chart workbook, say) at the first part with the same bytes,
+so two identical charts carry one workbook.  XML parts are not merged:
+the ones that repeat are slides and charts, and each slide or chart frame
+needs a part of its own.
+
+``compression_policy`` picks the ZIP method per entry: media and embedded
+workbooks are already compressed and are stored as is, while XML is
+deflated at a chosen level (see ``LEVELS``).
+"""
+
+import hashlib
+import zipfile
+
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import XmlPart, _Relationship
+
+# Deflate level for XML parts, by name
+LEVELS = {"fast": 1, "default": 6, "small": 9}
+
+# Entries that are already compressed; deflating them again only costs time
+STORED_EXTENSIONS = frozenset({
+    "png", "jpg", "jpeg", "gif", "emz", "wmz", "wdp",
+    "mp3", "m4a", "mp4", "m4v", "mov", "wmv", "avi",
+    "xlsx", "xlsm", "docx", "pptx", "zip",
+})
+
+# Package parts python-pptx's template carries that decks do not need
+EXTRA_PARTS = (RT.PRINTER_SETTINGS, RT.THUMBNAIL)
+
+
+def prune(prs, layouts=()):
+    """Remove unused layouts, masters and extra parts from ``prs`` in place.
+
+    Call this only once all slides are added: layouts are looked up by
+    index when slides are created.  ``layouts`` are layout parts to keep
+    besides those of ``prs.slides`` (slides already streamed out).
+    """
+    used = {slide.part.slide_layout.part for slide in prs.slides} | set(layouts)
+    presentation = prs.part
+    for master in list(prs.slide_masters):
+        layouts = master.slide_layouts
+        keep_one = not used and master == prs.slide_masters[0]
+        for index in reversed(range(len(layouts))):
+            layout = layouts[index]
+            if layout.part in used or (keep_one and len(layouts) == 1):
+                continue
+            id_list = layouts._sldLayoutIdLst
+            entry = id_list.sldLayoutId_lst[index]
+            id_list.remove(entry)
+            master.part.rels.pop(entry.rId)
+        if len(layouts) == 0:
+            _drop_master(presentation, master)
+
+    for rel in list(presentation.rels.values()):
+        if rel.reltype in EXTRA_PARTS:
+            presentation.rels.pop(rel.rId)
+    package = presentation.package
+    for rel in list(package._rels.values()):
+        if rel.reltype in EXTRA_PARTS:
+            package._rels.pop(rel.rId)
+    return prs
+
+
+def dedupe(prs, blob=None):
+    """Share one part among relationships to binary parts with equal bytes.
+
+    Only binary parts without relationships of their own are merged; the
+    duplicates are then no longer reachable and are not written.
+    ``blob(part)`` gives the bytes to compare (default: ``part.blob``).
+    Returns the number of parts merged away.
+    """
+    blob = blob or (lambda part: part.blob)
+    digests = {}  # part -> digest
+    first = {}  # (content type, digest) -> part kept
+    merged = set()
+    for part in list(prs.part.package.iter_parts()):
+        rels = part.rels
+        for rId, rel in list(rels.items()):
+            if rel.is_external:
+                continue
+            target = rel.target_part
+            if isinstance(target, XmlPart) or target._rels:
+                continue
+            if target not in digests:
+                digests[target] = hashlib.sha1(blob(target)).digest()
+            kept = first.setdefault((target.content_type, digests[target]), target)
+            if kept is not target:
+                rels._rels[rId] = _Relationship(rels._base_uri, rId, rel.reltype,
+                                                rel._target_mode, kept)
+                merged.add(target)
+    return len(merged)
+
+
+def _drop_master(presentation, master):
+    id_list = presentation._element.get_or_add_sldMasterIdLst()
+    for entry in id_list.sldMasterId_lst:
+        if presentation.related_part(entry.rId) is master.part:
+            id_list.remove(entry)
+            presentation.rels.pop(entry.rId)
+            return
+
+
+def compression_policy(level="default"):
+    """Return ``policy(name) -> (compression, level)`` for ``writer.write_entries``."""
+    level = LEVELS.get(level, level)
+
+    def policy(name):
+        ext = name.rpartition(".")[2].lower()
+        if ext in STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, level
+
+    return policy
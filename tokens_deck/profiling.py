@@ -0,0 +1,155 @@
+"""Per-slide profiling of deck renders.
+
+``DeckProfiler`` is passed to ``DeckRenderer.build``/``render_to``.  For each
+slide it records build time, shapes and XML elements created, serialized
+part size and the tracemalloc allocation delta; ``DeckBuilder`` helpers
+(``stamp``, ``text``, ``shape``, ...) and slide builders (such as
+``add_standard_slide``) get call counters and cumulative times.
+
+Reports are written as JSON, or as folded stacks
+(``deck;slide 3 add_standard_slide;stamp 1234``, weights in microseconds of
+self time) that flamegraph.pl, speedscope and inferno read directly.
+"""
+
+import contextlib
+import functools
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+
+from pptx.opc.oxml import serialize_part_xml
+
+from .slides import SLIDE_KINDS
+
+HELPERS = ("new_slide", "restore_slide", "stamp", "header", "text", "bullets",
+           "style_paragraph", "set_color", "shape")
+
+
+class DeckProfiler:
+    """Collects slide records, helper counters and folded stacks for one deck."""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.slides = []
+        self.phases = {}
+        self.counters = defaultdict(lambda: {"calls": 0, "seconds": 0.0})
+        self.folded = defaultdict(float)
+        self._stack = ["deck"]
+        self._child_time = [0.0]
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a deck-level phase (template, slides, serialize)."""
+        start = time.perf_counter()
+        try:
+            with self.frame(name, count=False):
+                yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def frame(self, name, count=True):
+        """Time a named call, nested under the current frame."""
+        self._stack.append(name)
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._child_time.pop()
+            self.folded[";".join(self._stack)] += elapsed - children
+            self._stack.pop()
+            self._child_time[-1] += elapsed
+            if count:
+                counter = self.counters[name.rsplit(" ", 1)[-1]]
+                counter["calls"] += 1
+                counter["seconds"] += elapsed
+
+    def attach(self, deck):
+        """Wrap the builder's helper methods so their calls are counted."""
+        for name in HELPERS:
+            method = getattr(deck, name)
+            setattr(deck, name, self._wrap(name, method))
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.frame(name):
+                return method(*args, **kwargs)
+        return wrapper
+
+    def profile_build(self, renderer, spec):
+        """Build ``spec`` with ``renderer``, recording every slide."""
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            with self.phase("template"):
+                deck = renderer.start_deck(spec)
+            self.attach(deck)
+            with self.phase("slides"):
+                for index, slide_spec in enumerate(renderer.iter_slides(deck, spec), 1):
+                    self._profile_slide(renderer, deck, slide_spec, index)
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        return deck.prs
+
+    def _profile_slide(self, renderer, deck, slide_spec, index):
+        kind = slide_spec.get("kind")
+        builder = SLIDE_KINDS.get(kind)
+        name = builder.__name__ if builder else str(kind)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        with self.frame(f"slide {index} {name}"):
+            slide = renderer.add_slide(deck, slide_spec, index)
+        elapsed = time.perf_counter() - start
+        record = {
+            "index": index,
+            "kind": kind,
+            "builder": name,
+            "seconds": elapsed,
+            "shapes": len(slide.shapes),
+            "elements": sum(1 for _ in slide._element.iter()),
+            "part_bytes": len(serialize_part_xml(slide._element)),
+        }
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            record["alloc_bytes"] = current - before
+            record["alloc_peak_bytes"] = peak - before
+        self.slides.append(record)
+
+    def report(self):
+        """Return the full report as a JSON-serializable dict."""
+        by_kind = defaultdict(lambda: {"slides": 0, "seconds": 0.0, "part_bytes": 0})
+        for record in self.slides:
+            totals = by_kind[record["kind"]]
+            totals["slides"] += 1
+            totals["seconds"] += record["seconds"]
+            totals["part_bytes"] += record["part_bytes"]
+        return {
+            "phases": self.phases,
+            "slides": self.slides,
+            "kinds": dict(by_kind),
+            "helpers": dict(self.counters),
+        }
+
+    def slowest(self, n=10):
+        return sorted(self.slides, key=lambda r: r["seconds"], reverse=True)[:n]
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
+
+    def write_folded(self, path):
+        """Write folded stacks (microseconds of self time) for flamegraph tools."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, seconds in sorted(self.folded.items()):
+                micros = round(seconds * 1e6)
+                if micros:
+                    f.write(f"{stack} {micros}\n")
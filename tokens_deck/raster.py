@@ -0,0 +1,538 @@
+"""PNG previews of built slides with Pillow, without LibreOffice.
+
+Decks here are drawn from a small vocabulary of shapes: rectangles, rounded
+rectangles, right arrows, ovals and connectors (any of them rotated), with
+solid fills and outlines, plus textboxes, pictures and tables.  ``rasterize``
+draws that subset straight from the slide XML.  Charts and other graphic
+frames become a gray placeholder box.  Text is wrapped greedily on spaces
+with the fonts ``textfit`` finds, so a preview is close to PowerPoint's
+rendering but not identical.  That is enough to spot a missing title, text
+overflowing its box or a color regression.
+
+Slides render in a process pool.  Each task gets the slide's XML, its
+pictures and the deck's colors and text defaults (``RasterContext``), and
+returns PNG bytes.  ``image_diff`` and ``check_previews`` compare previews
+against reference images for visual regression tests.
+"""
+
+import functools
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+from .textfit import LINE_SPACING, find_font
+
+DEFAULT_WIDTH = 1280
+EMU_PER_POINT = 12700
+DEFAULT_LINE_WIDTH = 9525  # 0.75pt, the theme's thinnest line style
+DEFAULT_INSETS = (91440, 45720, 91440, 45720)  # left, top, right, bottom
+ROUND_RECT_RADIUS = 0.16667  # default corner adjustment, of the shorter side
+PLACEHOLDER_FILL = (235, 235, 235)
+PLACEHOLDER_LINE = (160, 160, 160)
+MIN_PARALLEL_SLIDES = 8
+DIFF_THRESHOLD = 48  # channel difference above which a pixel counts as changed
+
+ALIGN = {"ctr": 0.5, "r": 1.0}
+ANCHOR = {"ctr": 0.5, "b": 1.0}
+
+
+@dataclass(frozen=True)
+class RasterContext:
+    """What slides inherit from their deck: size, colors and text defaults."""
+
+    width: int  # slide size in EMU
+    height: int
+    colors: dict  # scheme color name (and clrMap alias) -> (r, g, b)
+    background: tuple
+    font_family: str
+    font_size: float  # points
+    font_color: tuple
+
+
+def raster_context(prs):
+    """Collect the deck-level inputs for rendering the slides of ``prs``."""
+    master = prs.slide_master
+    theme = etree.fromstring(master.part.part_related_by(RT.THEME).blob)
+    colors = {}
+    for slot in theme.find(f"{qn('a:themeElements')}/{qn('a:clrScheme')}"):
+        colors[etree.QName(slot).localname] = _color(slot, {})
+    clr_map = master._element.find(qn("p:clrMap"))
+    if clr_map is not None:
+        for alias, slot in clr_map.attrib.items():
+            if slot in colors:
+                colors[alias] = colors[slot]
+    colors.setdefault("bg1", (255, 255, 255))
+    colors.setdefault("tx1", (0, 0, 0))
+
+    latin = theme.find(f".//{qn('a:minorFont')}/{qn('a:latin')}")
+    defaults = prs.part._element.find(f"{qn('p:defaultTextStyle')}/{qn('a:lvl1pPr')}"
+                                      f"/{qn('a:defRPr')}")
+    size, color = 18.0, colors["tx1"]
+    if defaults is not None:
+        size = int(defaults.get("sz", 1800)) / 100
+        color = _fill_color(defaults, colors) or color
+    background = _background(master._element.find(f"{qn('p:cSld')}/{qn('p:bg')}"), colors)
+    return RasterContext(
+        width=prs.slide_width, height=prs.slide_height, colors=colors,
+        background=background or colors["bg1"],
+        font_family=latin.get("typeface") if latin is not None else "Calibri",
+        font_size=size, font_color=color,
+    )
+
+
+def rasterize(prs, width=DEFAULT_WIDTH, jobs=None):
+    """PNG bytes of every slide of ``prs``, ``width`` pixels wide.
+
+    Slides are rendered in ``jobs`` processes (default: one per CPU) when
+    the deck is large enough to be worth starting them.
+    """
+    context = raster_context(prs)
+    tasks = [_slide_task(slide) for slide in prs.slides]
+    jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+    if jobs <= 1 or len(tasks) < MIN_PARALLEL_SLIDES:
+        return [render_slide(context, xml, media, width) for xml, media in tasks]
+    xmls, medias = zip(*tasks)
+    with ProcessPoolExecutor(jobs) as pool:
+        return list(pool.map(render_slide, repeat(context), xmls, medias, repeat(width),
+                             chunksize=max(1, len(tasks) // (jobs * 4))))
+
+
+def _slide_task(slide):
+    media = {rId: rel.target_part.blob for rId, rel in slide.part.rels.items()
+             if rel.reltype == RT.IMAGE}
+    return etree.tostring(slide._element), media
+
+
+def render_slide(context, xml, media, width=DEFAULT_WIDTH):
+    """Render one slide's ``p:sld`` XML; ``media`` maps rIds to image bytes."""
+    from PIL import Image
+
+    scale = width / context.width
+    root = etree.fromstring(xml)
+    cSld = root.find(qn("p:cSld"))
+    background = _background(cSld.find(qn("p:bg")), context.colors) or context.background
+    image = Image.new("RGB", (width, round(context.height * scale)), background)
+    _Painter(context, image, scale, media).tree(cSld.find(qn("p:spTree")), (0, 0, 1, 1))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", compress_level=1)
+    return buffer.getvalue()
+
+
+def image_diff(expected, actual, threshold=DIFF_THRESHOLD):
+    """Compare two previews; returns ``(fraction of pixels changed, diff image)``.
+
+    The diff image is ``expected`` faded to gray with changed pixels in red.
+    Images of different sizes count as entirely changed.
+    """
+    from PIL import Image, ImageChops
+
+    expected, actual = expected.convert("RGB"), actual.convert("RGB")
+    if expected.size != actual.size:
+        return 1.0, actual
+    delta = ImageChops.difference(expected, actual).convert("L")
+    mask = delta.point(lambda v: 255 if v > threshold else 0)
+    changed = mask.histogram()[255]
+    faded = Image.blend(expected.convert("L").convert("RGB"),
+                        Image.new("RGB", expected.size, (255, 255, 255)), 0.6)
+    faded.paste((220, 0, 0), mask=mask)
+    return changed / (expected.width * expected.height), faded
+
+
+def preview_name(index):
+    return f"slide-{index:03d}.png"
+
+
+def check_previews(previews, reference_dir, out_dir=None, tolerance=0.01):
+    """Compare PNG ``previews`` with ``reference_dir/slide-NNN.png``.
+
+    Returns ``[(name, fraction changed)]`` for every slide over
+    ``tolerance``; a missing reference counts as fully changed.  With
+    ``out_dir``, a ``slide-NNN.diff.png`` is written for each failure.
+    """
+    from PIL import Image
+
+    failures = []
+    for index, data in enumerate(previews, 1):
+        name = preview_name(index)
+        actual = Image.open(io.BytesIO(data))
+        try:
+            expected = Image.open(os.path.join(reference_dir, name))
+        except FileNotFoundError:
+            failures.append((name, 1.0))
+            continue
+        fraction, diff = image_diff(expected, actual)
+        if fraction > tolerance:
+            failures.append((name, fraction))
+            if out_dir:
+                diff.save(os.path.join(out_dir, name.replace(".png", ".diff.png")))
+    return failures
+
+
+@functools.lru_cache(maxsize=256)
+def _font(family, bold, pixels):
+    from PIL import ImageFont
+
+    path = find_font(family, bold)
+    if path:
+        return ImageFont.truetype(path, pixels)
+    return ImageFont.load_default(pixels)
+
+
+def _color(parent, colors):
+    """The color of the first color element under ``parent``, or None."""
+    for el in parent:
+        tag = etree.QName(el).localname
+        if tag == "srgbClr":
+            return _hex(el.get("val"))
+        if tag == "sysClr":
+            return _hex(el.get("lastClr", "000000"))
+        if tag == "schemeClr":
+            return colors.get(el.get("val"), (0, 0, 0))
+        if tag == "prstClr":
+            return (255, 255, 255) if el.get("val") == "white" else (0, 0, 0)
+    return None
+
+
+def _hex(value):
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _fill_color(parent, colors):
+    fill = parent.find(qn("a:solidFill"))
+    return _color(fill, colors) if fill is not None else None
+
+
+def _background(bg, colors):
+    if bg is None:
+        return None
+    props = bg.find(qn("p:bgPr"))
+    if props is not None:
+        return _fill_color(props, colors)
+    ref = bg.find(qn("p:bgRef"))
+    return _color(ref, colors) if ref is not None else None
+
+
+class _Painter:
+    """Draws the shapes of one slide onto a Pillow image."""
+
+    def __init__(self, context, image, scale, media):
+        from PIL import ImageDraw
+
+        self.context = context
+        self.colors = context.colors
+        self.image = image
+        self.draw = ImageDraw.Draw(image)
+        self.scale = scale  # pixels per EMU
+        self.media = media
+
+    def tree(self, parent, transform):
+        for el in parent:
+            tag = etree.QName(el).localname
+            if tag == "sp":
+                self.shape(el, transform)
+            elif tag == "cxnSp":
+                self.connector(el, transform)
+            elif tag == "pic":
+                self.picture(el, transform)
+            elif tag == "graphicFrame":
+                self.frame(el, transform)
+            elif tag == "grpSp":
+                self.group(el, transform)
+
+    def box(self, xfrm, transform):
+        """``(left, top, width, height)`` in pixels, rotation and flips of a shape."""
+        if xfrm is None:
+            return None
+        off, ext = xfrm.find(qn("a:off")), xfrm.find(qn("a:ext"))
+        ox, oy, sx, sy = transform
+        s = self.scale
+        left = (ox + int(off.get("x")) * sx) * s
+        top = (oy + int(off.get("y")) * sy) * s
+        width, height = int(ext.get("cx")) * sx * s, int(ext.get("cy")) * sy * s
+        return ((left, top, width, height), int(xfrm.get("rot", 0)) / 60000,
+                xfrm.get("flipH") == "1", xfrm.get("flipV") == "1")
+
+    def group(self, el, transform):
+        xfrm = el.find(f"{qn('p:grpSpPr')}/{qn('a:xfrm')}")
+        if xfrm is None:
+            return self.tree(el, transform)
+        off, ext = xfrm.find(qn("a:off")), xfrm.find(qn("a:ext"))
+        ch_off, ch_ext = xfrm.find(qn("a:chOff")), xfrm.find(qn("a:chExt"))
+        ox, oy, sx, sy = transform
+        gx = int(ext.get("cx")) / max(1, int(ch_ext.get("cx")))
+        gy = int(ext.get("cy")) / max(1, int(ch_ext.get("cy")))
+        inner = (ox + (int(off.get("x")) - int(ch_off.get("x")) * gx) * sx,
+                 oy + (int(off.get("y")) - int(ch_off.get("y")) * gy) * sy,
+                 sx * gx, sy * gy)
+        self.tree(el, inner)
+
+    def fill_and_line(self, spPr, style):
+        """Resolve a shape's fill color and ``(line color, width px)``."""
+        colors = self.colors
+        fill = None
+        if spPr.find(qn("a:solidFill")) is not None:
+            fill = _fill_color(spPr, colors)
+        elif spPr.find(qn("a:gradFill")) is not None:
+            stop = spPr.find(f"{qn('a:gradFill')}/{qn('a:gsLst')}/{qn('a:gs')}")
+            fill = _color(stop, colors) if stop is not None else None
+        elif spPr.find(qn("a:noFill")) is None and style is not None:
+            ref = style.find(qn("a:fillRef"))
+            if ref is not None and ref.get("idx") != "0":
+                fill = _color(ref, colors)
+
+        line, width = None, DEFAULT_LINE_WIDTH
+        ln = spPr.find(qn("a:ln"))
+        if ln is not None:
+            width = int(ln.get("w", DEFAULT_LINE_WIDTH))
+            if ln.find(qn("a:noFill")) is not None:
+                return fill, None
+            line = _fill_color(ln, colors)
+        if line is None and style is not None:
+            ref = style.find(qn("a:lnRef"))
+            if ref is not None and ref.get("idx") != "0":
+                line = _color(ref, colors)
+        if line is None:
+            return fill, None
+        return fill, (line, max(1, round(width * self.scale)))
+
+    def shape(self, el, transform):
+        spPr = el.find(qn("p:spPr"))
+        placed = self.box(spPr.find(qn("a:xfrm")), transform)
+        if placed is None:
+            return
+        (left, top, width, height), rotation, flip_h, flip_v = placed
+        style = el.find(qn("p:style"))
+        fill, line = self.fill_and_line(spPr, style)
+        geometry = spPr.find(qn("a:prstGeom"))
+        kind = geometry.get("prst") if geometry is not None else "rect"
+        if fill is not None or line is not None:
+            points = _outline(kind, width, height)
+            if flip_h:
+                points = [(width - x, y) for x, y in points]
+            if flip_v:
+                points = [(x, height - y) for x, y in points]
+            points = _place(points, left, top, width, height, rotation)
+            self.draw.polygon(points, fill=fill, outline=line and line[0],
+                              width=line[1] if line else 1)
+        body = el.find(qn("p:txBody"))
+        if body is not None:
+            color = None
+            if style is not None and style.find(qn("a:fontRef")) is not None:
+                color = _color(style.find(qn("a:fontRef")), self.colors)
+            self.text(body, left, top, width, height, color)
+
+    def connector(self, el, transform):
+        spPr = el.find(qn("p:spPr"))
+        placed = self.box(spPr.find(qn("a:xfrm")), transform)
+        if placed is None:
+            return
+        (left, top, width, height), rotation, flip_h, flip_v = placed
+        _, line = self.fill_and_line(spPr, el.find(qn("p:style")))
+        if line is None:
+            return
+        x0, x1 = (width, 0) if flip_h else (0, width)
+        y0, y1 = (height, 0) if flip_v else (0, height)
+        points = _place([(x0, y0), (x1, y1)], left, top, width, height, rotation)
+        self.draw.line(points, fill=line[0], width=line[1])
+
+    def picture(self, el, transform):
+        from PIL import Image
+
+        placed = self.box(el.find(f"{qn('p:spPr')}/{qn('a:xfrm')}"), transform)
+        blip = el.find(f"{qn('p:blipFill')}/{qn('a:blip')}")
+        if placed is None or blip is None:
+            return
+        (left, top, width, height), _, _, _ = placed
+        data = self.media.get(blip.get(qn("r:embed")))
+        size = (max(1, round(width)), max(1, round(height)))
+        if data is None:
+            self.placeholder(left, top, width, height)
+            return
+        with Image.open(io.BytesIO(data)) as source:
+            picture = source.convert("RGBA").resize(size)
+        self.image.paste(picture, (round(left), round(top)), picture)
+
+    def frame(self, el, transform):
+        placed = self.box(el.find(qn("p:xfrm")), transform)
+        if placed is None:
+            return
+        tbl = el.find(f"{qn('a:graphic')}/{qn('a:graphicData')}/{qn('a:tbl')}")
+        if tbl is not None:
+            self.table(tbl, *placed[0])
+        else:
+            self.placeholder(*placed[0])
+
+    def table(self, tbl, left, top, width, height):
+        """Draw cell fills, bottom borders and text of an ``a:tbl``."""
+        columns = [int(col.get("w")) for col in tbl.find(qn("a:tblGrid"))]
+        rows = tbl.findall(qn("a:tr"))
+        sx = width / max(sum(columns), 1)
+        sy = height / max(sum(int(tr.get("h")) for tr in rows), 1)
+        borders = []  # drawn last, so the next row's fill cannot cover them
+        y = top
+        for tr in rows:
+            row_height = int(tr.get("h")) * sy
+            x = left
+            for tc, column in zip(tr.findall(qn("a:tc")), columns):
+                cell_width = column * sx
+                tcPr = tc.find(qn("a:tcPr"))
+                if tcPr is not None:
+                    fill = _fill_color(tcPr, self.colors)
+                    if fill is not None:
+                        self.draw.rectangle((x, y, x + cell_width, y + row_height), fill=fill)
+                    lnB = tcPr.find(qn("a:lnB"))
+                    line = _fill_color(lnB, self.colors) if lnB is not None else None
+                    if line is not None:
+                        line_width = int(lnB.get("w", DEFAULT_LINE_WIDTH)) * self.scale
+                        borders.append(((x, y + row_height, x + cell_width, y + row_height),
+                                        line, max(1, round(line_width))))
+                body = tc.find(qn("a:txBody"))
+                if body is not None:
+                    self.text(body, x, y, cell_width, row_height, None)
+                x += cell_width
+            y += row_height
+        for points, line, line_width in borders:
+            self.draw.line(points, fill=line, width=line_width)
+
+    def placeholder(self, left, top, width, height):
+        self.draw.rectangle((left, top, left + width, top + height),
+                            fill=PLACEHOLDER_FILL, outline=PLACEHOLDER_LINE)
+
+    def text(self, body, left, top, width, height, shape_color):
+        """Lay out and draw a text body inside its shape's box."""
+        bodyPr = body.find(qn("a:bodyPr"))
+        insets = [int(bodyPr.get(name, default)) * self.scale
+                  for name, default in zip(("lIns", "tIns", "rIns", "bIns"), DEFAULT_INSETS)]
+        inner_width = width - insets[0] - insets[2]
+        wrap = bodyPr.get("wrap") != "none"
+        lines = []  # [space before, items, width, height, alignment, space after]
+        pixels_per_point = self.scale * EMU_PER_POINT
+        for p in body.findall(qn("a:p")):
+            pPr = p.find(qn("a:pPr"))
+            defaults = pPr.find(qn("a:defRPr")) if pPr is not None else None
+            align = ALIGN.get(pPr.get("algn"), 0.0) if pPr is not None else 0.0
+            words = []
+            for run in p:
+                tag = etree.QName(run).localname
+                if tag == "br":
+                    words.append(None)
+                elif tag in ("r", "fld"):
+                    font, color, size = self.run_style(run.find(qn("a:rPr")), defaults,
+                                                       shape_color, pixels_per_point)
+                    t = run.find(qn("a:t"))
+                    for word in (t.text or "").split(" ") if t is not None else ():
+                        words.append((word, font, color, size))
+            if not words:
+                end = p.find(qn("a:endParaRPr"))
+                _, _, size = self.run_style(end, defaults, shape_color, pixels_per_point)
+                words = [("", None, None, size)]
+            first = len(lines)
+            for items, line_width, size in _wrap(words, inner_width if wrap else math.inf):
+                lines.append([0, items, line_width, size * LINE_SPACING, align, 0])
+            lines[first][0] = _spacing(pPr, "a:spcBef") * pixels_per_point
+            lines[-1][5] = _spacing(pPr, "a:spcAft") * pixels_per_point
+
+        total = sum(before + h + after for before, _, _, h, _, after in lines)
+        anchor = ANCHOR.get(bodyPr.get("anchor"), 0.0)
+        y = top + insets[1] + anchor * (height - insets[1] - insets[3] - total)
+        for before, items, line_width, line_height, align, after in lines:
+            y += before
+            x = left + insets[0] + align * (inner_width - line_width)
+            baseline = y + line_height * 0.8
+            for dx, word, font, color in items:
+                if word:
+                    self.draw.text((x + dx, baseline), word, font=font, fill=color,
+                                   anchor="ls")
+            y += line_height + after
+
+    def run_style(self, rPr, defaults, shape_color, pixels_per_point):
+        """``(font, color, size px)`` of a run from its properties and defaults."""
+        context = self.context
+        size, bold, color, family = context.font_size, False, None, context.font_family
+        for props in (defaults, rPr):
+            if props is None:
+                continue
+            if props.get("sz"):
+                size = int(props.get("sz")) / 100
+            if props.get("b") is not None:
+                bold = props.get("b") in ("1", "true")
+            color = _fill_color(props, self.colors) or color
+            latin = props.find(qn("a:latin"))
+            if latin is not None and not latin.get("typeface", "+").startswith("+"):
+                family = latin.get("typeface")
+        pixels = max(1, round(size * pixels_per_point))
+        color = color or shape_color or context.font_color
+        return _font(family, bold, pixels), color, pixels
+
+
+def _spacing(pPr, tag):
+    """Paragraph spacing in points (``a:spcPts``; percentages are ignored)."""
+    if pPr is None:
+        return 0
+    points = pPr.find(f"{qn(tag)}/{qn('a:spcPts')}")
+    return int(points.get("val")) / 100 if points is not None else 0
+
+
+def _wrap(words, width):
+    """Greedy line breaking; yields ``(items, line width, tallest size)``."""
+    items, x, tallest = [], 0.0, 0
+    for entry in words:
+        if entry is None:  # a:br
+            yield items, x, tallest
+            items, x = [], 0.0
+            continue
+        word, font, color, size = entry
+        word_width = font.getlength(word) if font and word else 0.0
+        space = font.getlength(" ") if font and items else 0.0
+        if items and x + space + word_width > width:
+            yield items, x, tallest
+            items, x, tallest, space = [], 0.0, 0, 0.0
+        if items and items[-1][2] is font and items[-1][3] == color:
+            # Draw runs of same-styled words in one call
+            dx, text = items[-1][:2]
+            items[-1] = (dx, f"{text} {word}", font, color)
+        else:
+            items.append((x + space, word, font, color))
+        x += space + word_width
+        tallest = max(tallest, size)
+    yield items, x, tallest
+
+
+def _outline(kind, width, height):
+    """Polygon of a preset shape in a ``width`` x ``height`` box."""
+    if kind == "ellipse":
+        return [(width / 2 * (1 + math.cos(a)), height / 2 * (1 + math.sin(a)))
+                for a in (i * math.pi / 32 for i in range(64))]
+    if kind == "roundRect":
+        r = min(width, height) * ROUND_RECT_RADIUS
+        points = []
+        for cx, cy, start in ((width - r, r, -90), (width - r, height - r, 0),
+                              (r, height - r, 90), (r, r, 180)):
+            for step in range(9):
+                a = math.radians(start + step * 90 / 8)
+                points.append((cx + r * math.cos(a), cy + r * math.sin(a)))
+        return points
+    if kind == "rightArrow":
+        head = width - min(width, height) * 0.5
+        shaft_top, shaft_bottom = height * 0.25, height * 0.75
+        return [(0, shaft_top), (head, shaft_top), (head, 0), (width, height / 2),
+                (head, height), (head, shaft_bottom), (0, shaft_bottom)]
+    return [(0, 0), (width, 0), (width, height), (0, height)]
+
+
+def _place(points, left, top, width, height, rotation):
+    """Move box-relative points onto the slide, rotated about the box center."""
+    if not rotation:
+        return [(left + x, top + y) for x, y in points]
+    a = math.radians(rotation)
+    cos, sin = math.cos(a), math.sin(a)
+    cx, cy = width / 2, height / 2
+    return [(left + cx + (x - cx) * cos - (y - cy) * sin,
+             top + cy + (x - cx) * sin + (y - cy) * cos) for x, y in points]
@@ -0,0 +1,576 @@
+"""Render declarative deck specs with python-pptx.
+
+``DeckRenderer`` holds no per-deck state, so a single instance can be kept
+warm in a long-lived process and asked to render any number of decks.  Each
+render gets its own ``Presentation`` and ``DeckBuilder``; nothing is shared
+through module globals.
+"""
+
+import copy
+import io
+import os
+
+import numpy as np
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData, XyChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.opc.package import XmlPart, _Relationship
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.package import Package
+from pptx.util import Inches, Pt
+
+from .compiler import compile_theme
+from .diagrams import connector_ends as diagram_connectors
+from .images import ImagePipeline, fit_box
+from .skeletons import BULLETS_HEIGHT, SkeletonCache
+from .slides import build_slide, prefetch_assets
+from .spec import SpecError, load_spec
+from .tables import TableStyle, paginate_table, table_size, table_xml
+from .textfit import TextMeasurer, paginate_bullets, warn_overflow
+from .themes import THEMES, Theme
+from .tokenizer import expand_examples, load_tokenizer
+from .writer import SlideStream, write_pptx
+
+BLANK_LAYOUT = 6
+EMU_PER_INCH = 914400
+MIN_FONT_SIZE = 12  # auto-fit never shrinks text below this
+
+ALIGNMENTS = {"left": PP_ALIGN.LEFT, "center": PP_ALIGN.CENTER, "right": PP_ALIGN.RIGHT}
+ANCHORS = {"top": MSO_ANCHOR.TOP, "middle": MSO_ANCHOR.MIDDLE, "bottom": MSO_ANCHOR.BOTTOM}
+
+
+def clone_presentation(prs):
+    """Return an independent copy of ``prs``, made part by part.
+
+    XML parts get a copy of their element tree and binary parts share their
+    (immutable) bytes; relationships are re-pointed at the new parts.  A
+    ``copy.deepcopy`` of the ``Presentation`` is not safe: python-pptx
+    caches proxies holding sub-elements, which would be copied as trees of
+    their own, detached from the copied parts.
+    """
+    # Written against python-pptx 1.0.2, using its private package API
+    # (Package._pkg_file, _Relationship, _Relationships._rels and
+    # _base_uri); tests/test_clone.py checks it still holds after an upgrade
+    source = prs.part.package
+    package = Package(source._pkg_file)
+    parts = {}
+    for part in source.iter_parts():
+        content = copy.deepcopy(part._element) if isinstance(part, XmlPart) else part.blob
+        parts[part] = type(part)(part.partname, part.content_type, package, content)
+    for part, clone in parts.items():
+        _copy_rels(part.rels, clone.rels, parts)
+    _copy_rels(source._rels, package._rels, parts)
+    return package.presentation_part.presentation
+
+
+def _copy_rels(rels, into, parts):
+    for rId, rel in rels.items():
+        target = rel.target_ref if rel.is_external else parts[rel.target_part]
+        into._rels[rId] = _Relationship(into._base_uri, rId, rel.reltype, rel._target_mode,
+                                        target)
+
+
+class DeckBuilder:
+    """Drawing helpers for one presentation, handed to every slide builder.
+
+    Positions and sizes are in inches, font sizes in points and colors are
+    palette/role names resolved through the deck's theme.
+    """
+
+    def __init__(self, prs, theme, skeletons=None, tokenizer=None, images=None, base_dir=None,
+                 measurer=None):
+        self.prs = prs
+        self.theme = theme
+        self.skeletons = skeletons if skeletons is not None else SkeletonCache()
+        self.tokenizer = tokenizer
+        self.images = images if images is not None else ImagePipeline()
+        self.base_dir = base_dir
+        self.measurer = measurer if measurer is not None else TextMeasurer()
+
+    def asset_path(self, path):
+        """Resolve a spec path relative to the spec file's directory."""
+        return os.path.join(self.base_dir, path) if self.base_dir else path
+
+    def new_slide(self):
+        """Add a blank slide; the background comes from the compiled master."""
+        return self.prs.slides.add_slide(self.prs.slide_layouts[BLANK_LAYOUT])
+
+    def restore_slide(self, blob):
+        """Add a slide whose content is a previously rendered ``p:sld`` blob."""
+        slide = self.new_slide()
+        element = slide._element
+        for child in list(element):
+            element.remove(child)
+        for child in parse_xml(blob):
+            element.append(child)
+        return slide
+
+    def stamp(self, slide, archetype, **text):
+        """Clone a cached skeleton (see ``skeletons.ARCHETYPES``) into a slide."""
+        return self.skeletons.get(self.theme, archetype).stamp(slide, **text)
+
+    def header(self, slide, title):
+        """Add the theme's title and accent for a content slide."""
+        self.stamp(slide, "header", title=title)
+
+    def draw_header(self, slide, title):
+        """Draw the title and accent through python-pptx (used for skeletons)."""
+        theme = self.theme
+        if theme.header == "rule":
+            line = slide.shapes.add_connector(
+                MSO_CONNECTOR.STRAIGHT, Inches(0), Inches(0.5), Inches(16), Inches(0.5)
+            )
+            line.line.width = Pt(3)
+            self.set_color(line.line.color, "accent")
+        self.text(
+            slide, theme.margin, 0.8, 16 - 2 * theme.margin, 1, title,
+            size=theme.title_size, color="title", bold=True,
+        )
+        if theme.header == "underline":
+            self.shape(slide, "rectangle", theme.margin, 1.9, 2, 0.05, fill="accent", line="accent")
+
+    def text(self, slide, left, top, width, height, text, size=None, color="text",
+             bold=False, align=None, font=None, wrap=None, anchor=None):
+        """Add a single-paragraph textbox and return it."""
+        box = slide.shapes.add_textbox(Inches(left), Inches(top), Inches(width), Inches(height))
+        frame = box.text_frame
+        if wrap is not None:
+            frame.word_wrap = wrap
+        if anchor:
+            frame.vertical_anchor = ANCHORS[anchor]
+        self.style_paragraph(frame.paragraphs[0], text, size, color, bold, align, font)
+        return box
+
+    def bullets(self, frame, items, size=None, color="text"):
+        """Append one paragraph per item to a text frame."""
+        theme = self.theme
+        for item in items:
+            p = frame.add_paragraph()
+            self.style_paragraph(p, item, size, color)
+            if theme.space_before:
+                p.space_before = Pt(theme.space_before)
+            if theme.space_after:
+                p.space_after = Pt(theme.space_after)
+
+    def fit_bullets(self, title, items, width, height, shrink=True):
+        """Font size at which bullet ``items`` fit a ``width`` x ``height`` box.
+
+        Shrinks from the body size down to ``MIN_FONT_SIZE`` when ``shrink``
+        is set, and warns with ``textfit.TextOverflowWarning`` when the
+        items still overflow.
+        """
+        theme = self.theme
+        # The bullets box starts with an empty paragraph, then one per item
+        paragraphs = [""] + list(items)
+        spacing = theme.space_before + theme.space_after
+        min_size = MIN_FONT_SIZE if shrink else theme.body_size
+        size, fits = self.measurer.fit(paragraphs, width, height, theme.body_size, min_size,
+                                       spacing)
+        if not fits:
+            needed = self.measurer.text_height(paragraphs, width, size, spacing)
+            warn_overflow(title, needed, height)
+        return size
+
+    def style_paragraph(self, p, text, size=None, color="text", bold=False, align=None,
+                        font=None, inherited="text"):
+        """Set a paragraph's text and whatever formatting differs from the theme.
+
+        Size and color are only written when they differ from the defaults
+        compiled into the presentation (see ``compiler``); ``inherited`` is
+        the color the paragraph gets without an override.
+        """
+        theme = self.theme
+        p.text = text
+        if size and size != theme.body_size:
+            p.font.size = Pt(size)
+        if bold:
+            p.font.bold = True
+        if theme.color(color) != theme.color(inherited):
+            self.set_color(p.font.color, color)
+        if font:
+            p.font.name = font
+        if align:
+            p.alignment = ALIGNMENTS[align]
+
+    def set_color(self, color_format, name):
+        """Point a color at the theme's color scheme, or fall back to RGB."""
+        ref = self.theme.theme_color(name)
+        if ref is not None:
+            color_format.theme_color = ref
+        else:
+            color_format.rgb = self.theme.color(name)
+
+    def shape(self, slide, kind, left, top, width, height, fill=None, line=None,
+              line_width=None, rotation=0, text=None, size=None, color="strong",
+              bold=False):
+        """Add an autoshape, optionally with centered text, and return it."""
+        shape = slide.shapes.add_shape(
+            SHAPES[kind], Inches(left), Inches(top), Inches(width), Inches(height)
+        )
+        if fill:
+            shape.fill.solid()
+            self.set_color(shape.fill.fore_color, fill)
+        if line:
+            self.set_color(shape.line.color, line)
+            if line_width:
+                shape.line.width = Pt(line_width)
+        else:
+            shape.line.fill.background()
+        if rotation:
+            shape.rotation = rotation
+        if text is not None:
+            frame = shape.text_frame
+            frame.word_wrap = True
+            frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+            # Autoshape text defaults to lt1 through the shape's p:style fontRef
+            self.style_paragraph(frame.paragraphs[0], text, size, color, bold, "center",
+                                 inherited="background")
+        return shape
+
+    def chart(self, slide, kind, left, top, width, height, categories, series,
+              number_format=None, labels=False, colors=("accent", "strong", "muted", "outline")):
+        """Add a native chart and return its graphic frame.
+
+        ``series`` is a list of ``(name, values)`` pairs over ``categories``.
+        With ``categories=None`` it is a list of ``(name, x, y)`` and an XY
+        line chart is drawn (see ``charts.chart_data``).
+        """
+        if categories is None:
+            data = XyChartData(number_format=number_format or "General")
+            for name, xs, ys in series:
+                points = data.add_series(name)
+                for x, y in zip(xs, ys):
+                    points.add_data_point(x, y)
+            chart_type = XL_CHART_TYPE.XY_SCATTER_LINES_NO_MARKERS
+        else:
+            data = CategoryChartData(number_format=number_format or "General")
+            data.categories = categories
+            for name, values in series:
+                data.add_series(name, values)
+            chart_type = CHARTS[kind]
+        frame = slide.shapes.add_chart(
+            chart_type, Inches(left), Inches(top), Inches(width), Inches(height), data
+        )
+        chart = frame.chart
+        chart.font.size = Pt(self.theme.small_size)
+        self.set_color(chart.font.color, "text")
+        chart.has_legend = len(series) > 1
+        if chart.has_legend:
+            chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+            chart.legend.include_in_layout = False
+        if kind == "bar":
+            # Horizontal bars list categories bottom-up; keep spec order top-down
+            chart.category_axis.reverse_order = True
+        plot = chart.plots[0]
+        if labels:
+            plot.has_data_labels = True
+            if number_format:
+                plot.data_labels.number_format = number_format
+                plot.data_labels.number_format_is_linked = False
+        for i, plotted in enumerate(plot.series):
+            color = colors[i % len(colors)]
+            if kind == "line":
+                self.set_color(plotted.format.line.color, color)
+                plotted.smooth = False
+            else:
+                plotted.format.fill.solid()
+                self.set_color(plotted.format.fill.fore_color, color)
+        return frame
+
+    def picture(self, slide, path, left, top, width, height):
+        """Add an image scaled to fit (and centered in) a box; see ``images``."""
+        try:
+            image = self.images.get(self.asset_path(path), width, height)
+        except OSError as exc:
+            raise SpecError(f"cannot load image {path!r}: {exc}") from None
+        left, top, width, height = fit_box(image.width, image.height, left, top, width, height)
+        return slide.shapes.add_picture(io.BytesIO(image.data), Inches(left), Inches(top),
+                                        Inches(width), Inches(height))
+
+    def diagram(self, slide, layout, kind="rounded_rectangle", labels=None, fills=None,
+                line="outline", edge_color="muted", edge_width=1.5, arrows=True, size=None):
+        """Draw a ``diagrams.Layout``: one shape per node, one connector per edge.
+
+        One node shape (per fill) and one connector are drawn through
+        python-pptx, then cloned at the XML level for every node and edge,
+        with positions converted to EMU for all of them at once.  Connectors
+        are glued to connection sites of their nodes (see
+        ``diagrams.connector_ends``) and sit below the nodes.
+        """
+        n = len(layout.x)
+        fills = fills if fills is not None else ["surface"] * n
+        width, height = Inches(layout.width), Inches(layout.height)
+        left = _emu(layout.x - layout.width / 2).tolist()
+        top = _emu(layout.y - layout.height / 2).tolist()
+
+        prototypes = {}
+        for fill in dict.fromkeys(fills):
+            shape = self.shape(slide, kind, 0, 0, layout.width, layout.height, fill=fill,
+                               line=line, text=" " if labels is not None else None, size=size)
+            prototypes[fill] = shape._element
+        connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, 0, 0, 1, 1)
+        connector.line.width = Pt(edge_width)
+        self.set_color(connector.line.color, edge_color)
+        if arrows:
+            ln = connector.line._get_or_add_ln()
+            ln.append(ln.makeelement(qn("a:tailEnd"), type="triangle"))
+        edge_prototype = connector._element
+        spTree = slide.shapes._spTree
+        for el in [*prototypes.values(), edge_prototype]:
+            spTree.remove(el)
+        next_id = max((int(i) for i in spTree.xpath("//@id")), default=0) + 1
+        node_ids = list(range(next_id, next_id + n))
+
+        begin, end, *points = diagram_connectors(layout, kind)
+        x0, y0, x1, y1 = (_emu(values) for values in points)
+        edge_rows = zip(layout.edges.tolist(), begin.tolist(), end.tolist(),
+                        np.minimum(x0, x1).tolist(), np.minimum(y0, y1).tolist(),
+                        np.abs(x1 - x0).tolist(), np.abs(y1 - y0).tolist(),
+                        (x1 < x0).tolist(), (y1 < y0).tolist())
+        # Raw lxml below: python-pptx's attribute proxies would cost more
+        # than everything else here
+        edge_id = next_id + n
+        stCxn, endCxn = qn("a:stCxn"), qn("a:endCxn")
+        for (src, dst), first, last, x, y, cx, cy, flip_h, flip_v in edge_rows:
+            el = copy.deepcopy(edge_prototype)
+            name = el.find(_EDGE_NAME)
+            name.set("id", str(edge_id))
+            name.set("name", f"Connector {edge_id}")
+            ends = el.find(_EDGE_ENDS)
+            ends.append(ends.makeelement(stCxn, id=str(node_ids[src]), idx=str(first)))
+            ends.append(ends.makeelement(endCxn, id=str(node_ids[dst]), idx=str(last)))
+            xfrm = el.find(_XFRM)
+            _set_xfrm(xfrm, x, y, cx, cy)
+            if flip_h:
+                xfrm.set("flipH", "1")
+            if flip_v:
+                xfrm.set("flipV", "1")
+            spTree.append(el)
+            edge_id += 1
+
+        for i, node_id in enumerate(node_ids):
+            el = copy.deepcopy(prototypes[fills[i]])
+            name = el.find(_NODE_NAME)
+            name.set("id", str(node_id))
+            name.set("name", f"Node {node_id}")
+            _set_xfrm(el.find(_XFRM), left[i], top[i], width, height)
+            if labels is not None:
+                el.find(_LABEL).text = labels[i]
+            spTree.append(el)
+        return node_ids
+
+    def table(self, slide, columns, rows, box, widths=None, align=None, size=None):
+        """Add a table with a header row, written as XML in one piece.
+
+        Cell styles come from the theme (see ``tables.TableStyle``); rows
+        are lists of strings.
+        """
+        spTree = slide.shapes._spTree
+        next_id = max((int(i) for i in spTree.xpath("//@id")), default=0) + 1
+        style = TableStyle(self.theme, table_size(self.theme, size))
+        frame = parse_xml(table_xml(next_id, columns, rows, style, box, widths, align))
+        spTree.append(frame)
+        return frame
+
+
+def _emu(inches):
+    return np.rint(np.asarray(inches) * EMU_PER_INCH).astype(np.int64)
+
+
+_XFRM = f"{qn('p:spPr')}/{qn('a:xfrm')}"
+_NODE_NAME = f"{qn('p:nvSpPr')}/{qn('p:cNvPr')}"
+_EDGE_NAME = f"{qn('p:nvCxnSpPr')}/{qn('p:cNvPr')}"
+_EDGE_ENDS = f"{qn('p:nvCxnSpPr')}/{qn('p:cNvCxnSpPr')}"
+_LABEL = f".//{qn('a:t')}"
+
+
+def _set_xfrm(xfrm, x, y, cx, cy):
+    off, ext = xfrm[0], xfrm[1]
+    off.set("x", str(x))
+    off.set("y", str(y))
+    ext.set("cx", str(cx))
+    ext.set("cy", str(cy))
+
+
+SHAPES = {
+    "rectangle": MSO_SHAPE.RECTANGLE,
+    "rounded_rectangle": MSO_SHAPE.ROUNDED_RECTANGLE,
+    "right_arrow": MSO_SHAPE.RIGHT_ARROW,
+    "oval": MSO_SHAPE.OVAL,
+}
+
+CHARTS = {
+    "column": XL_CHART_TYPE.COLUMN_CLUSTERED,
+    "bar": XL_CHART_TYPE.BAR_CLUSTERED,
+    "line": XL_CHART_TYPE.LINE,
+}
+
+
+class DeckRenderer:
+    """Turn deck specs into presentations.
+
+    ``themes`` adds to (or overrides) the built-in themes by name.  With a
+    ``slide_cache`` (see ``cache.SlideCache``), slides whose spec is unchanged
+    since an earlier render are restored from the cache instead of redrawn.
+    ``tokenizer`` (a ``tokenizer.BPETokenizer`` or a path for
+    ``tokenizer.load_tokenizer``) computes token examples for specs that do
+    not name their own ``"tokenizer"``.  ``images`` is the
+    ``images.ImagePipeline`` that prepares pictures (default: in-memory only).
+    With ``reproducible``, the same spec always renders to the same bytes
+    (see ``writer.write_pptx``).
+    """
+
+    def __init__(self, themes=None, slide_cache=None, tokenizer=None, images=None,
+                 reproducible=False):
+        self.themes = dict(THEMES)
+        if themes:
+            self.themes.update(themes)
+        self.skeletons = SkeletonCache()
+        self.prototypes = {}
+        self.slide_cache = slide_cache
+        self.tokenizer = tokenizer
+        self.images = images if images is not None else ImagePipeline()
+        self.reproducible = reproducible
+        self.measurer = TextMeasurer()
+
+    def theme_for(self, spec):
+        theme = spec.get("theme", "minimal")
+        if isinstance(theme, Theme):
+            return theme
+        try:
+            return self.themes[theme]
+        except KeyError:
+            raise SpecError(f"unknown theme {theme!r}") from None
+
+    def tokenizer_for(self, spec):
+        tokenizer = spec.get("tokenizer", self.tokenizer)
+        if not isinstance(tokenizer, (str, os.PathLike)):
+            return tokenizer
+        if "tokenizer" in spec and spec.get("base_dir"):
+            tokenizer = os.path.join(spec["base_dir"], tokenizer)
+        try:
+            return load_tokenizer(tokenizer)
+        except (OSError, ValueError, KeyError) as exc:
+            raise SpecError(f"cannot load tokenizer {tokenizer!r}: {exc}") from None
+
+    def new_presentation(self, theme):
+        """Return an empty 16:9 presentation with ``theme`` compiled in.
+
+        The first presentation per theme is kept as a prototype and later
+        ones are cloned from it (see ``clone_presentation``), which skips
+        unzipping and parsing python-pptx's default template and compiling
+        the theme again.
+        """
+        key = (theme.name, id(theme))
+        entry = self.prototypes.get(key)
+        if entry is None:
+            # The theme is kept so its id() cannot be reused by another one
+            entry = self.prototypes[key] = (theme, self._compile_presentation(theme))
+        return clone_presentation(entry[1])
+
+    def _compile_presentation(self, theme):
+        prs = Presentation()
+        prs.slide_width = Inches(16)
+        prs.slide_height = Inches(9)
+        compile_theme(prs, theme)
+        return prs
+
+    def start_deck(self, spec):
+        """Return a ``DeckBuilder`` on a fresh presentation for a loaded spec."""
+        theme = self.theme_for(spec)
+        deck = DeckBuilder(self.new_presentation(theme), theme, self.skeletons,
+                           self.tokenizer_for(spec), self.images, spec.get("base_dir"),
+                           self.measurer)
+        # Images are processed in the background while earlier slides build
+        prefetch_assets(deck, spec)
+        return deck
+
+    def iter_slides(self, deck, spec):
+        """Yield a deck's slide specs, splitting paginated bullets and
+        tables lazily."""
+        for index, slide_spec in enumerate(spec["slides"], 1):
+            kind = slide_spec.get("kind")
+            if slide_spec.get("paginate") and kind == "bullets":
+                pages = paginate_bullets(slide_spec, deck.theme, deck.measurer, BULLETS_HEIGHT)
+            elif kind == "table":
+                pages = paginate_table(slide_spec, deck.theme, deck.base_dir)
+            else:
+                yield slide_spec
+                continue
+            try:
+                yield from pages
+            except KeyError as exc:
+                raise SpecError(f"slide {index} ({kind}): missing field {exc}") from None
+            except (TypeError, ValueError) as exc:
+                raise SpecError(f"slide {index} ({kind}): {exc}") from None
+
+    def add_slide(self, deck, slide_spec, index):
+        """Add one slide, reusing it from the slide cache when possible."""
+        if deck.tokenizer is not None:
+            # Before the cache lookup, so cached slides follow the tokenizer
+            slide_spec = expand_examples(slide_spec, deck.tokenizer)
+        cache = self.slide_cache
+        if cache is None:
+            return build_slide(deck, slide_spec, index)
+        key = cache.key(deck.theme, slide_spec)
+        blob = cache.get(key)
+        if blob is not None:
+            return deck.restore_slide(blob)
+        slide = build_slide(deck, slide_spec, index)
+        cache.put(key, slide)
+        return slide
+
+    def build(self, spec, profiler=None):
+        """Build and return the ``Presentation`` for a spec.
+
+        With a ``profiling.DeckProfiler``, every slide is measured as it is
+        built.
+        """
+        spec = load_spec(spec)
+        if profiler is not None:
+            return profiler.profile_build(self, spec)
+        deck = self.start_deck(spec)
+        for index, slide_spec in enumerate(self.iter_slides(deck, spec), 1):
+            self.add_slide(deck, slide_spec, index)
+        return deck.prs
+
+    def render(self, spec, profiler=None):
+        """Render a spec and return the .pptx file contents as bytes."""
+        buffer = io.BytesIO()
+        self.render_to(spec, buffer, profiler)
+        return buffer.getvalue()
+
+    def render_to(self, spec, stream, profiler=None):
+        """Render a spec straight into a writable binary stream.
+
+        The stream need not be seekable, so sockets, pipes and
+        ``sys.stdout.buffer`` work; see ``writer.write_pptx``.
+        """
+        prs = self.build(spec, profiler)
+        if profiler is None:
+            write_pptx(prs, stream, reproducible=self.reproducible)
+        else:
+            with profiler.phase("serialize"):
+                write_pptx(prs, stream, reproducible=self.reproducible)
+        return prs
+
+    def stream_to(self, spec, stream):
+        """Render a spec into ``stream``, writing each slide as it is built.
+
+        Memory does not grow with the number of slides (see
+        ``writer.SlideStream``).  Returns the number of slides written.
+        """
+        spec = load_spec(spec)
+        deck = self.start_deck(spec)
+        with SlideStream(deck.prs, stream, reproducible=self.reproducible) as out:
+            for index, slide_spec in enumerate(self.iter_slides(deck, spec), 1):
+                out.add(self.add_slide(deck, slide_spec, index))
+        return out.slides
+
+
+def render_deck(spec):
+    """Render a spec with a default ``DeckRenderer``; returns .pptx bytes."""
+    return DeckRenderer().render(spec)
@@ -0,0 +1,264 @@
+"""Long-running render server that keeps python-pptx and the renderer warm.
+
+The server imports python-pptx, builds the skeleton cache and renders a
+warm-up deck once at start-up; after that a render request costs only the
+slide building and serialization.  It listens on a Unix socket (default) or
+a localhost TCP port and speaks plain HTTP/1.1:
+
+``POST /render``
+    Body is a deck spec (JSON, or YAML with ``Content-Type: application/yaml``).
+    Responds with the .pptx.  The deck is written out in full (in memory, or
+    in a temporary file past ``SPOOL_BYTES``) before the status line, so a
+    failure is reported as an error response rather than a truncated one.
+    With a deck store (``serve --store``), decks are rendered reproducibly
+    and kept in a ``store.DeckStore``; the response carries an ``ETag``, a
+    repeat request is answered from the store without rendering, and one
+    sending the ETag back in ``If-None-Match`` gets ``304 Not Modified``.
+``GET /health``
+    JSON with uptime and request counters.
+"""
+
+import contextlib
+import json
+import os
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .client import PPTX_TYPE, default_socket_path
+from .renderer import DeckRenderer
+from .spec import SpecError, load_spec, parse_spec
+from .writer import write_pptx
+
+SPOOL_BYTES = 32 * 1024 * 1024  # decks up to this size are buffered in memory
+WARMUP_SPEC = {"slides": [{"kind": "title", "title": "warm-up"},
+                          {"kind": "bullets", "title": "warm-up", "items": ["warm-up"]}]}
+
+
+def _open(path):
+    """Open a stored deck, or return None if there is none (or it was just
+    evicted)."""
+    if path is None:
+        return None
+    try:
+        return open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "tokens-deck"
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send_error(404, "not found")
+        stats = dict(self.server.stats, uptime_s=round(time.time() - self.server.started, 1))
+        self._send_json(200, stats)
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != "/render":
+            return self._send_error(404, "not found")
+        body = self._read_body()
+        if body is None:
+            return
+        fmt = "yaml" if "yaml" in self.headers.get("Content-Type", "") else "json"
+        start = time.perf_counter()
+        if self.server.store is not None:
+            return self._send_stored(body, fmt, start)
+        deck = tempfile.SpooledTemporaryFile(SPOOL_BYTES)
+        try:
+            prs = self.server.renderer.build(load_spec(parse_spec(body, fmt)))
+            write_pptx(prs, deck)
+        except SpecError as exc:
+            deck.close()
+            self.server.count("errors")
+            return self._send_error(400, str(exc))
+        except Exception as exc:
+            deck.close()
+            self.server.count("errors")
+            return self._send_error(500, f"{type(exc).__name__}: {exc}")
+
+        with deck:
+            self.send_response(200)
+            self.send_header("Content-Type", PPTX_TYPE)
+            self.send_header("Content-Length", str(deck.tell()))
+            self.send_header("X-Slide-Count", str(len(prs.slides)))
+            self.end_headers()
+            deck.seek(0)
+            shutil.copyfileobj(deck, self.wfile)
+        self.server.count("renders")
+        self.server.count("slides", len(prs.slides))
+        self.log_message("rendered %d slides in %.1f ms", len(prs.slides),
+                         (time.perf_counter() - start) * 1000)
+
+    def _read_body(self):
+        """Return the request body as text, or None after replying 400."""
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0:
+                raise ValueError
+        except ValueError:
+            # The body cannot be skipped, so the connection cannot be reused
+            self.close_connection = True
+            self.server.count("errors")
+            self._send_error(400, "invalid Content-Length")
+            return None
+        try:
+            return self.rfile.read(length).decode("utf-8")
+        except UnicodeDecodeError as exc:
+            self.server.count("errors")
+            self._send_error(400, f"request body is not UTF-8: {exc}")
+            return None
+
+    def _send_stored(self, body, fmt, start):
+        store = self.server.store
+        try:
+            spec = load_spec(parse_spec(body, fmt))
+            key = store.key(self.server.renderer, spec)
+            etag = f'"{key}"'
+            if etag in self.headers.get("If-None-Match", ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.server.count("not_modified")
+                return
+            deck = _open(store.get(key))
+            hit = deck is not None
+            if not hit:
+                # Concurrent requests for one new deck render it once; hits
+                # and other decks do not wait for it
+                with self.server.render_lock(key):
+                    deck = _open(store.lookup(key))
+                    hit = deck is not None
+                    if not hit:
+                        path, slides = store.put(self.server.renderer, spec, key)
+                        deck = open(path, "rb")
+        except SpecError as exc:
+            self.server.count("errors")
+            return self._send_error(400, str(exc))
+        except Exception as exc:
+            self.server.count("errors")
+            return self._send_error(500, f"{type(exc).__name__}: {exc}")
+
+        with deck:
+            self.send_response(200)
+            self.send_header("Content-Type", PPTX_TYPE)
+            self.send_header("Content-Length", str(os.fstat(deck.fileno()).st_size))
+            self.send_header("ETag", etag)
+            self.send_header("X-Cache", "hit" if hit else "miss")
+            self.end_headers()
+            shutil.copyfileobj(deck, self.wfile)
+        if hit:
+            self.server.count("store_hits")
+        else:
+            self.server.count("renders")
+            self.server.count("slides", slides)
+        self.log_message("%s deck in %.1f ms", "stored" if hit else "rendered",
+                         (time.perf_counter() - start) * 1000)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _RenderServerMixin:
+    daemon_threads = True
+
+    def setup_renderer(self, renderer, quiet, store=None):
+        self.renderer = renderer or DeckRenderer(reproducible=store is not None)
+        self.quiet = quiet
+        self.store = store
+        self._render_locks = {}  # deck key -> [lock, users]
+        self._render_locks_lock = threading.Lock()
+        self.started = time.time()
+        self.stats = {"renders": 0, "slides": 0, "errors": 0}
+        if store is not None:
+            self.stats.update(store_hits=0, not_modified=0)
+        self._stats_lock = threading.Lock()
+        # Pay imports, template parsing and skeleton building up front
+        self.renderer.render(WARMUP_SPEC)
+
+    @contextlib.contextmanager
+    def render_lock(self, key):
+        """Hold the lock for one deck key while it is rendered."""
+        with self._render_locks_lock:
+            entry = self._render_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._render_locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._render_locks[key]
+
+    def count(self, name, n=1):
+        with self._stats_lock:
+            self.stats[name] += n
+
+
+class TCPRenderServer(_RenderServerMixin, ThreadingHTTPServer):
+    pass
+
+
+class UnixRenderServer(_RenderServerMixin, socketserver.ThreadingMixIn,
+                       socketserver.UnixStreamServer):
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def make_server(socket_path=None, host="127.0.0.1", port=None, renderer=None, quiet=False,
+                store=None):
+    """Create (but do not start) a render server.
+
+    Listens on ``host:port`` when ``port`` is given, otherwise on the Unix
+    socket ``socket_path`` (default: ``default_socket_path()``).  ``store``
+    is an optional ``store.DeckStore`` for rendered decks.
+    """
+    if port is not None:
+        server = TCPRenderServer((host, port), RenderHandler)
+    else:
+        server = UnixRenderServer(socket_path or default_socket_path(), RenderHandler)
+    server.setup_renderer(renderer, quiet, store)
+    return server
+
+
+def serve(socket_path=None, host="127.0.0.1", port=None, quiet=False, store=None):
+    server = make_server(socket_path, host, port, quiet=quiet, store=store)
+    where = f"http://{host}:{port}" if port is not None else server.server_address
+    print(f"tokens-deck render server listening on {where}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
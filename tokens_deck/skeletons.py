@@ -0,0 +1,142 @@
+"""Pre-built slide skeletons cloned at the XML level.
+
+Every content slide starts with the same scaffolding: title textbox, accent
+shape and (for the standard slide) a styled content box.
+Building that through python-pptx proxies costs a dozen proxy objects and
+property writes per slide.  A ``Skeleton`` draws an archetype once on a
+scratch presentation, keeps the resulting ``p:bg`` and ``p:spTree`` children,
+and stamps deep copies of them into new slides, filling in only the text.
+
+Text slots are found by drawing the archetype with marker strings such as
+``{title}``; the shape holding a marker becomes that slot.
+"""
+
+from copy import deepcopy
+
+from pptx import Presentation
+from pptx.util import Inches
+
+SLOT_MARKER = "{%s}"
+BULLETS_TOP = 2.5  # bullets text box, in inches
+BULLETS_HEIGHT = 5.5
+
+
+class Skeleton:
+    """The background and shapes of one slide archetype, ready to clone."""
+
+    def __init__(self, background, shapes, slots):
+        self.background = background
+        self.shapes = shapes
+        self.slots = slots
+
+    @classmethod
+    def capture(cls, slide, slot_names):
+        """Snapshot a drawn slide; ``slot_names`` are the markers used."""
+        cSld = slide._element.cSld
+        bg = cSld.bg
+        shapes = [el for el in cSld.spTree.iter_shape_elms()]
+        slots = {}
+        for name in slot_names:
+            marker = SLOT_MARKER % name
+            for index, el in enumerate(shapes):
+                if any(t.text == marker for t in el.xpath(".//a:t")):
+                    slots[name] = index
+                    break
+            else:
+                raise ValueError(f"skeleton slot {name!r} was not drawn")
+        return cls(bg, shapes, slots)
+
+    def stamp(self, slide, **text):
+        """Clone the skeleton into ``slide`` and fill its text slots.
+
+        A ``str`` value replaces the slot's single run; a list of strings
+        repeats the slot's last paragraph once per item.  Returns the cloned
+        shape elements in drawing order.
+        """
+        cSld = slide._element.cSld
+        if self.background is not None:
+            cSld.insert(0, deepcopy(self.background))
+        spTree = cSld.spTree
+        next_id = max((int(i) for i in spTree.xpath("//@id")), default=0) + 1
+        clones = []
+        for el in self.shapes:
+            clone = deepcopy(el)
+            clone.xpath("./*[1]/p:cNvPr")[0].set("id", str(next_id))
+            next_id += 1
+            spTree.append(clone)
+            clones.append(clone)
+        for name, value in text.items():
+            el = clones[self.slots[name]]
+            if isinstance(value, str):
+                _set_text(el, value)
+            else:
+                _set_paragraphs(el, value)
+        return clones
+
+
+class SkeletonCache:
+    """Skeletons per (theme, archetype), built lazily on first use.
+
+    ``draw`` functions take ``(deck, slide)`` where ``deck`` is a
+    ``DeckBuilder`` drawing through python-pptx, and use ``SLOT_MARKER``
+    text for every slot they declare.
+    """
+
+    def __init__(self):
+        self._skeletons = {}
+
+    def get(self, theme, name):
+        key = (theme.name, id(theme), name)
+        entry = self._skeletons.get(key)
+        if entry is None:
+            entry = (theme, self._build(theme, name))
+            self._skeletons[key] = entry
+        return entry[1]
+
+    def _build(self, theme, name):
+        from .renderer import BLANK_LAYOUT, DeckBuilder
+
+        draw, slot_names = ARCHETYPES[name]
+        prs = Presentation()
+        prs.slide_width = Inches(16)
+        prs.slide_height = Inches(9)
+        deck = DeckBuilder(prs, theme)
+        slide = prs.slides.add_slide(prs.slide_layouts[BLANK_LAYOUT])
+        draw(deck, slide)
+        return Skeleton.capture(slide, slot_names)
+
+
+def _draw_header(deck, slide):
+    deck.draw_header(slide, SLOT_MARKER % "title")
+
+
+def _draw_bullets(deck, slide):
+    theme = deck.theme
+    deck.draw_header(slide, SLOT_MARKER % "title")
+    box = slide.shapes.add_textbox(
+        Inches(theme.body_left), Inches(BULLETS_TOP), Inches(theme.body_width),
+        Inches(BULLETS_HEIGHT)
+    )
+    box.text_frame.word_wrap = True
+    deck.bullets(box.text_frame, [SLOT_MARKER % "items"])
+
+
+# name -> (draw function, slot names)
+ARCHETYPES = {
+    "header": (_draw_header, ("title",)),
+    "bullets": (_draw_bullets, ("title", "items")),
+}
+
+
+def _set_text(el, text):
+    el.xpath(".//a:t")[0].text = text
+
+
+def _set_paragraphs(el, items):
+    txBody = el.xpath("./p:txBody")[0]
+    template = txBody.xpath("./a:p")[-1]
+    txBody.remove(template)
+    for item in items:
+        p = deepcopy(template)
+        p.xpath(".//a:t")[0].text = item
+        txBody.append(p)
@@ -0,0 +1,328 @@
+"""Slide kinds that can appear in a deck spec.
+
+Each builder takes the ``DeckBuilder`` and the slide's spec mapping, adds one
+slide and returns it.  New kinds are registered with ``@slide_kind(name)``.
+"""
+
+from pptx.util import Inches
+
+from .charts import chart_data
+from .diagrams import graph_from_spec, layout_graph
+from .skeletons import BULLETS_HEIGHT
+from .spec import SpecError
+
+SLIDE_KINDS = {}
+SLIDE_ASSETS = {}
+
+
+def slide_kind(name):
+    """Register a slide builder under ``name``."""
+    def register(fn):
+        SLIDE_KINDS[name] = fn
+        return fn
+    return register
+
+
+def slide_assets(name):
+    """Register a function listing the images a kind of slide will place.
+
+    It takes the slide spec and yields ``(path, width, height)`` boxes in
+    inches, so the images can be processed before the slide is built.
+    """
+    def register(fn):
+        SLIDE_ASSETS[name] = fn
+        return fn
+    return register
+
+
+def prefetch_assets(deck, spec):
+    """Queue every image in a deck spec on the deck's image pipeline."""
+    for slide in spec["slides"]:
+        assets = SLIDE_ASSETS.get(slide.get("kind"))
+        if assets is None:
+            continue
+        try:
+            for path, width, height in assets(slide):
+                deck.images.submit(deck.asset_path(path), width, height)
+        except (KeyError, TypeError, OSError):
+            pass  # reported properly when the slide itself is built
+
+
+def build_slide(deck, spec, index):
+    """Build one slide, turning missing fields into ``SpecError``."""
+    kind = spec["kind"]
+    try:
+        builder = SLIDE_KINDS[kind]
+    except KeyError:
+        raise SpecError(f"slide {index}: unknown kind {kind!r}") from None
+    try:
+        return builder(deck, spec)
+    except KeyError as exc:
+        raise SpecError(f"slide {index} ({kind}): missing field {exc}") from None
+
+
+@slide_kind("title")
+def title_slide(deck, spec):
+    """Opening slide: large title, subtitle and a geometric accent."""
+    theme = deck.theme
+    slide = deck.new_slide()
+    if theme.header == "rule":
+        # Diagonal accent block bleeding off the top-left corner
+        deck.shape(slide, "rectangle", -2, -2, 10, 6, fill="accent", rotation=15)
+        deck.text(slide, 2, 3, 12, 2, spec["title"], size=theme.hero_size,
+                  color="title", bold=True)
+        if spec.get("subtitle"):
+            deck.text(slide, 2, 5.5, 10, 1, spec["subtitle"],
+                      size=theme.subtitle_size, color="muted")
+    else:
+        deck.text(slide, 1, 3, 14, 2, spec["title"], size=theme.hero_size,
+                  color="title", bold=True, align="center")
+        if spec.get("subtitle"):
+            deck.text(slide, 1, 5.2, 14, 1, spec["subtitle"],
+                      size=theme.subtitle_size, color="muted", align="center")
+        deck.shape(slide, "rectangle", 7, 6.8, 2, 0.1, fill="accent", line="accent")
+    return slide
+
+
+@slide_kind("bullets")
+def add_standard_slide(deck, spec):
+    """Title plus a column of bullet paragraphs.
+
+    ``fit`` is ``"shrink"`` (default: reduce the font size until the items
+    fit, warning if they never do), ``"flag"`` (only warn) or ``"none"``.
+    """
+    theme = deck.theme
+    slide = deck.new_slide()
+    shapes = deck.stamp(slide, "bullets", title=spec["title"], items=spec["items"])
+    fit = spec.get("fit", "shrink")
+    if fit != "none":
+        size = deck.fit_bullets(spec["title"], spec["items"], theme.body_width,
+                                BULLETS_HEIGHT, shrink=fit == "shrink")
+        if size != theme.body_size:
+            box = shapes[deck.skeletons.get(theme, "bullets").slots["items"]]
+            for run in box.xpath(".//a:r"):
+                run.get_or_add_rPr().set("sz", str(size * 100))
+    return slide
+
+
+@slide_kind("process_flow")
+def process_flow_slide(deck, spec):
+    """Row of step boxes joined by arrows, with an optional example line."""
+    theme = deck.theme
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+
+    steps = spec["steps"]
+    box_width, gap = 2.5, 0.5
+    left = (16 - len(steps) * box_width - (len(steps) - 1) * gap) / 2
+    for i, step in enumerate(steps):
+        x = left + i * (box_width + gap)
+        deck.shape(slide, "rounded_rectangle", x, 3.5, box_width, 1.5,
+                   fill="surface", line="outline", line_width=2,
+                   text=step, size=theme.small_size, bold=True)
+        if i < len(steps) - 1:
+            # Arrow overlapping the right edge of the box, as in the original
+            deck.shape(slide, "right_arrow", x + box_width, 3.9, 0.8, 0.6,
+                       fill="accent", line="accent")
+
+    if spec.get("example"):
+        deck.text(slide, 2, 6, 12, 2, spec["example"], size=theme.small_size,
+                  align="center")
+    return slide
+
+
+@slide_kind("token_examples")
+def token_examples_slide(deck, spec):
+    """Word → token split rows, with a closing insight line."""
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+
+    y = 2.8
+    for example in spec["examples"]:
+        deck.text(slide, 1, y, 6, 0.6, example["word"], color="strong")
+        deck.shape(slide, "right_arrow", 7.5, y + 0.1, 1, 0.4, fill="muted", line="muted")
+        tokens = example["tokens"]
+        if not isinstance(tokens, str):
+            tokens = "[" + ", ".join(f'"{t}"' for t in tokens) + "]"
+        deck.text(slide, 9, y, 6, 0.6, tokens, font="Courier New")
+        y += 1.4
+
+    if spec.get("insight"):
+        deck.text(slide, 1, 7, 14, 1.2, spec["insight"], size=22, color="strong",
+                  bold=True, align="center")
+    return slide
+
+
+@slide_kind("takeaways")
+def takeaways_slide(deck, spec):
+    """Stacked rounded boxes, one per takeaway."""
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+
+    y = 3
+    for item in spec["items"]:
+        deck.shape(slide, "rounded_rectangle", 2, y, 12, 0.9, fill="surface",
+                   line="outline", line_width=1.5, text=item)
+        y += 1.2
+    return slide
+
+
+@slide_kind("comparison")
+def comparison_slide(deck, spec):
+    """Two columns, each with a filled heading and a list underneath."""
+    theme = deck.theme
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+
+    for column, x, fill in ((spec["left"], 1.5, "muted"), (spec["right"], 8.5, "accent")):
+        deck.shape(slide, "rounded_rectangle", x, 2.3, 6, 0.8,
+                   fill=column.get("color", fill), text=column["heading"],
+                   color="on_accent", bold=True)
+        box = slide.shapes.add_textbox(*_inches(x, 3.5, 6, 4))
+        box.text_frame.word_wrap = True
+        deck.bullets(box.text_frame, column["items"], size=theme.small_size)
+    return slide
+
+
+@slide_kind("network")
+def network_slide(deck, spec):
+    """Bullets on the left, a layered neural-network sketch on the right."""
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+    box = slide.shapes.add_textbox(*_inches(1.5, 2.5, 8, 5.5))
+    box.text_frame.word_wrap = True
+    deck.bullets(box.text_frame, spec["items"])
+
+    layers = spec.get("layers", [3, 4, 2])
+    colors = spec.get("colors", ["accent", "muted", "title"])
+    x_start, y_start, pitch = 10, 3, 1.2
+    # Center every layer on the middle of the first one
+    center = y_start + (layers[0] - 1) * pitch / 2
+    for j, count in enumerate(layers):
+        top = center - (count - 1) * pitch / 2
+        for i in range(count):
+            deck.shape(slide, "oval", x_start + 2 * j, top + i * pitch, 0.5, 0.5,
+                       fill=colors[j % len(colors)])
+    return slide
+
+
+@slide_kind("architecture")
+def architecture_slide(deck, spec):
+    """Explanatory paragraph beside a vertical stack of component boxes."""
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+    deck.text(slide, 1.5, 2.5, 7, 4, spec["text"], size=spec.get("text_size", 18),
+              wrap=True)
+
+    for component in spec["components"]:
+        deck.shape(slide, "rounded_rectangle", 9.5, 2.5 + component["y"], 2,
+                   component.get("height", 0.8), fill=component.get("fill", "surface"),
+                   line=component.get("line", "outline"), text=component["text"],
+                   size=component.get("size", 14), color=component.get("color", "title"))
+    return slide
+
+
+@slide_kind("chart")
+def chart_slide(deck, spec):
+    """Native column, bar or line chart with an optional caption below.
+
+    Values may be NumPy arrays; long line series are downsampled to
+    ``max_points`` (see ``charts``).
+    """
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+    caption = spec.get("caption")
+    try:
+        categories, series = chart_data(spec)
+    except ValueError as exc:
+        raise SpecError(f"chart {spec['title']!r}: {exc}") from None
+    deck.chart(slide, spec.get("chart", "column"), 1, 2.3, 14, 5.2 if caption else 6.2,
+               categories, series, number_format=spec.get("number_format"),
+               labels=spec.get("labels", False))
+    if caption:
+        deck.text(slide, 1, 7.7, 14, 0.8, caption, size=deck.theme.small_size,
+                  align="center", wrap=True)
+    return slide
+
+
+@slide_kind("diagram")
+def diagram_slide(deck, spec):
+    """Flow or network diagram laid out automatically, with an optional caption.
+
+    ``layout`` is ``layered`` (default; ``direction`` ``right`` or ``down``),
+    ``grid`` or ``force``; see ``diagrams.graph_from_spec`` for the graph.
+    """
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+    caption = spec.get("caption")
+    box = (1, 2.3, 14, 5.2 if caption else 6.2)
+    try:
+        graph = graph_from_spec(spec)
+        layout = layout_graph(graph, box, spec.get("layout", "layered"),
+                              spec.get("direction", "right"))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise SpecError(f"diagram {spec['title']!r}: {exc}") from None
+    kind = spec.get("shape", "oval" if "layers" in spec else "rounded_rectangle")
+    if kind == "oval":
+        layout.width = layout.height = min(layout.width, layout.height)
+    labels = graph.labels if spec.get("labels", "nodes" in spec) else None
+    deck.diagram(slide, layout, kind, labels=labels, fills=graph.fills,
+                 line=None if "layers" in spec else "outline", arrows=spec.get("arrows", True),
+                 size=spec.get("size", deck.theme.small_size))
+    if caption:
+        deck.text(slide, 1, 7.7, 14, 0.8, caption, size=deck.theme.small_size,
+                  align="center", wrap=True)
+    return slide
+
+
+@slide_kind("table")
+def table_slide(deck, spec):
+    """One page of a table under the header, with an optional caption.
+
+    ``DeckRenderer.iter_slides`` splits the spec's ``rows`` (or ``csv``)
+    into pages first; see ``tables.paginate_table``.
+    """
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+    caption = spec.get("caption")
+    try:
+        deck.table(slide, spec["columns"], spec["rows"], (1, 2.3, 14, 5.2 if caption else 6.2),
+                   spec.get("widths"), spec.get("align"), spec.get("size"))
+    except (KeyError, TypeError, ValueError) as exc:
+        raise SpecError(f"table {spec['title']!r}: {exc}") from None
+    if caption:
+        deck.text(slide, 1, 7.7, 14, 0.8, caption, size=deck.theme.small_size,
+                  align="center", wrap=True)
+    return slide
+
+
+def _image_boxes(spec):
+    """``(path, left, top, width, height)`` for each image of an image slide."""
+    paths = spec["images"] if "images" in spec else [spec["image"]]
+    gap = 0.4
+    width = (14 - gap * (len(paths) - 1)) / len(paths)
+    height = 5.2 if spec.get("caption") else 6.2
+    return [(path, 1 + i * (width + gap), 2.3, width, height) for i, path in enumerate(paths)]
+
+
+@slide_assets("image")
+def image_assets(spec):
+    for path, _, _, width, height in _image_boxes(spec):
+        yield path, width, height
+
+
+@slide_kind("image")
+def image_slide(deck, spec):
+    """One ``image`` (or a row of ``images``) under the header, with a caption."""
+    slide = deck.new_slide()
+    deck.header(slide, spec["title"])
+    for path, left, top, width, height in _image_boxes(spec):
+        deck.picture(slide, path, left, top, width, height)
+    if spec.get("caption"):
+        deck.text(slide, 1, 7.7, 14, 0.8, spec["caption"], size=deck.theme.small_size,
+                  align="center", wrap=True)
+    return slide
+
+
+def _inches(*values):
+    return [Inches(v) for v in values]
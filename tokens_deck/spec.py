@@ -0,0 +1,82 @@
+"""Loading and validating declarative deck specs.
+
+A deck spec is a plain mapping::
+
+    {
+        "name": "tokens_in_llms",
+        "theme": "minimal",
+        "slides": [
+            {"kind": "title", "title": "...", "subtitle": "..."},
+            {"kind": "bullets", "title": "...", "items": ["...", "..."]},
+            ...
+        ]
+    }
+
+Specs can be given as dicts or loaded from JSON or YAML files.  YAML support
+needs PyYAML, which is only imported when a YAML file is actually loaded.
+"""
+
+import json
+import os
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+
+
+class SpecError(ValueError):
+    """Raised when a deck spec is malformed."""
+
+
+def load_spec(source):
+    """Return a validated deck spec from a dict or a JSON/YAML file path."""
+    if isinstance(source, dict):
+        spec = source
+    else:
+        path = os.fspath(source)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        spec = parse_spec(text, "yaml" if path.endswith((".yaml", ".yml")) else "json")
+        spec.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        # Relative asset paths (images, tokenizer) are relative to the spec file
+        spec.setdefault("base_dir", os.path.dirname(os.path.abspath(path)))
+    validate_spec(spec)
+    return spec
+
+
+def parse_spec(text, fmt="json"):
+    """Parse spec text in the given format ("json" or "yaml") into a mapping."""
+    if fmt == "json":
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise SpecError(f"invalid JSON: {exc}") from exc
+    elif fmt == "yaml":
+        try:
+            import yaml
+        except ImportError as exc:
+            raise SpecError("YAML specs require PyYAML (pip install pyyaml)") from exc
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise SpecError(f"invalid YAML: {exc}") from exc
+    else:
+        raise SpecError(f"unknown spec format {fmt!r}")
+    if not isinstance(data, dict):
+        raise SpecError(f"deck spec must be a mapping, not {type(data).__name__}")
+    return data
+
+
+def builtin_spec(name):
+    """Return one of the bundled deck specs, e.g. ``"tokens_in_llms"``."""
+    return load_spec(os.path.join(SPEC_DIR, f"{name}.json"))
+
+
+def validate_spec(spec):
+    """Check the overall shape of a spec; slide fields are checked on render."""
+    if not isinstance(spec, dict):
+        raise SpecError("deck spec must be a mapping")
+    slides = spec.get("slides")
+    if not isinstance(slides, list) or not slides:
+        raise SpecError("deck spec needs a non-empty 'slides' list")
+    for index, slide in enumerate(slides, 1):
+        if not isinstance(slide, dict) or "kind" not in slide:
+            raise SpecError(f"slide {index}: each slide needs a 'kind'")
@@ -0,0 +1,201 @@
+"""Content-addressed store of rendered decks, for serving repeat requests.
+
+A deck is stored under a hash of everything its bytes depend on: the spec,
+the resolved theme, the rendering code, the renderer's image settings, the
+tokenizer's ``fingerprint`` (a digest of its vocabulary and merges), the
+size and mtime of every file the spec refers to (images, table CSVs) and
+the reproducible timestamp.  Because the renderer writes reproducible
+output, that key identifies the deck's exact bytes and doubles as its HTTP
+``ETag``: a client holding a deck can be told it is unchanged without the
+deck being rendered or even read.  Spec values must therefore be JSON data
+(or arrays): anything else has no stable text to hash, and is rejected.
+
+The store is bounded by ``max_bytes`` (least recently used decks go
+first) and, optionally, by ``max_age``: decks not requested for that many
+seconds are dropped.  Hits refresh a deck's mtime, which is what both
+limits go by.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .cache import _json_default, code_fingerprint, theme_fingerprint
+from .slides import SLIDE_ASSETS
+from .spec import SpecError, load_spec
+from .themes import Theme
+from .writer import source_date
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _json_data(value):
+    if hasattr(value, "tobytes"):
+        return _json_default(value)
+    if isinstance(value, os.PathLike):
+        return os.fspath(value)
+    raise SpecError(f"cannot store a deck whose spec holds a {type(value).__name__}; "
+                    "spec values must be JSON data")
+
+
+def _tokenizer_id(tokenizer):
+    if tokenizer is None:
+        return None
+    fingerprint = getattr(tokenizer, "fingerprint", None)
+    if fingerprint is None:
+        raise TypeError(f"cannot store decks rendered with a {type(tokenizer).__name__}: "
+                        "it has no fingerprint")
+    return fingerprint
+
+
+class DeckStore:
+    """Rendered .pptx files keyed by a hash of their inputs."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, max_age=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()  # guards the counters and _size
+        self._size = sum(size for _, size, _ in self._entries())
+
+    def key(self, renderer, spec):
+        """Return the hash of a loaded spec's deck as ``renderer`` renders it."""
+        base_dir = spec.get("base_dir") or ""
+        paths = []
+        for slide in spec["slides"]:
+            if slide.get("kind") == "table" and "csv" in slide:
+                paths.append(os.path.join(base_dir, slide["csv"]))
+            assets = SLIDE_ASSETS.get(slide.get("kind"))
+            if assets is None:
+                continue
+            try:
+                paths.extend(os.path.join(base_dir, path) for path, _, _ in assets(slide))
+            except (KeyError, TypeError):
+                pass  # the render reports it
+        files = [[path, _stat(path)] for path in paths]
+        settings = [renderer.images.dpi, renderer.images.quality,
+                    _tokenizer_id(renderer.tokenizer_for(spec)), str(source_date())]
+        theme = theme_fingerprint(renderer.theme_for(spec))
+        if isinstance(spec.get("theme"), Theme):
+            spec = dict(spec, theme=spec["theme"].name)  # its content is in ``theme``
+        payload = json.dumps([code_fingerprint(), theme, settings, files, spec],
+                             sort_keys=True, default=_json_data)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the path of the stored deck for ``key``, or None."""
+        path = self.lookup(key)
+        with self._lock:
+            if path is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return path
+
+    def lookup(self, key):
+        """Like ``get``, without counting a hit or miss."""
+        path = self._path(key)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        if self.max_age is not None and time.time() - st.st_mtime > self.max_age:
+            self._remove(path, st.st_size)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None  # evicted meanwhile
+        return path
+
+    def fetch(self, renderer, spec):
+        """Return ``(key, path, hit)`` for a spec's deck, rendering it on a miss."""
+        spec = load_spec(spec)
+        key = self.key(renderer, spec)
+        path = self.get(key)
+        if path is not None:
+            return key, path, True
+        path, _ = self.put(renderer, spec, key)
+        return key, path, False
+
+    def put(self, renderer, spec, key):
+        """Render a loaded spec into the store under ``key``.
+
+        Returns ``(path, slides)``.  ``renderer`` must be reproducible, or
+        the key would not describe the deck's bytes.
+        """
+        if not renderer.reproducible:
+            raise ValueError("DeckStore needs a DeckRenderer(reproducible=True)")
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                prs = renderer.render_to(spec, f)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        path = self._path(key)
+        with self._lock:
+            self._size += os.path.getsize(tmp)
+            os.replace(tmp, path)
+            if self._size > self.max_bytes:
+                self._evict()
+        return path, len(prs.slides)
+
+    def evict(self):
+        """Drop decks older than ``max_age``, then least recently used decks
+        until under ``max_bytes``."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        oldest = time.time() - self.max_age if self.max_age is not None else None
+        for path, size, mtime in entries:
+            if total <= self.max_bytes and (oldest is None or mtime >= oldest):
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._entries():
+                os.remove(path)
+            self._size = 0
+
+    def _remove(self, path, size):
+        with self._lock:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return
+            self._size -= size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pptx")
+
+    def _entries(self):
+        """Yield ``(path, size, mtime)`` for every stored deck."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pptx"):
+                    st = entry.stat()
+                    yield entry.path, st.st_size, st.st_mtime
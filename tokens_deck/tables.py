@@ -0,0 +1,301 @@
+"""Table slides: rows from any source, written as ``a:tbl`` XML in one pass.
+
+python-pptx builds a table through one proxy object per cell and a dozen
+property writes per styled run, which takes seconds for a few thousand
+cells.  ``table_xml`` instead renders the header and body cell styles
+(fill, borders, run properties) to XML text once per table and joins one
+small string per cell, so a page of cells costs one ``parse_xml``.
+
+``paginate_table`` splits a table spec into one slide spec per page, each
+repeating the header row.  Long cells wrap, so pages are filled by
+estimated height: ``row_lines`` guesses each row's line count from its
+text length and column width, the same estimate ``table_xml`` sizes the
+rows with.  Rows are pulled lazily from a list, any
+iterable, a pandas DataFrame or a CSV file (``"csv": "prices.csv"``), so
+a 100,000-row input is never held in memory; with ``render --stream`` each
+page is written out as soon as it is drawn.
+"""
+
+import csv
+import itertools
+import math
+import os
+import re
+from xml.sax.saxutils import escape
+
+from .spec import SpecError
+
+ROW_SPACING = 2.0  # height of a one-line row as a multiple of the font size
+LINE_SPACING = 1.2  # height of each further wrapped line, likewise
+CHAR_WIDTH = 0.55  # average character width as a fraction of the font size
+CELL_MARGINS = 0.2  # left plus right cell margin in inches
+TABLE_BOX = (1, 2.3, 14, 6.2)  # left, top, width, height in inches
+EMU_PER_INCH = 914400
+MAX_WIDTH_SAMPLE = 200  # rows looked at when sizing columns
+
+_INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_NUMBER = re.compile(r"^[-+]?[$€£]?\d[\d,]*(\.\d+)?[%KMB]?$")
+
+_NS = ('xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+       'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"')
+TABLE_URI = "http://schemas.openxmlformats.org/drawingml/2006/table"
+
+
+def _dataframe_rows(frame):
+    return [str(c) for c in frame.columns], frame.itertuples(index=False, name=None)
+
+
+def table_rows(spec, base_dir=None):
+    """Return ``(columns, rows)`` for a table spec; ``rows`` is an iterator.
+
+    Rows come from ``csv`` (a path, header in the first line unless
+    ``columns`` is given), or ``rows``: sequences, mappings (keyed by
+    column) or a DataFrame.  Nothing is read beyond the first row.
+    """
+    columns = spec.get("columns")
+    if "csv" in spec:
+        path = spec["csv"]
+        if base_dir:
+            path = os.path.join(base_dir, path)
+        rows = _read_csv(path)
+        if columns is None:
+            columns = next(rows, None)
+            if columns is None:
+                raise SpecError(f"table {spec['title']!r}: {path} is empty")
+        return list(columns), rows
+    source = spec.get("rows")
+    if source is None:
+        raise SpecError(f"table {spec['title']!r} needs 'rows' or 'csv'")
+    if hasattr(source, "itertuples") and hasattr(source, "columns"):
+        frame_columns, rows = _dataframe_rows(source)
+        return list(columns or frame_columns), rows
+    rows = iter(source)
+    first = next(rows, None)
+    if first is None:
+        return list(columns or ()), iter(())
+    if isinstance(first, dict):
+        columns = list(columns or first)
+        rows = ([row.get(c) for c in columns] for row in itertools.chain([first], rows))
+        return columns, rows
+    if columns is None:
+        raise SpecError(f"table {spec['title']!r}: list rows need 'columns'")
+    return list(columns), itertools.chain([first], rows)
+
+
+def _read_csv(path):
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            yield from csv.reader(f)
+    except OSError as exc:
+        raise SpecError(f"cannot read table {path!r}: {exc}") from None
+
+
+def cell_text(value, fmt=None):
+    if value is None:
+        return ""
+    if fmt:
+        try:
+            return fmt.format(value)
+        except (ValueError, TypeError):
+            pass
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def table_size(theme, size=None):
+    """Font size of a table's cells in points: ``size`` or the theme default."""
+    return size or theme.small_size - 4
+
+
+def rows_per_page(spec, theme):
+    """Most body rows that fit under the header at the table's font size:
+    ``rows_per_slide``, or as many one-line rows as the box holds."""
+    if "rows_per_slide" in spec:
+        return max(1, int(spec["rows_per_slide"]))
+    size = table_size(theme, spec.get("size"))
+    return max(1, math.floor(_page_height(spec) * 72 / (size * ROW_SPACING)) - 1)
+
+
+def _page_height(spec):
+    return TABLE_BOX[3] - (1 if spec.get("caption") else 0)
+
+
+def line_widths(widths, count, size, width=TABLE_BOX[2]):
+    """Characters per line in each of ``count`` columns (relative ``widths``)."""
+    widths = widths or [1] * count
+    total = sum(widths)
+    return [max(1, math.floor((width * w / total - CELL_MARGINS) * 72 / (size * CHAR_WIDTH)))
+            for w in widths]
+
+
+def row_lines(row, chars):
+    """Estimated lines of the tallest cell of ``row``, wrapped at ``chars``
+    characters per line in each column."""
+    lines = 1
+    for text, limit in zip(row, chars):
+        text = str(text)
+        if len(text) > limit or "\n" in text:
+            lines = max(lines, sum(max(1, math.ceil(len(line) / limit))
+                                   for line in text.split("\n")))
+    return lines
+
+
+def row_height(lines, size):
+    """Height in points of a row of ``lines`` lines of ``size``-point text."""
+    return size * (ROW_SPACING + LINE_SPACING * (lines - 1))
+
+
+def paginate_table(spec, theme, base_dir=None):
+    """Split a ``table`` spec into slide specs of at most one page of rows.
+
+    Column widths and alignment are decided from the rows that could fit on
+    the first page (numbers are right-aligned) and kept for every page.  A
+    page holds at most ``rows_per_page`` rows and, unless ``rows_per_slide``
+    is given, only as many as fit by estimated height (see ``row_lines``);
+    a row taller than a page gets a page of its own.  Pages after the first
+    are titled with ``continued`` (default ``"{title} (cont.)"``).
+    """
+    columns, rows = table_rows(spec, base_dir)
+    formats = spec.get("formats", {})
+    fmts = [formats.get(c) for c in columns]
+    base = {k: v for k, v in spec.items() if k not in ("rows", "csv", "continued")}
+    title = spec["title"]
+    continued = spec.get("continued", "{title} (cont.)").format(title=title)
+    per_page = rows_per_page(spec, theme)
+    texts = ([cell_text(v, f) for v, f in itertools.zip_longest(row, fmts)][:len(columns)]
+             for row in rows)
+    sample = list(itertools.islice(texts, per_page))
+    widths = spec.get("widths") or _column_widths(columns, sample)
+    align = spec.get("align") or _alignments(sample, len(columns))
+    texts = itertools.chain(sample, texts)
+    if "rows_per_slide" in spec:
+        pages = iter(lambda: list(itertools.islice(texts, per_page)), [])
+    else:
+        size = table_size(theme, spec.get("size"))
+        chars = line_widths(widths, len(columns), size)
+        room = _page_height(spec) * 72 - row_height(row_lines(columns, chars), size)
+        pages = _fill_pages(texts, per_page, room,
+                            lambda row: row_height(row_lines(row, chars), size))
+    first = True
+    for page in pages:
+        yield dict(base, title=title if first else continued, columns=columns, rows=page,
+                   widths=widths, align=align)
+        first = False
+    if first:
+        yield dict(base, title=title, columns=columns, rows=[], widths=widths, align=align)
+
+
+def _fill_pages(rows, limit, room, height):
+    """Group ``rows`` into pages of at most ``limit`` rows whose heights add
+    up to at most ``room`` (but at least one row each)."""
+    page, used = [], 0
+    for row in rows:
+        h = height(row)
+        if page and (len(page) == limit or used + h > room):
+            yield page
+            page, used = [], 0
+        page.append(row)
+        used += h
+    if page:
+        yield page
+
+
+def _column_widths(columns, rows):
+    """Relative widths from the longest text per column (header included)."""
+    widths = [len(str(c)) for c in columns]
+    for row in rows[:MAX_WIDTH_SAMPLE]:
+        for i, text in enumerate(row):
+            widths[i] = max(widths[i], len(text))
+    # Keep very long and very short columns within reason
+    return [min(max(w, 4), 40) for w in widths]
+
+
+def _alignments(rows, count):
+    align = []
+    for i in range(count):
+        values = [row[i] for row in rows[:MAX_WIDTH_SAMPLE] if i < len(row) and row[i]]
+        numeric = values and all(_NUMBER.match(v.replace(" ", "")) for v in values)
+        align.append("right" if numeric else "left")
+    return align
+
+
+class TableStyle:
+    """XML fragments shared by every cell of a table, rendered once."""
+
+    def __init__(self, theme, size):
+        self.size = size
+        header = self._run(theme, "on_accent", bold=True)
+        body = self._run(theme, "text")
+        border = (f'<a:lnB w="6350"><a:solidFill>{_color(theme, "muted")}</a:solidFill>'
+                  '</a:lnB>')
+        margins = 'marL="91440" marR="91440" marT="45720" marB="45720" anchor="ctr"'
+        self.header = (header, f'<a:tcPr {margins}><a:solidFill>{_color(theme, "accent")}'
+                               '</a:solidFill></a:tcPr>')
+        self.body = (body, f"<a:tcPr {margins}>{border}<a:noFill/></a:tcPr>")
+        self.band = (body, f'<a:tcPr {margins}>{border}<a:solidFill>'
+                           f'{_color(theme, "surface")}</a:solidFill></a:tcPr>')
+
+    def _run(self, theme, color, bold=False):
+        b = ' b="1"' if bold else ""
+        return (f'<a:rPr lang="en-US" sz="{round(self.size * 100)}"{b} dirty="0">'
+                f"<a:solidFill>{_color(theme, color)}</a:solidFill></a:rPr>")
+
+
+def _color(theme, name):
+    ref = theme.theme_color(name)
+    if ref is not None:
+        return f'<a:schemeClr val="{ref.xml_value}"/>'
+    return f'<a:srgbClr val="{theme.color(name)}"/>'
+
+
+def _cell(text, style, align):
+    rPr, tcPr = style
+    if text:
+        text = escape(_INVALID_XML.sub("", text))
+        run = f"<a:r>{rPr}<a:t>{text}</a:t></a:r>"
+    else:
+        run = ""
+    return (f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:pPr algn="{align}"/>{run}'
+            f"</a:p></a:txBody>{tcPr}</a:tc>")
+
+
+def table_xml(shape_id, columns, rows, style, box=TABLE_BOX, widths=None, align=None):
+    """``p:graphicFrame`` XML text of a table with a header row.
+
+    ``widths`` are relative column widths (default: equal) and ``align``
+    the paragraph alignment per column (``left``, ``center``, ``right``).
+    Rows are as tall as ``row_lines`` estimates their wrapped text needs.
+    """
+    left, top, width, _ = box
+    count = len(columns)
+    widths = widths or [1] * count
+    total = sum(widths)
+    grid = [round(width * EMU_PER_INCH * w / total) for w in widths]
+    algn = [{"left": "l", "center": "ctr", "right": "r"}[a] for a in (align or ["left"] * count)]
+    chars = line_widths(widths, count, style.size, width)
+    heights = [round(row_height(row_lines(row, chars), style.size) / 72 * EMU_PER_INCH)
+               for row in itertools.chain([columns], rows)]
+    parts = [
+        f"<p:graphicFrame {_NS}><p:nvGraphicFramePr>",
+        f'<p:cNvPr id="{shape_id}" name="Table {shape_id}"/>',
+        '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr>',
+        "<p:nvPr/></p:nvGraphicFramePr>",
+        f'<p:xfrm><a:off x="{round(left * EMU_PER_INCH)}" y="{round(top * EMU_PER_INCH)}"/>',
+        f'<a:ext cx="{sum(grid)}" cy="{sum(heights)}"/></p:xfrm>',
+        f'<a:graphic><a:graphicData uri="{TABLE_URI}"><a:tbl>',
+        '<a:tblPr firstRow="1" bandRow="1"/><a:tblGrid>',
+        *(f'<a:gridCol w="{w}"/>' for w in grid),
+        "</a:tblGrid>",
+    ]
+    parts.append(f'<a:tr h="{heights[0]}">')
+    parts.extend(_cell(str(c), style.header, a) for c, a in zip(columns, algn))
+    parts.append("</a:tr>")
+    for i, (row, h) in enumerate(zip(rows, heights[1:])):
+        cell_style = style.band if i % 2 else style.body
+        parts.append(f'<a:tr h="{h}">')
+        parts.extend(_cell(text, cell_style, a)
+                     for text, a in itertools.zip_longest(row, algn, fillvalue=""))
+        parts.append("</a:tr>")
+    parts.append("</a:tbl></a:graphicData></a:graphic></p:graphicFrame>")
+    return "".join(parts)
@@ -0,0 +1,179 @@
+"""Fast text measurement for fitting bullets into their boxes.
+
+python-pptx's ``fit_text`` re-renders text with a font file for every size
+it tries, which is too slow to run on every slide.  ``TextMeasurer`` instead
+keeps, per font face, a table of glyph advances measured once with Pillow,
+plus LRU caches of word widths and of line counts per (paragraph, size,
+width).  Wrapping is greedy on spaces like PowerPoint's; kerning is ignored,
+so results are a close estimate rather than an exact layout.
+
+The deck's text is in the theme font, Calibri.  When it is not installed the
+metric-compatible Carlito is used, and failing that DejaVu Sans, which is
+wider and so errs on the side of shrinking.
+"""
+
+import functools
+import os
+import warnings
+
+REFERENCE_SIZE = 100  # glyph advances are measured at this pixel size
+LINE_SPACING = 1.2  # single spacing, as a multiple of the font size
+INSET_X = 0.1  # default text frame insets, in inches
+INSET_Y = 0.05
+
+FONT_FILES = {
+    ("calibri", False): ("calibri.ttf", "Carlito-Regular.ttf"),
+    ("calibri", True): ("calibrib.ttf", "Carlito-Bold.ttf"),
+    ("courier new", False): ("cour.ttf", "LiberationMono-Regular.ttf", "DejaVuSansMono.ttf"),
+    ("courier new", True): ("courbd.ttf", "LiberationMono-Bold.ttf", "DejaVuSansMono-Bold.ttf"),
+}
+FALLBACK_FILES = {
+    False: ("DejaVuSans.ttf", "LiberationSans-Regular.ttf", "Arial.ttf"),
+    True: ("DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf", "Arial Bold.ttf"),
+}
+FONT_DIRS = (
+    "/usr/share/fonts", "/usr/local/share/fonts", "~/.fonts", "~/.local/share/fonts",
+    "/Library/Fonts", "/System/Library/Fonts", "~/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", "C:/Windows"), "Fonts"),
+)
+
+
+class TextOverflowWarning(UserWarning):
+    """A slide's text does not fit its box, even at the smallest size."""
+
+
+@functools.lru_cache(maxsize=None)
+def _font_index():
+    index = {}
+    for directory in FONT_DIRS:
+        for root, _, files in os.walk(os.path.expanduser(directory)):
+            for name in files:
+                index.setdefault(name.lower(), os.path.join(root, name))
+    return index
+
+
+def find_font(family, bold=False):
+    """Path of a font file for ``family``, a stand-in, or None."""
+    index = _font_index()
+    for name in FONT_FILES.get((family.lower(), bold), ()) + FALLBACK_FILES[bold]:
+        path = index.get(name.lower())
+        if path:
+            return path
+    return None
+
+
+class FontMetrics:
+    """Memoized glyph advances of one font face."""
+
+    def __init__(self, path=None):
+        from PIL import ImageFont
+
+        if path:
+            self.font = ImageFont.truetype(path, REFERENCE_SIZE)
+        else:
+            self.font = ImageFont.load_default(REFERENCE_SIZE)
+        self.advances = {}
+        self.space = self.advance(" ")
+        self.word_width = functools.lru_cache(maxsize=65536)(self._word_width)
+        self.count_lines = functools.lru_cache(maxsize=65536)(self._count_lines)
+
+    def advance(self, ch):
+        width = self.advances.get(ch)
+        if width is None:
+            width = self.advances[ch] = self.font.getlength(ch)
+        return width
+
+    def _word_width(self, word):
+        advances = self.advances
+        try:
+            return sum(advances[ch] for ch in word)
+        except KeyError:
+            return sum(self.advance(ch) for ch in word)
+
+    def _count_lines(self, text, size, width):
+        """Lines ``text`` wraps to at ``size`` points in ``width`` points."""
+        avail = width * REFERENCE_SIZE / size
+        space = self.space
+        lines, used = 1, None
+        for word in text.split():
+            w = self.word_width(word)
+            if used is None:
+                pass
+            elif used + space + w <= avail:
+                used += space + w
+                continue
+            else:
+                lines += 1
+            while w > avail:  # a word wider than the box breaks mid-word
+                lines += 1
+                w -= avail
+            used = w
+        return lines
+
+
+class TextMeasurer:
+    """Wrapped-height estimates and auto-fit for text boxes (inches, points)."""
+
+    def __init__(self, family="Calibri"):
+        self.family = family
+        self._metrics = {}
+
+    def metrics(self, bold=False):
+        metrics = self._metrics.get(bold)
+        if metrics is None:
+            metrics = self._metrics[bold] = FontMetrics(find_font(self.family, bold))
+        return metrics
+
+    def paragraph_height(self, text, width, size, space_before=0, bold=False):
+        """Height in points of one paragraph in a box ``width`` inches wide."""
+        lines = self.metrics(bold).count_lines(text, size, (width - 2 * INSET_X) * 72)
+        return lines * size * LINE_SPACING + space_before
+
+    def text_height(self, paragraphs, width, size, space_before=0, bold=False):
+        """Height in inches of ``paragraphs`` in a box ``width`` inches wide."""
+        points = sum(self.paragraph_height(text, width, size, space_before, bold)
+                     for text in paragraphs)
+        return points / 72 + 2 * INSET_Y
+
+    def fit(self, paragraphs, width, height, size, min_size, space_before=0, bold=False):
+        """Largest whole point size, from ``size`` down to ``min_size``, at
+        which the paragraphs fit; returns ``(size, fits)``."""
+        paragraphs = list(paragraphs)
+        for candidate in range(int(size), int(min_size) - 1, -1):
+            if self.text_height(paragraphs, width, candidate, space_before, bold) <= height:
+                return candidate, True
+        return int(min_size), False
+
+
+def warn_overflow(title, needed, available):
+    warnings.warn(
+        f"text on slide {title!r} needs {needed:.2f}in but its box is {available:.2f}in tall",
+        TextOverflowWarning, stacklevel=3,
+    )
+
+
+def paginate_bullets(spec, theme, measurer, height):
+    """Split a ``bullets`` spec with ``"paginate": true`` into slide specs.
+
+    ``spec["items"]`` may be any iterable, including a generator: items are
+    pulled one at a time and each page is yielded as soon as the next item
+    would not fit at the body size, so only one page is held in memory.
+    Pages after the first are titled with ``continued`` (default
+    ``"{title} (cont.)"``).
+    """
+    base = {k: v for k, v in spec.items() if k not in ("paginate", "items", "continued")}
+    title = spec["title"]
+    continued = spec.get("continued", "{title} (cont.)").format(title=title)
+    width, size = theme.body_width, theme.body_size
+    spacing = theme.space_before + theme.space_after
+    # The bullets box holds an empty paragraph before the items
+    budget = (height - 2 * INSET_Y) * 72 - measurer.paragraph_height("", width, size, spacing)
+    page, used = [], 0.0
+    for item in spec["items"]:
+        needed = measurer.paragraph_height(item, width, size, spacing)
+        if page and used + needed > budget:
+            yield dict(base, title=title, items=page)
+            title, page, used = continued, [], 0.0
+        page.append(item)
+        used += needed
+    yield dict(base, title=title, items=page)
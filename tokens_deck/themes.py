@@ -0,0 +1,142 @@
+"""Color palettes, type scale and geometry for the built-in deck styles."""
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_THEME_COLOR
+
+# Theme color-scheme slot, the role compiled into it, and the color reference
+# slides use for it (through the master's default clrMap, bg1=lt1, tx1=dk1,
+# bg2=lt2, tx2=dk2).
+SCHEME_SLOTS = [
+    ("dk1", "title", MSO_THEME_COLOR.TEXT_1),
+    ("lt1", "background", MSO_THEME_COLOR.BACKGROUND_1),
+    ("dk2", "text", MSO_THEME_COLOR.TEXT_2),
+    ("lt2", "surface", MSO_THEME_COLOR.BACKGROUND_2),
+    ("accent1", "accent", MSO_THEME_COLOR.ACCENT_1),
+    ("accent2", "muted", MSO_THEME_COLOR.ACCENT_2),
+    ("accent3", "outline", MSO_THEME_COLOR.ACCENT_3),
+    ("accent4", "strong", MSO_THEME_COLOR.ACCENT_4),
+]
+
+
+@dataclass(frozen=True)
+class Theme:
+    """Everything a slide builder needs to know about a deck's look.
+
+    ``palette`` holds the named colors (the constants the original scripts
+    defined at the top of the file); the role fields name which palette entry
+    is used for titles, body text, boxes and so on.  Slide specs may refer to
+    palette names or ``#RRGGBB`` literals wherever they take a color.
+    """
+
+    name: str
+    palette: Dict[str, RGBColor]
+    title: str
+    text: str
+    strong: str
+    muted: str
+    accent: str
+    surface: str
+    outline: str
+    on_accent: str
+    background: str = "WHITE"  # compiled into the master background (bg1)
+
+    # "underline": short accent rectangle under the title (tokens deck)
+    # "rule": full-width accent connector above the title (prompting deck)
+    header: str = "underline"
+
+    # Type scale, in points
+    hero_size: int = 66
+    subtitle_size: int = 28
+    title_size: int = 44
+    body_size: int = 20
+    small_size: int = 18
+
+    # Geometry, in inches
+    margin: float = 0.5
+    body_left: float = 0.5
+    body_width: float = 15
+    space_before: int = 12
+    space_after: int = 0
+
+    extra: Dict[str, object] = field(default_factory=dict)
+
+    def color(self, name):
+        """Resolve a palette name, role name or ``#RRGGBB`` literal."""
+        if isinstance(name, RGBColor):
+            return name
+        if name.startswith("#"):
+            return RGBColor.from_string(name[1:])
+        if name in self.palette:
+            return self.palette[name]
+        role = getattr(self, name, None)
+        if isinstance(role, str) and role in self.palette:
+            return self.palette[role]
+        raise KeyError(f"unknown color {name!r} for theme {self.name!r}")
+
+    def scheme_colors(self):
+        """Return ``{scheme slot: RGBColor}`` for compiling into the theme part."""
+        return {slot: self.color(role) for slot, role, _ in SCHEME_SLOTS}
+
+    def theme_color(self, name):
+        """Return the ``MSO_THEME_COLOR`` that renders as ``name``, if any."""
+        rgb = self.color(name)
+        for _, role, ref in SCHEME_SLOTS:
+            if self.color(role) == rgb:
+                return ref
+        return None
+
+
+# Black and white minimalistic palette (tokens_presentation.py)
+MINIMAL = Theme(
+    name="minimal",
+    palette={
+        "BLACK": RGBColor(0, 0, 0),
+        "WHITE": RGBColor(255, 255, 255),
+        "GRAY_LIGHT": RGBColor(240, 240, 240),
+        "GRAY_MEDIUM": RGBColor(128, 128, 128),
+        "GRAY_DARK": RGBColor(64, 64, 64),
+    },
+    title="BLACK",
+    text="GRAY_DARK",
+    strong="BLACK",
+    muted="GRAY_MEDIUM",
+    accent="BLACK",
+    surface="GRAY_LIGHT",
+    outline="BLACK",
+    on_accent="WHITE",
+)
+
+# Professional slate/indigo palette (complete_pptx_code.py)
+SLATE = Theme(
+    name="slate",
+    palette={
+        "PRIMARY": RGBColor(30, 41, 59),
+        "ACCENT": RGBColor(99, 102, 241),
+        "GRAY": RGBColor(148, 163, 184),
+        "WHITE": RGBColor(255, 255, 255),
+        "SURFACE": RGBColor(248, 250, 252),
+    },
+    title="PRIMARY",
+    text="PRIMARY",
+    strong="PRIMARY",
+    muted="GRAY",
+    accent="ACCENT",
+    surface="SURFACE",
+    outline="ACCENT",
+    on_accent="WHITE",
+    header="rule",
+    hero_size=48,
+    subtitle_size=24,
+    title_size=36,
+    small_size=16,
+    margin=1,
+    body_left=1.5,
+    body_width=13,
+    space_before=0,
+    space_after=16,
+)
+
+THEMES = {theme.name: theme for theme in (MINIMAL, SLATE)}
@@ -0,0 +1,211 @@
+"""Byte-level BPE tokenizer used to compute the deck's token examples.
+
+Loads GPT-2 style vocabularies from disk: either a ``vocab.json`` +
+``merges.txt`` pair or a Hugging Face ``tokenizer.json`` with a BPE model.
+Text is split into words with the GPT-2 pre-tokenization pattern, each word
+is mapped to byte symbols and merged with a priority queue (one heap pop per
+merge instead of rescanning every pair), and per-word results are kept in an
+LRU cache, so real text, where most words repeat, mostly costs cache hits.
+
+The GPT-2 pattern needs Unicode classes from the third-party ``regex``
+module.  When it is not installed an ``re`` equivalent is used, which can
+split a few rare non-ASCII number and symbol characters differently.
+"""
+
+import functools
+import hashlib
+import heapq
+import json
+import os
+import re
+
+DEFAULT_CACHE_SIZE = 65536
+
+GPT2_PATTERN = r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+"""
+# ``re`` spelling of the same classes: letters are word characters that are
+# not digits or "_", and "_" counts as punctuation as it does in GPT-2
+RE_PATTERN = r"""'s|'t|'re|'ve|'m|'ll|'d| ?[^\W\d_]+| ?\d+| ?(?:[^\s\w]|_)+|\s+(?!\S)|\s+"""
+
+
+def _compile_pattern():
+    try:
+        import regex
+    except ImportError:
+        return re.compile(RE_PATTERN)
+    return regex.compile(GPT2_PATTERN)
+
+
+@functools.lru_cache(maxsize=None)
+def bytes_to_unicode():
+    """GPT-2's reversible map from byte values to printable characters."""
+    printable = (list(range(ord("!"), ord("~") + 1)) + list(range(ord("¡"), ord("¬") + 1))
+                 + list(range(ord("®"), ord("ÿ") + 1)))
+    chars = printable[:]
+    extra = 0
+    for b in range(256):
+        if b not in printable:
+            printable.append(b)
+            chars.append(256 + extra)
+            extra += 1
+    return dict(zip(printable, map(chr, chars)))
+
+
+class BPETokenizer:
+    """Encode text with a byte-level BPE vocabulary.
+
+    ``vocab`` maps token strings to ids and ``merges`` is the ranked list of
+    ``(left, right)`` pairs.  ``encode_word(word)`` returns the ids of one
+    pre-tokenized word through an LRU cache of ``cache_size`` entries.
+    """
+
+    def __init__(self, vocab, merges, cache_size=DEFAULT_CACHE_SIZE):
+        self.encoder = dict(vocab)
+        self.decoder = {i: token for token, i in self.encoder.items()}
+        self.ranks = {tuple(pair): rank for rank, pair in enumerate(merges)}
+        self.byte_encoder = bytes_to_unicode()
+        self.byte_decoder = {c: b for b, c in self.byte_encoder.items()}
+        self._split = _compile_pattern().findall
+        self.encode_word = functools.lru_cache(cache_size)(self._encode_word_uncached)
+
+    @classmethod
+    def from_files(cls, vocab_path, merges_path, **kwargs):
+        """Load a ``vocab.json`` + ``merges.txt`` pair."""
+        with open(vocab_path, encoding="utf-8") as f:
+            vocab = json.load(f)
+        merges = []
+        with open(merges_path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("#version") or not line.strip():
+                    continue
+                merges.append(tuple(line.rstrip("\n").split(" ")))
+        return cls(vocab, merges, **kwargs)
+
+    @classmethod
+    def from_tokenizer_json(cls, path, **kwargs):
+        """Load the BPE model of a Hugging Face ``tokenizer.json``."""
+        with open(path, encoding="utf-8") as f:
+            model = json.load(f).get("model", {})
+        if model.get("type") != "BPE":
+            raise ValueError(f"{path}: not a BPE tokenizer (model type {model.get('type')!r})")
+        merges = [m.split(" ") if isinstance(m, str) else m for m in model["merges"]]
+        return cls(model["vocab"], merges, **kwargs)
+
+    def pretokenize(self, text):
+        """Split text into the words that BPE runs on."""
+        return self._split(text)
+
+    def _merge(self, symbols):
+        """Apply merges to a list of symbols in rank order using a heap."""
+        if len(symbols) < 2:
+            return symbols
+        ranks = self.ranks
+        nxt = list(range(1, len(symbols))) + [-1]
+        prv = list(range(-1, len(symbols) - 1))
+        heap = []
+        for i in range(len(symbols) - 1):
+            rank = ranks.get((symbols[i], symbols[i + 1]))
+            if rank is not None:
+                heap.append((rank, i))
+        heapq.heapify(heap)
+        while heap:
+            rank, i = heapq.heappop(heap)
+            j = nxt[i]
+            # Skip entries made stale by an earlier merge
+            if symbols[i] is None or j == -1 or ranks.get((symbols[i], symbols[j])) != rank:
+                continue
+            symbols[i] += symbols[j]
+            symbols[j] = None
+            nxt[i] = nxt[j]
+            if nxt[j] != -1:
+                prv[nxt[j]] = i
+            if prv[i] != -1:
+                rank = ranks.get((symbols[prv[i]], symbols[i]))
+                if rank is not None:
+                    heapq.heappush(heap, (rank, prv[i]))
+            if nxt[i] != -1:
+                rank = ranks.get((symbols[i], symbols[nxt[i]]))
+                if rank is not None:
+                    heapq.heappush(heap, (rank, i))
+        return [s for s in symbols if s is not None]
+
+    def _encode_word_uncached(self, word):
+        byte_encoder = self.byte_encoder
+        symbols = self._merge([byte_encoder[b] for b in word.encode("utf-8")])
+        try:
+            return tuple(self.encoder[s] for s in symbols)
+        except KeyError as exc:
+            raise ValueError(f"token {exc.args[0]!r} is not in the vocabulary") from None
+
+    def encode(self, text):
+        """Return the token ids for ``text``."""
+        encode_word = self.encode_word
+        return [i for word in self._split(text) for i in encode_word(word)]
+
+    def encode_batch(self, texts):
+        """Encode many strings; words shared between them are encoded once."""
+        encode_word = self.encode_word
+        split = self._split
+        return [[i for word in split(text) for i in encode_word(word)] for text in texts]
+
+    def decode(self, ids):
+        data = bytes(self.byte_decoder[c] for i in ids for c in self.decoder[i])
+        return data.decode("utf-8", errors="replace")
+
+    def pieces(self, text):
+        """Return ``text`` split into readable token strings."""
+        return [self.decode([i]) for i in self.encode(text)]
+
+    def cache_info(self):
+        return self.encode_word.cache_info()
+
+    @functools.cached_property
+    def fingerprint(self):
+        """A digest of the vocabulary and merges, which fix what ``encode``
+        returns."""
+        merges = sorted(self.ranks, key=self.ranks.get)
+        payload = json.dumps([sorted(self.encoder.items()), merges], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=8)
+def load_tokenizer(path):
+    """Load a tokenizer from a ``tokenizer.json`` or a directory holding one
+    (or ``vocab.json`` + ``merges.txt``).  Loaded tokenizers are reused."""
+    path = os.fspath(path)
+    if os.path.isdir(path):
+        candidate = os.path.join(path, "tokenizer.json")
+        if os.path.exists(candidate):
+            return BPETokenizer.from_tokenizer_json(candidate)
+        return BPETokenizer.from_files(os.path.join(path, "vocab.json"),
+                                       os.path.join(path, "merges.txt"))
+    return BPETokenizer.from_tokenizer_json(path)
+
+
+def _format_list(items):
+    return "[" + ", ".join(items) + "]"
+
+
+def expand_examples(slide_spec, tokenizer):
+    """Fill computed token examples into a slide spec.
+
+    ``token_examples`` entries with a ``text`` get their ``tokens`` (and a
+    default ``word`` label); a ``process_flow`` with ``example_text`` gets
+    its ``example`` line.  Values computed here replace any written in the
+    spec, so one spec can be rendered for different tokenizers.
+    """
+    kind = slide_spec.get("kind")
+    if kind == "token_examples":
+        examples = []
+        for example in slide_spec.get("examples", ()):
+            if "text" in example:
+                example = dict(example, tokens=tokenizer.pieces(example["text"]))
+                example.setdefault("word", f'"{example["text"]}"')
+            examples.append(example)
+        return dict(slide_spec, examples=examples)
+    if kind == "process_flow" and "example_text" in slide_spec:
+        text = slide_spec["example_text"]
+        pieces = _format_list(json.dumps(p, ensure_ascii=False) for p in tokenizer.pieces(text))
+        ids = _format_list(str(i) for i in tokenizer.encode(text))
+        return dict(slide_spec,
+                    example=f'Example: "{text}" → {pieces} → {ids} → [vector embeddings]')
+    return slide_spec
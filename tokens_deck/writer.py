@@ -0,0 +1,311 @@
+"""Stream a presentation as a .pptx ZIP to any writable binary stream.
+
+``Presentation.save`` can write to a file object, but the usual way to serve
+a deck (save into a ``BytesIO``, then send ``getvalue()``) holds the whole
+archive in memory twice and sends nothing until the last part is zipped.
+``write_pptx`` instead serializes one part at a time straight into the
+output and flushes after every ZIP entry, so the first bytes leave as soon
+as ``[Content_Types].xml`` is compressed.
+
+Non-seekable outputs (sockets, pipes, ``sys.stdout.buffer``, HTTP response
+bodies) are supported: ``zipfile`` falls back to data descriptors when the
+stream cannot ``tell()``.
+
+For decks too large to hold in memory, ``SlideStream`` writes each slide
+as soon as it is finished instead of all parts at the end.
+
+By default the deck is first pruned of unused layouts and template parts,
+binary parts with equal bytes are merged, and each entry is compressed according to ``optimize.compression_policy``.
+
+Part order, part names and shape ids already follow from the spec alone,
+and ZIP entries all carry the ZIP epoch (1980-01-01) as their date.  With
+``reproducible``, the remaining timestamps (the deck's core properties and
+those of embedded chart workbooks, which record when they were written)
+are set to ``source_date()``, so rendering the same spec gives the same
+bytes every time.
+"""
+
+import contextlib
+import datetime
+import hashlib
+import io
+import os
+import re
+import sys
+import uuid
+import zipfile
+from collections import namedtuple
+
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import CT_Relationships, serialize_part_xml
+from pptx.opc.package import XmlPart
+from pptx.opc.packuri import PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.oxml import parse_xml
+
+from .optimize import compression_policy, dedupe, prune
+
+CHUNK_SIZE = 64 * 1024
+CONTENT_TYPES_MEMBER = "[Content_Types].xml"
+FIRST_SLIDE_ID = 256
+
+ZIP_EPOCH = datetime.datetime(1980, 1, 1)
+WORKBOOK_PROPERTIES = "docProps/core.xml"
+_W3CDTF_DATES = re.compile(rb"(<dcterms:(?:created|modified)\b[^>]*>)[^<]*")
+
+# What [Content_Types].xml needs to know about a part written by SlideStream
+_Written = namedtuple("_Written", "partname content_type")
+
+
+def source_date():
+    """The timestamp of reproducible output: ``$SOURCE_DATE_EPOCH`` if set,
+    otherwise the ZIP epoch."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return ZIP_EPOCH
+    utc = datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc)
+    return utc.replace(tzinfo=None)
+
+
+def stamp_core_properties(prs, when):
+    """Set the deck's creation and modification dates to ``when``."""
+    props = prs.core_properties
+    props.created = props.modified = when
+    props.revision = 1
+
+
+def part_blob(part, when=None):
+    """``part.blob``, with the dates of an embedded workbook set to ``when``."""
+    blob = part.blob
+    if when is None or part.content_type != CT.SML_SHEET:
+        return blob
+    stamp = when.strftime("%Y-%m-%dT%H:%M:%SZ").encode()
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(blob)) as src, zipfile.ZipFile(out, "w") as dest:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == WORKBOOK_PROPERTIES:
+                data = _W3CDTF_DATES.sub(rb"\g<1>" + stamp, data)
+            dest.writestr(info, data)
+    return out.getvalue()
+
+
+def iter_entries(prs, when=None):
+    """Yield ``(member name, bytes)`` for every ZIP entry of ``prs``.
+
+    Parts are serialized lazily, one at a time, in the same order python-pptx
+    uses: content types, package relationships, then each part followed by
+    its relationships.  ``when`` stamps embedded workbooks (see
+    ``part_blob``).
+    """
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    yield CONTENT_TYPES_MEMBER, serialize_part_xml(_ContentTypesItem.xml_for(parts))
+    yield PACKAGE_URI.rels_uri.membername, package._rels.xml
+    for part in parts:
+        yield part.partname.membername, part_blob(part, when)
+        if part._rels:
+            yield part.partname.rels_uri.membername, part.rels.xml
+
+
+def write_entries(entries, stream, compression=zipfile.ZIP_DEFLATED, policy=None):
+    """Write ``(member name, bytes)`` pairs as a ZIP archive to ``stream``.
+
+    ``policy``, if given, maps each member name to ``(compression, level)``
+    and overrides ``compression``.
+    """
+    flush = getattr(stream, "flush", None)
+    with zipfile.ZipFile(stream, "w", compression=compression, strict_timestamps=False) as zf:
+        for name, blob in entries:
+            _write_entry(zf, name, blob, policy)
+            if flush:
+                flush()
+
+
+def _write_entry(zf, name, blob, policy=None):
+    if policy:
+        zf.compression, zf.compresslevel = policy(name)
+    with zf.open(name, "w") as dest:
+        view = memoryview(blob)
+        for start in range(0, len(view), CHUNK_SIZE):
+            dest.write(view[start:start + CHUNK_SIZE])
+
+
+def write_pptx(prs, stream, optimize=True, level="default", reproducible=False):
+    """Write ``prs`` to a writable binary stream, entry by entry.
+
+    With ``optimize``, ``prs`` is pruned and deduplicated first (see
+    ``optimize.prune`` and ``optimize.dedupe``), so no slides can be added
+    to it afterwards; ``level`` is the deflate level for XML, a number or a
+    name from ``optimize.LEVELS``.  With
+    ``reproducible``, every timestamp in the deck is ``source_date()``.
+    """
+    when = source_date() if reproducible else None
+    if when is not None:
+        stamp_core_properties(prs, when)
+    if optimize:
+        prune(prs)
+        dedupe(prs, lambda part: part_blob(part, when))
+    write_entries(iter_entries(prs, when), stream, policy=compression_policy(level))
+
+
+class SlideStream:
+    """Write slides into a .pptx stream as they are finished, then drop them.
+
+    python-pptx keeps every slide's XML tree until the whole package is
+    saved.  ``add`` instead writes a finished slide straight into the ZIP,
+    together with the pictures and charts it uses, and removes it from
+    ``prs`` so its tree can be freed.  ``close`` then writes the presentation
+    part with the list of streamed slides, the shared parts (master,
+    layouts, theme) and, last, ``[Content_Types].xml``.  Memory stays at
+    about one slide whatever the length of the deck, and a picture used on
+    many slides is still stored once.
+
+    ``prs`` must have no slides when streaming starts.  While streaming it
+    can only be used to add slides, and not at all after ``close``.
+    ``reproducible`` is as for ``write_pptx``.
+    """
+
+    def __init__(self, prs, stream, level="default", reproducible=False):
+        if len(prs.slides):
+            raise ValueError("SlideStream needs a presentation without slides")
+        self.prs = prs
+        self.slides = 0
+        self._when = source_date() if reproducible else None
+        self._zip = zipfile.ZipFile(stream, "w", strict_timestamps=False)
+        self._flush = getattr(stream, "flush", None)
+        self._policy = compression_policy(level)
+        # Parts every slide may share; written once, by close()
+        self._shared = set(prs.part.package.iter_parts())
+        self._reserved = {str(part.partname) for part in self._shared}
+        self._counters = {}
+        self._media = {}  # digest of a binary part -> name it was written under
+        self._written = []
+        self._slide_names = []
+        self._layouts = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+
+    def add(self, slide):
+        """Write ``slide`` (a finished slide of ``prs``) and remove it from ``prs``."""
+        part = slide.part
+        self._layouts.add(part.slide_layout.part)
+        self._slide_names.append(self._write_part(part, {}))
+        self.slides += 1
+        presentation = self.prs.part
+        id_list = presentation._element.get_or_add_sldIdLst()
+        for entry in id_list.sldId_lst:
+            if presentation.related_part(entry.rId) is part:
+                id_list.remove(entry)
+                presentation.rels.pop(entry.rId)
+                break
+
+    def close(self):
+        """Finish the package: presentation, shared parts and content types."""
+        prs = self.prs
+        presentation = prs.part
+        if self._when is not None:
+            stamp_core_properties(prs, self._when)
+        prune(prs, self._layouts)
+        id_list = presentation._element.get_or_add_sldIdLst()
+        rels = parse_xml(presentation.rels.xml)
+        used = {rel.rId for rel in presentation.rels.values()}
+        number = 0
+        for slide_id, name in enumerate(self._slide_names, FIRST_SLIDE_ID):
+            number += 1
+            while f"rId{number}" in used:
+                number += 1
+            rId = f"rId{number}"
+            id_list._add_sldId(id=slide_id, rId=rId)
+            rels.add_rel(rId, RT.SLIDE, PackURI(name).relative_ref(presentation.partname.baseURI))
+
+        package = presentation.package
+        parts = tuple(package.iter_parts())
+        self._entry(PACKAGE_URI.rels_uri.membername, package._rels.xml)
+        for part in parts:
+            self._entry(part.partname.membername, part.blob)
+            if part is presentation:
+                self._entry(part.partname.rels_uri.membername, rels.xml_file_bytes)
+            elif part._rels:
+                self._entry(part.partname.rels_uri.membername, part.rels.xml)
+        content_types = _ContentTypesItem.xml_for(parts + tuple(self._written))
+        self._entry(CONTENT_TYPES_MEMBER, serialize_part_xml(content_types))
+        self._zip.close()
+
+    def _write_part(self, part, names):
+        """Write ``part`` and the unshared parts it relates to; returns its name."""
+        binary = not isinstance(part, XmlPart)
+        blob = part_blob(part, self._when)
+        if binary:
+            # Stamped bytes, so workbooks written a second apart still match
+            digest = hashlib.sha1(blob).digest()
+            if digest in self._media:
+                return self._media[digest]
+        name = names[part] = self._next_name(part.partname)
+        if binary:
+            self._media[digest] = name
+        uri = PackURI(name)
+        self._written.append(_Written(uri, part.content_type))
+        if part._rels:
+            rels = CT_Relationships.new()
+            for rel in part.rels.values():
+                if rel.is_external:
+                    rels.add_rel(rel.rId, rel.reltype, rel.target_ref, is_external=True)
+                    continue
+                target = rel.target_part
+                if target in self._shared:
+                    target_name = target.partname
+                else:
+                    target_name = PackURI(names.get(target) or self._write_part(target, names))
+                rels.add_rel(rel.rId, rel.reltype, target_name.relative_ref(uri.baseURI))
+            self._entry(uri.rels_uri.membername, rels.xml_file_bytes)
+        self._entry(uri.membername, blob)
+        return name
+
+    def _next_name(self, partname):
+        """A fresh partname in the series of ``partname`` (``.../chart%d.xml``)."""
+        template = re.sub(r"\d*(\.\w+)$", r"%d\1", str(partname))
+        number = self._counters.get(template, 0)
+        while True:
+            number += 1
+            name = template % number
+            if name not in self._reserved:
+                break
+        self._counters[template] = number
+        return name
+
+    def _entry(self, name, blob):
+        _write_entry(self._zip, name, blob, self._policy)
+        if self._flush:
+            self._flush()
+
+
+@contextlib.contextmanager
+def open_output(path):
+    """Open ``path`` for binary writing; ``"-"`` means standard output.
+
+    A file is written under a temporary name beside ``path`` and renamed
+    over it only when the block succeeds, so a failed render leaves neither
+    a partial deck nor a clobbered earlier one.
+    """
+    if path == "-":
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+    tmp = f"{path}.{os.getpid()}-{uuid.uuid4().hex[:8]}.tmp"
+    try:
+        with open(tmp, "xb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise